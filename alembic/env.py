@@ -13,8 +13,20 @@ from app.config import settings
 
 # Import all models to ensure they're registered with Base
 from app.models.user import User
+from app.models.term import Term
 from app.models.course import Course
 from app.models.enrollment import Enrollment
+from app.models.enrollment_archive import ArchivedEnrollment
+from app.models.waitlist import WaitlistEntry
+from app.models.prerequisite import CoursePrerequisite, CoursePrerequisiteClosure
+from app.models.completion import CourseCompletion
+from app.models.meeting import CourseMeeting
+from app.models.related_course import RelatedCourse
+from app.models.enrollment_stats import CourseEnrollmentStats, DailyEnrollmentStats, EnrollmentStatDelta
+from app.models.audit import EnrollmentAuditEvent
+from app.models.outbox import OutboxEvent, WebhookEndpoint, WebhookDelivery
+from app.models.job import BackgroundJob
+from app.models.backfill import BackfillProgress
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
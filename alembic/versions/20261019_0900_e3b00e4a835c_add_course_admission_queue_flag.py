@@ -0,0 +1,24 @@
+"""Add course admission queue flag
+
+Revision ID: e3b00e4a835c
+Revises: 177b6dec2766
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b00e4a835c'
+down_revision = '177b6dec2766'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('courses', sa.Column('admission_queue_enabled', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('courses', 'admission_queue_enabled')
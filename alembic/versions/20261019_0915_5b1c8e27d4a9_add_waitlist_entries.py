@@ -0,0 +1,35 @@
+"""Add waitlist entries
+
+Revision ID: 5b1c8e27d4a9
+Revises: e3b00e4a835c
+Create Date: 2026-10-19 09:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1c8e27d4a9'
+down_revision = 'e3b00e4a835c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('waitlist_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'course_id', name='unique_user_course_waitlist')
+    )
+    op.create_index('ix_waitlist_entries_course_order', 'waitlist_entries', ['course_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_waitlist_entries_course_order', table_name='waitlist_entries')
+    op.drop_table('waitlist_entries')
@@ -0,0 +1,50 @@
+"""Add prerequisites, prerequisite closure and completions
+
+Revision ID: 9d4f2a61c0b3
+Revises: 5b1c8e27d4a9
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f2a61c0b3'
+down_revision = '5b1c8e27d4a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('course_prerequisites',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('prerequisite_id', sa.Integer(), nullable=False),
+    sa.CheckConstraint('course_id <> prerequisite_id', name='check_prerequisite_not_self'),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['prerequisite_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'prerequisite_id')
+    )
+    op.create_table('course_prerequisite_closure',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('required_course_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['required_course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'required_course_id')
+    )
+    op.create_index('ix_course_prerequisite_closure_required', 'course_prerequisite_closure', ['required_course_id'], unique=False)
+    op.create_table('course_completions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'course_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('course_completions')
+    op.drop_index('ix_course_prerequisite_closure_required', table_name='course_prerequisite_closure')
+    op.drop_table('course_prerequisite_closure')
+    op.drop_table('course_prerequisites')
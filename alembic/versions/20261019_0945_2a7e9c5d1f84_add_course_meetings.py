@@ -0,0 +1,36 @@
+"""Add course meetings
+
+Revision ID: 2a7e9c5d1f84
+Revises: 9d4f2a61c0b3
+Create Date: 2026-10-19 09:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a7e9c5d1f84'
+down_revision = '9d4f2a61c0b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('course_meetings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('day_of_week', sa.Integer(), nullable=False),
+    sa.Column('start_minute', sa.Integer(), nullable=False),
+    sa.Column('end_minute', sa.Integer(), nullable=False),
+    sa.CheckConstraint('day_of_week BETWEEN 0 AND 6', name='check_meeting_day'),
+    sa.CheckConstraint('start_minute >= 0 AND end_minute <= 1440 AND start_minute < end_minute', name='check_meeting_minutes'),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_course_meetings_course_day', 'course_meetings', ['course_id', 'day_of_week', 'start_minute'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_course_meetings_course_day', table_name='course_meetings')
+    op.drop_table('course_meetings')
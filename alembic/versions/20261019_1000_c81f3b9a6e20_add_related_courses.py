@@ -0,0 +1,34 @@
+"""Add related courses
+
+Revision ID: c81f3b9a6e20
+Revises: 2a7e9c5d1f84
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f3b9a6e20'
+down_revision = '2a7e9c5d1f84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('related_courses',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('related_course_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('shared_students', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id', 'rank')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('related_courses')
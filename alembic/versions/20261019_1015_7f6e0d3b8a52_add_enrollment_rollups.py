@@ -0,0 +1,43 @@
+"""Add enrollment rollups
+
+Revision ID: 7f6e0d3b8a52
+Revises: c81f3b9a6e20
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f6e0d3b8a52'
+down_revision = 'c81f3b9a6e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('course_enrollment_stats',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('enrolled_count', sa.Integer(), nullable=False),
+    sa.Column('total_enrollments', sa.Integer(), nullable=False),
+    sa.Column('total_drops', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id')
+    )
+    op.create_table('daily_enrollment_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('enrollments', sa.Integer(), nullable=False),
+    sa.Column('drops', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    # Seed per-course rollups from existing enrollments
+    op.execute(
+        "INSERT INTO course_enrollment_stats (course_id, enrolled_count, total_enrollments, total_drops) "
+        "SELECT course_id, COUNT(*), COUNT(*), 0 FROM enrollments GROUP BY course_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_enrollment_stats')
+    op.drop_table('course_enrollment_stats')
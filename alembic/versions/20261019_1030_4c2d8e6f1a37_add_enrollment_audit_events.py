@@ -0,0 +1,39 @@
+"""Add enrollment audit events
+
+Revision ID: 4c2d8e6f1a37
+Revises: 7f6e0d3b8a52
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c2d8e6f1a37'
+down_revision = '7f6e0d3b8a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('enrollment_audit_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('action', sa.Enum('ENROLLED', 'DEREGISTERED', 'REMOVED', 'PROMOTED', name='auditaction'), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_enrollment_audit_events_created', 'enrollment_audit_events', ['created_at', 'id'], unique=False)
+    op.create_index('ix_enrollment_audit_events_course', 'enrollment_audit_events', ['course_id', 'created_at'], unique=False)
+    op.create_index('ix_enrollment_audit_events_user', 'enrollment_audit_events', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_enrollment_audit_events_user', table_name='enrollment_audit_events')
+    op.drop_index('ix_enrollment_audit_events_course', table_name='enrollment_audit_events')
+    op.drop_index('ix_enrollment_audit_events_created', table_name='enrollment_audit_events')
+    op.drop_table('enrollment_audit_events')
+    sa.Enum(name='auditaction').drop(op.get_bind(), checkfirst=True)
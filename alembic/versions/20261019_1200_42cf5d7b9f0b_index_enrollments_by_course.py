@@ -0,0 +1,46 @@
+"""Index enrollments by course, drop indexes duplicating primary keys
+
+The only composite on enrollments is the (user_id, course_id) unique
+constraint, which cannot serve lookups by course_id alone: course rosters,
+Course.enrollments loads and seat counts scanned the table. The ix_*_id
+indexes duplicate the primary key indexes and only cost writes.
+
+On PostgreSQL the indexes are built and dropped CONCURRENTLY, outside a
+transaction, so enrollment writes are not blocked while a large table is
+indexed.
+
+Revision ID: 42cf5d7b9f0b
+Revises: d2f8a4b6c913
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '42cf5d7b9f0b'
+down_revision = 'd2f8a4b6c913'
+branch_labels = None
+depends_on = None
+
+PRIMARY_KEY_INDEXES = [
+    ('ix_users_id', 'users'),
+    ('ix_courses_id', 'courses'),
+    ('ix_enrollments_id', 'enrollments'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_enrollments_course_user', 'enrollments', ['course_id', 'user_id'], unique=False,
+                        postgresql_concurrently=True)
+        for index_name, table_name in PRIMARY_KEY_INDEXES:
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name in PRIMARY_KEY_INDEXES:
+            op.create_index(index_name, table_name, ['id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_enrollments_course_user', table_name='enrollments', postgresql_concurrently=True)
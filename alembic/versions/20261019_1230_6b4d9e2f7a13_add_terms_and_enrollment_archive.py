@@ -0,0 +1,69 @@
+"""Add terms and the enrollment archive
+
+courses.term_id is added as a nullable column; existing courses keep no
+term and stay current, so there is nothing to backfill.
+
+Revision ID: 6b4d9e2f7a13
+Revises: 8e3a6c1d5b27
+Create Date: 2026-10-19 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b4d9e2f7a13'
+down_revision = '8e3a6c1d5b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('terms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('starts_on', sa.Date(), nullable=False),
+    sa.Column('ends_on', sa.Date(), nullable=False),
+    sa.Column('closed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('ends_on >= starts_on', name='check_term_dates'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_terms_code', 'terms', ['code'], unique=True)
+
+    with op.batch_alter_table('courses') as batch_op:
+        batch_op.add_column(sa.Column('term_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_courses_term_id_terms', 'terms', ['term_id'], ['id'])
+        batch_op.create_index('ix_courses_term_id', ['term_id'], unique=False)
+
+    op.create_table('archived_enrollments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('enrollment_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('term_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['term_id'], ['terms.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_enrollments_course', 'archived_enrollments', ['course_id', 'id'], unique=False)
+    op.create_index('ix_archived_enrollments_term', 'archived_enrollments', ['term_id', 'id'], unique=False)
+    op.create_index('ix_archived_enrollments_user', 'archived_enrollments', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_enrollments_user', table_name='archived_enrollments')
+    op.drop_index('ix_archived_enrollments_term', table_name='archived_enrollments')
+    op.drop_index('ix_archived_enrollments_course', table_name='archived_enrollments')
+    op.drop_table('archived_enrollments')
+    with op.batch_alter_table('courses') as batch_op:
+        batch_op.drop_index('ix_courses_term_id')
+        batch_op.drop_constraint('fk_courses_term_id_terms', type_='foreignkey')
+        batch_op.drop_column('term_id')
+    op.drop_index('ix_terms_code', table_name='terms')
+    op.drop_table('terms')
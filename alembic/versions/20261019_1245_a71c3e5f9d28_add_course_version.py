@@ -0,0 +1,27 @@
+"""Add course version for optimistic concurrency
+
+A constant default lets PostgreSQL add the column without rewriting the
+table or backfilling it.
+
+Revision ID: a71c3e5f9d28
+Revises: 6b4d9e2f7a13
+Create Date: 2026-10-19 12:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a71c3e5f9d28'
+down_revision = '6b4d9e2f7a13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('courses', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('courses', 'version')
@@ -0,0 +1,36 @@
+"""Add enrollment stat deltas
+
+Flushes append their daily counts here instead of updating the day's
+daily_enrollment_stats row, which every enrollment transaction of the
+day locked until it committed.
+
+Revision ID: c4f1a8e2b6d9
+Revises: a71c3e5f9d28
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f1a8e2b6d9'
+down_revision = 'a71c3e5f9d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('enrollment_stat_deltas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('enrollments', sa.Integer(), nullable=False),
+    sa.Column('drops', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_enrollment_stat_deltas_day'), 'enrollment_stat_deltas', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_enrollment_stat_deltas_day'), table_name='enrollment_stat_deltas')
+    op.drop_table('enrollment_stat_deltas')
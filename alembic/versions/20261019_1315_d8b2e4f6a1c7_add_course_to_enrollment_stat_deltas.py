@@ -0,0 +1,36 @@
+"""Add course to enrollment stat deltas
+
+Flushes append per-course deltas instead of updating the course's
+course_enrollment_stats row, which every enrollment transaction of the
+course locked until it committed. Deltas already written carry no course:
+their per-course counts were applied in place.
+
+Revision ID: d8b2e4f6a1c7
+Revises: c4f1a8e2b6d9
+Create Date: 2026-10-19 13:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2e4f6a1c7'
+down_revision = 'c4f1a8e2b6d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('enrollment_stat_deltas') as batch_op:
+        batch_op.add_column(sa.Column('course_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_enrollment_stat_deltas_course_id_courses', 'courses', ['course_id'], ['id'],
+                                    ondelete='SET NULL')
+        batch_op.create_index('ix_enrollment_stat_deltas_course_id', ['course_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('enrollment_stat_deltas') as batch_op:
+        batch_op.drop_index('ix_enrollment_stat_deltas_course_id')
+        batch_op.drop_constraint('fk_enrollment_stat_deltas_course_id_courses', type_='foreignkey')
+        batch_op.drop_column('course_id')
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
@@ -15,14 +15,125 @@ class Settings(BaseSettings):
              return v.replace("postgres://", "postgresql://", 1)
         return v
     
+    # Connection pool of each worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    
     # JWT
     SECRET_KEY: str = "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # bcrypt cost factor of new password hashes (4-31); each step doubles
+    # the hashing time. Existing hashes keep the cost they were made with
+    PASSWORD_HASH_ROUNDS: int = 12
+    
     # Application
     DEBUG: bool = True
     
+    # Admission queue (high-demand course openings)
+    ADMISSION_QUEUE_MAX_SIZE: int = 5000
+    ADMISSION_WORKER_IDLE_SECONDS: float = 30.0
+    ADMISSION_TICKET_RETENTION: int = 50000
+    
+    # Recommendations
+    RELATED_COURSES_TOP_K: int = 10
+    
+    # Webhook delivery
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0
+    WEBHOOK_BATCH_SIZE: int = 50
+    WEBHOOK_MAX_ATTEMPTS: int = 8
+    WEBHOOK_RETRY_BASE_SECONDS: float = 2.0
+    WEBHOOK_RETRY_MAX_SECONDS: float = 600.0
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    # How long a dispatcher owns the deliveries it is sending; rows are
+    # retried by any dispatcher once it runs out
+    WEBHOOK_LEASE_SECONDS: float = 300.0
+    
+    # Background jobs
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_SECONDS: float = 900.0
+    JOB_LOCK_TIMEOUT_SECONDS: float = 300.0
+
+    # Online data backfills (app.utils.backfill). Each chunk is one short
+    # transaction; chunks slower than the target are halved so row locks
+    # stay brief, and the pause leaves room for application traffic
+    BACKFILL_CHUNK_SIZE: int = 5000
+    BACKFILL_CHUNK_TARGET_SECONDS: float = 0.5
+    BACKFILL_PAUSE_SECONDS: float = 0.1
+
+    # Load shedding; the global cap matches the default threadpool size so
+    # excess requests wait here, within budget, rather than in the threadpool
+    MAX_CONCURRENT_REQUESTS: int = 40
+    MAX_CONCURRENT_AUTH_REQUESTS: int = 8
+    MAX_CONCURRENT_CATALOG_REQUESTS: int = 24
+    MAX_CONCURRENT_ENROLLMENT_WRITES: int = 16
+    # Open server-sent event streams; they do not count against the global
+    # cap since they stay open for as long as clients watch them
+    MAX_CONCURRENT_EVENT_STREAMS: int = 500
+    REQUEST_QUEUE_TIMEOUT_SECONDS: float = 0.5
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = 1
+    
+    # Access logging; errors and slow requests are always logged, the rest
+    # sampled. Per-route rates are keyed by route template, e.g.
+    # ACCESS_LOG_ROUTE_SAMPLE_RATES='{"/courses": 0.01}'
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_SAMPLE_RATE: float = 0.1
+    ACCESS_LOG_ROUTE_SAMPLE_RATES: Dict[str, float] = {}
+    ACCESS_LOG_SLOW_REQUEST_MS: float = 1000.0
+    
+    # Tracing; TRACE_EXPORT is "stdout", a file path, or empty to disable.
+    # Sampling is decided once per request (or by an incoming traceparent)
+    TRACE_EXPORT: str = ""
+    TRACE_SAMPLE_RATE: float = 0.01
+    # Let the sampled flag of an incoming traceparent decide; only enable
+    # when every traceparent comes from a trusted proxy or service
+    TRACE_TRUST_PARENT_SAMPLING: bool = False
+    TRACE_SERVICE_NAME: str = "course-enrollment-api"
+    
+    # On-demand profiling (admins send X-Profile: 1 or ?profile=1)
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_INTERVAL_SECONDS: float = 0.002
+    PROFILE_MIN_INTERVAL_SECONDS: float = 30.0
+    PROFILE_RETENTION: int = 50
+    
+    # Shared cache; "memory" is private to each worker, "redis" uses the
+    # Redis-protocol server at CACHE_URL shared by all workers, with a small
+    # per-worker near cache kept coherent over pub/sub
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "cep:"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_NEAR_MAX_ENTRIES: int = 1000
+    CACHE_NEAR_TTL_SECONDS: float = 5.0
+    CACHE_TIMEOUT_SECONDS: float = 0.25
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    CATALOG_CACHE_TTL_SECONDS: float = 30.0
+
+    # Multi-worker server (gunicorn.conf.py). WEB_WORKERS=0 derives the
+    # count from the CPUs available to the process, capped so that every
+    # worker's full pool fits in DB_CONNECTION_BUDGET; the WEB_CONCURRENCY
+    # environment variable overrides both. Workers are recycled after
+    # WORKER_MAX_REQUESTS requests, staggered by up to the jitter
+    WEB_WORKERS: int = 0
+    WEB_WORKERS_PER_CPU: int = 1
+    DB_CONNECTION_BUDGET: int = 90
+    WORKER_MAX_REQUESTS: int = 10000
+    WORKER_MAX_REQUESTS_JITTER: int = 1000
+    WORKER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+
+    # Startup warm-up; readiness fails until it has finished
+    WARM_UP_ON_STARTUP: bool = True
+    WARM_UP_CONNECTIONS: int = 5
+
+    # Readiness probe
+    HEALTH_READY_CACHE_SECONDS: float = 2.0
+    HEALTH_DB_SLOW_MS: float = 250.0
+    HEALTH_POOL_DEGRADED_SATURATION: float = 0.8
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,13 +1,24 @@
-from sqlalchemy import create_engine
+from typing import Dict
+from sqlalchemy import Table, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import settings
 
-# Create database engine
+
+def engine_options(url: str) -> dict:
+    """Pool settings for a database URL; SQLite connections are shared across threads"""
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW}
+
+
+# Create database engine; per-request query counts and DB time are in the
+# access log (app.middleware.access_log) instead of echoing every statement.
+# Each worker process gets its own pool, see app.server.prepare_worker
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True
+    pool_pre_ping=True,
+    **engine_options(settings.DATABASE_URL)
 )
 
 # Create SessionLocal class
@@ -16,6 +27,39 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create Base class for models
 Base = declarative_base()
 
+# Session.info key of buffered rows -> table they are written to
+_PENDING_ROW_TABLES: Dict[str, Table] = {}
+
+
+def register_pending_rows(info_key: str, table: Table) -> None:
+    """
+    Write rows buffered on a session under info_key to table
+
+    Buffered rows (see add_pending_row) are written as one multi-row INSERT
+    when the session commits, inside the same transaction, and discarded on
+    rollback, so they only exist if the change that produced them did.
+    """
+    _PENDING_ROW_TABLES[info_key] = table
+
+
+def add_pending_row(db: Session, info_key: str, row: dict) -> None:
+    """Buffer a row on the session until it commits"""
+    db.info.setdefault(info_key, []).append(row)
+
+
+@event.listens_for(Session, "before_commit")
+def write_pending_rows(session: Session) -> None:
+    for info_key, table in _PENDING_ROW_TABLES.items():
+        rows = session.info.pop(info_key, None)
+        if rows:
+            session.connection().execute(table.insert().values(rows))
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_pending_rows(session: Session) -> None:
+    for info_key in _PENDING_ROW_TABLES:
+        session.info.pop(info_key, None)
+
 
 def get_db():
     """Dependency for getting database session"""
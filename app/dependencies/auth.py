@@ -1,16 +1,53 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from typing import Annotated
+from sqlalchemy.orm import Session, make_transient_to_detached
+from typing import Annotated, Optional
+from app.config import settings
 from app.database import get_db
+from app.middleware.access_log import record_request_user
 from app.models.user import User, UserRole
+from app.services.cache import cache, principal_key
 from app.utils.security import decode_access_token
 from app.utils.exceptions import UnauthorizedException, ForbiddenException
+from app.utils.tracing import traced, span
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def load_principal(db: Session, email: str) -> Optional[User]:
+    """
+    Look up the user behind a token, from the shared cache when possible
+
+    A cache hit is attached to the session as a persistent User without a
+    query; columns not in the snapshot (the password hash) load lazily if
+    an endpoint touches them. Snapshots are dropped when the user row
+    changes and expire after PRINCIPAL_CACHE_TTL_SECONDS.
+    """
+    key = principal_key(email)
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        existing = db.identity_map.get(db.identity_key(User, snapshot["id"]))
+        if existing is not None:
+            return existing
+        user = User(**{**snapshot, "role": UserRole(snapshot["role"])})
+        make_transient_to_detached(user)
+        db.add(user)
+        return user
+
+    user = db.query(User).filter(User.email == email).first()
+    if user is not None:
+        cache.set(key, {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role.value,
+            "is_active": user.is_active,
+        }, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    return user
+
+
+@traced("get_current_user")
 def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[Session, Depends(get_db)]
@@ -39,10 +76,12 @@ def get_current_user(
         raise UnauthorizedException(detail="Could not validate credentials")
     
     # Get user from database
-    user = db.query(User).filter(User.email == email).first()
+    with span("user_lookup"):
+        user = load_principal(db, email)
     if user is None:
         raise UnauthorizedException(detail="User not found")
     
+    record_request_user(user.id)
     return user
 
 
@@ -0,0 +1,133 @@
+"""
+Fold enrollment deltas and reconcile per-course rollups
+
+Flushes append per-course counts to enrollment_stat_deltas; this job folds
+them into course_enrollment_stats and daily_enrollment_stats, then repairs
+per-course rollups drifted by writes that bypass the ORM (bulk loads,
+manual SQL). Daily buckets are only maintained incrementally, since drops
+are not recoverable from the enrollments table. Courses of closed terms
+keep their rollups as the term's final counts while their enrollments move
+to the archive.
+
+Rollups lag by up to one run, so schedule it every few minutes, e.g.:
+
+    */5 * * * * python -m app.jobs.enrollment_rollups
+"""
+import logging
+from collections import defaultdict
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.enrollment_stats import (
+    CourseEnrollmentStats, DailyEnrollmentStats, EnrollmentStatDelta, upsert_increment
+)
+from app.models.term import Term
+
+logger = logging.getLogger(__name__)
+
+
+def fold_enrollment_deltas(db: Session) -> int:
+    """
+    Add pending enrollment deltas to their course and day rollups and delete them
+
+    Deltas locked by a concurrent fold are skipped and left for the next run.
+
+    Returns:
+        Number of deltas folded
+    """
+    deltas = db.query(EnrollmentStatDelta).order_by(EnrollmentStatDelta.id).with_for_update(skip_locked=True).all()
+    courses = defaultdict(lambda: {"enrolled_count": 0, "total_enrollments": 0, "total_drops": 0})
+    days = defaultdict(lambda: {"enrollments": 0, "drops": 0})
+    for delta in deltas:
+        if delta.course_id is not None:
+            courses[delta.course_id]["enrolled_count"] += delta.enrollments - delta.drops
+            courses[delta.course_id]["total_enrollments"] += delta.enrollments
+            courses[delta.course_id]["total_drops"] += delta.drops
+        days[delta.day]["enrollments"] += delta.enrollments
+        days[delta.day]["drops"] += delta.drops
+
+    connection = db.connection()
+    # Ascending course order, so concurrent folds cannot deadlock on the rows
+    for course_id in sorted(courses):
+        upsert_increment(connection, CourseEnrollmentStats.__table__, {"course_id": course_id}, courses[course_id])
+    for day in sorted(days):
+        upsert_increment(connection, DailyEnrollmentStats.__table__, {"day": day}, days[day])
+    if deltas:
+        db.execute(delete(EnrollmentStatDelta).where(
+            EnrollmentStatDelta.id.in_([delta.id for delta in deltas])
+        ).execution_options(synchronize_session=False))
+
+    db.commit()
+    logger.info("Folded %d enrollment deltas into %d courses and %d days", len(deltas), len(courses), len(days))
+    return len(deltas)
+
+
+def reconcile_course_stats(db: Session) -> int:
+    """
+    Reset enrolled_count of every course in an open term to the live enrollment count
+
+    Deltas not yet folded are taken into account, so the fold can run
+    before or after this without counting an enrollment twice.
+
+    Returns:
+        Number of courses whose rollup was corrected
+    """
+    closed = select(Course.id).join(Term, Term.id == Course.term_id).where(Term.closed_at.isnot(None))
+    live = dict(
+        db.query(Enrollment.course_id, func.count(Enrollment.id)).filter(
+            Enrollment.course_id.notin_(closed)
+        ).group_by(Enrollment.course_id).all()
+    )
+    stats = {
+        row.course_id: row
+        for row in db.query(CourseEnrollmentStats).filter(CourseEnrollmentStats.course_id.notin_(closed)).all()
+    }
+    pending = {
+        row.course_id: row
+        for row in db.query(
+            EnrollmentStatDelta.course_id,
+            func.sum(EnrollmentStatDelta.enrollments).label("enrollments"),
+            func.sum(EnrollmentStatDelta.drops).label("drops")
+        ).filter(
+            EnrollmentStatDelta.course_id.notin_(closed)
+        ).group_by(EnrollmentStatDelta.course_id).all()
+        if row.course_id is not None
+    }
+
+    corrected = 0
+    for course_id in live.keys() | stats.keys() | pending.keys():
+        delta = pending.get(course_id)
+        # The rollup only needs to account for enrollments no delta carries yet
+        unfolded = delta.enrollments - delta.drops if delta else 0
+        count = live.get(course_id, 0) - unfolded
+        row = stats.get(course_id)
+        if row is None:
+            if count == 0:
+                continue
+            db.add(CourseEnrollmentStats(course_id=course_id, enrolled_count=count,
+                                         total_enrollments=max(count, 0), total_drops=0))
+            corrected += 1
+        elif row.enrolled_count != count:
+            row.total_enrollments = max(row.total_enrollments, count)
+            row.enrolled_count = count
+            corrected += 1
+
+    db.commit()
+    logger.info("Reconciled enrollment rollups: %d courses corrected", corrected)
+    return corrected
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        fold_enrollment_deltas(db)
+        reconcile_course_stats(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Rebuild the "students also took" table from enrollments
+
+Builds a sparse user x course matrix from the enrollments table, derives
+course co-enrollment counts with one sparse product and keeps the top K
+courses per course by cosine similarity. Run it periodically:
+
+    python -m app.jobs.related_courses [--top-k 10]
+"""
+import argparse
+import logging
+from datetime import datetime, timezone
+import numpy as np
+from scipy import sparse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.enrollment import Enrollment
+from app.models.related_course import RelatedCourse
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip while streaming enrollments
+FETCH_BATCH_SIZE = 50_000
+
+
+def load_enrollment_matrix(db: Session):
+    """
+    Load enrollments as a sparse binary user x course matrix
+
+    Returns:
+        (matrix, course_ids) where column j of the matrix is course_ids[j]
+    """
+    user_chunks, course_chunks = [], []
+    result = db.execute(
+        select(Enrollment.user_id, Enrollment.course_id).execution_options(yield_per=FETCH_BATCH_SIZE)
+    )
+    for rows in result.partitions():
+        pairs = np.asarray(rows, dtype=np.int64).reshape(-1, 2)
+        user_chunks.append(pairs[:, 0])
+        course_chunks.append(pairs[:, 1])
+
+    if not user_chunks:
+        return sparse.csr_matrix((0, 0), dtype=np.float64), np.empty(0, dtype=np.int64)
+
+    user_ids = np.concatenate(user_chunks)
+    course_ids = np.concatenate(course_chunks)
+
+    # Compress database IDs into dense row/column indices
+    _, rows = np.unique(user_ids, return_inverse=True)
+    columns_ids, columns = np.unique(course_ids, return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, columns)),
+        shape=(rows.max() + 1, len(columns_ids))
+    )
+    return matrix, columns_ids
+
+
+def compute_related_courses(matrix, course_ids, top_k: int):
+    """
+    Rank courses by co-enrollment cosine similarity
+
+    Args:
+        matrix: Sparse binary user x course matrix
+        course_ids: Course ID of each matrix column
+        top_k: Number of related courses to keep per course
+
+    Returns:
+        List of (course_id, rank, related_course_id, score, shared_students)
+    """
+    if matrix.shape[1] == 0:
+        return []
+
+    # Course x course co-enrollment counts; the diagonal holds enrollment totals
+    co_enrollment = (matrix.T @ matrix).tocsr()
+    totals = co_enrollment.diagonal()
+    co_enrollment.setdiag(0)
+    co_enrollment.eliminate_zeros()
+
+    # Cosine similarity: shared / sqrt(total_i * total_j), applied to the
+    # non-zero entries only
+    norms = np.sqrt(totals)
+    similarity = co_enrollment.copy()
+    row_of_entry = np.repeat(np.arange(similarity.shape[0]), np.diff(similarity.indptr))
+    similarity.data = similarity.data / (norms[row_of_entry] * norms[similarity.indices])
+
+    results = []
+    for row in range(similarity.shape[0]):
+        start, end = similarity.indptr[row], similarity.indptr[row + 1]
+        if start == end:
+            continue
+        scores = similarity.data[start:end]
+        columns = similarity.indices[start:end]
+        shared = co_enrollment.data[start:end]
+
+        keep = min(top_k, len(scores))
+        best = np.argpartition(-scores, keep - 1)[:keep]
+        # Highest score first, ties broken by more shared students then course ID
+        best = best[np.lexsort((course_ids[columns[best]], -shared[best], -scores[best]))]
+
+        for rank, index in enumerate(best, start=1):
+            results.append((
+                int(course_ids[row]), rank, int(course_ids[columns[index]]),
+                float(scores[index]), int(shared[index])
+            ))
+    return results
+
+
+def rebuild_related_courses(db: Session, top_k: int = settings.RELATED_COURSES_TOP_K) -> int:
+    """
+    Recompute the related_courses table and swap it in one transaction
+
+    Returns:
+        Number of rows written
+    """
+    matrix, course_ids = load_enrollment_matrix(db)
+    results = compute_related_courses(matrix, course_ids, top_k)
+
+    computed_at = datetime.now(timezone.utc)
+    db.query(RelatedCourse).delete(synchronize_session=False)
+    if results:
+        db.execute(RelatedCourse.__table__.insert(), [
+            {
+                "course_id": course_id,
+                "rank": rank,
+                "related_course_id": related_course_id,
+                "score": score,
+                "shared_students": shared_students,
+                "computed_at": computed_at,
+            }
+            for course_id, rank, related_course_id, score, shared_students in results
+        ])
+    db.commit()
+
+    logger.info("Rebuilt related courses: %d rows for %d courses", len(results), matrix.shape[1])
+    return len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top-k", type=int, default=settings.RELATED_COURSES_TOP_K)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        rebuild_related_courses(db, top_k=args.top_k)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Maintenance jobs runnable through the background job queue
+
+Importing this module registers the tasks with the worker pool, so
+requests can schedule a rebuild with app.services.jobs.enqueue instead
+of running it inline or waiting for the periodic run.
+"""
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.services.jobs import enqueue, task
+
+RECONCILE_ROLLUPS = "rollups.reconcile"
+FOLD_DAILY_ROLLUPS = "rollups.fold_daily"
+REBUILD_RELATED_COURSES = "related_courses.rebuild"
+ARCHIVE_TERM = "terms.archive"
+
+
+@task(RECONCILE_ROLLUPS)
+def reconcile_rollups(db: Session) -> None:
+    """Repair per-course enrollment rollups"""
+    from app.jobs.enrollment_rollups import reconcile_course_stats
+    reconcile_course_stats(db)
+
+
+@task(FOLD_DAILY_ROLLUPS)
+def fold_daily_rollups(db: Session) -> None:
+    """Fold pending enrollment deltas into the per-course and daily rollups"""
+    from app.jobs.enrollment_rollups import fold_enrollment_deltas
+    fold_enrollment_deltas(db)
+
+
+@task(REBUILD_RELATED_COURSES)
+def rebuild_related(db: Session) -> None:
+    """Recompute "students also took" rankings"""
+    # numpy/scipy are only needed here; keep them out of application startup
+    from app.jobs.related_courses import rebuild_related_courses
+    rebuild_related_courses(db)
+
+
+@task(ARCHIVE_TERM)
+def archive_term_enrollments(db: Session, term_id: int) -> None:
+    """Move a closed term's enrollments to the archive"""
+    from app.jobs.term_archive import archive_term
+    # Stop well before the job lock expires and continue in a fresh job,
+    # so a long archival is never requeued while it is still running
+    if not archive_term(db, term_id, max_seconds=settings.JOB_LOCK_TIMEOUT_SECONDS / 2):
+        enqueue(db, ARCHIVE_TERM, {"term_id": term_id})
@@ -0,0 +1,97 @@
+"""
+Move the enrollments of a closed term to archived_enrollments
+
+Keeps the enrollments table, its indexes and everything that reads it
+(seat counts, rosters, the admin listing, the related courses job) down to
+the open terms. Rows move in primary key chunks through app.utils.backfill:
+each chunk copies and deletes the term's enrollments in one short
+transaction, and an interrupted run resumes after the last chunk.
+
+Closing a term schedules this as a background job; to run it by hand:
+
+    python -m app.jobs.term_archive TERM_CODE
+
+Per-course rollups are left as they were at closing, as the final counts
+of the term; archival is not a drop and writes no audit events.
+"""
+import argparse
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.enrollment_archive import ArchivedEnrollment
+from app.models.term import Term
+from app.utils.backfill import ChunkStep, run_backfill
+
+logger = logging.getLogger(__name__)
+
+
+def archive_step(term_id: int) -> ChunkStep:
+    """Chunk step moving the chunk's enrollments in courses of the term to the archive"""
+    enrollments = Enrollment.__table__
+    in_term = enrollments.c.course_id.in_(select(Course.id).where(Course.term_id == term_id))
+
+    def step(connection: Connection, lower: int, upper: int) -> int:
+        in_chunk = (enrollments.c.id > lower, enrollments.c.id <= upper, in_term)
+        connection.execute(insert(ArchivedEnrollment.__table__).from_select(
+            ["enrollment_id", "user_id", "course_id", "term_id", "created_at"],
+            select(enrollments.c.id, enrollments.c.user_id, enrollments.c.course_id,
+                   literal(term_id), enrollments.c.created_at).where(*in_chunk),
+        ))
+        return max(connection.execute(delete(enrollments).where(*in_chunk)).rowcount, 0)
+
+    return step
+
+
+def archive_term(db: Session, term_id: int, max_seconds: Optional[float] = None) -> bool:
+    """
+    Archive a closed term's enrollments, for at most max_seconds
+
+    Chunks commit on their own connections; marking the term archived is
+    left to the caller's commit.
+
+    Returns:
+        Whether every enrollment of the term has been archived
+    """
+    term = db.get(Term, term_id)
+    if term is None:
+        raise ValueError(f"Term {term_id} not found")
+    if not term.is_closed:
+        raise ValueError(f"Term {term.code} must be closed before it is archived")
+    if term.archived_at is not None:
+        return True
+
+    progress = run_backfill(db.get_bind().engine, f"archive_term_{term.id}", Enrollment.__table__,
+                            archive_step(term.id), max_seconds=max_seconds)
+    if progress["finished_at"] is None:
+        return False
+
+    term.archived_at = datetime.now(timezone.utc)
+    logger.info("Archived term %s: %d enrollments", term.code, progress["rows_processed"])
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("term_code")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        term = db.query(Term).filter(Term.code == args.term_code.upper()).first()
+        if term is None:
+            parser.error(f"Term {args.term_code} not found")
+        archive_term(db, term.id)
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
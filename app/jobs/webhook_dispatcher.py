@@ -0,0 +1,24 @@
+"""
+Deliver outbox events to registered webhook endpoints
+
+Runs the dispatcher loop in the foreground until interrupted:
+
+    python -m app.jobs.webhook_dispatcher
+"""
+import logging
+from app.services.webhooks import WebhookDispatcher
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    dispatcher = WebhookDispatcher()
+    try:
+        dispatcher.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.stop()
+
+
+if __name__ == "__main__":
+    main()
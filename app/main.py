@@ -1,7 +1,55 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, status, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from app.routers import auth, users, courses, enrollments
+from app.config import settings
+from app.middleware.access_log import AccessLogMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.load_shedding import (
+    LoadSheddingMiddleware, build_limits, limit_stats, GLOBAL, AUTH, CATALOG, ENROLLMENT_WRITES, EVENT_STREAMS
+)
+from app.routers import (
+    auth, users, courses, terms, enrollments, analytics, audit, webhooks, jobs, profiles, health as health_router
+)
+from app.server import WarmUp, prepare_worker
+from app.services.cache import cache, check_cache
+from app.services.jobs import JobWorkerPool
+from app.services.health import readiness, OK, DEGRADED
+from app.utils.structured_logging import configure_access_logging, shutdown_access_logging
+from app.utils.tracing import configure_trace_export, shutdown_trace_export
+from app.utils.profiling import ProfileRateLimiter
+from app.jobs import tasks as maintenance_tasks  # noqa: F401  (registers the tasks)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run background job workers, cache invalidation and the log and trace writers for the lifetime of the application"""
+    # Under a preloading server this runs in each worker after the fork
+    prepare_worker()
+    if settings.ACCESS_LOG_ENABLED:
+        configure_access_logging()
+    configure_trace_export(settings.TRACE_EXPORT)
+    cache.start()
+    job_pool = JobWorkerPool(workers=settings.JOB_WORKERS)
+    job_pool.start()
+    app.state.job_pool = job_pool
+    readiness.register("job_workers", job_pool.health_check)
+    warm_up = WarmUp(app)
+    app.state.warm_up = warm_up
+    readiness.register("warm_up", warm_up.health_check)
+    if settings.WARM_UP_ON_STARTUP:
+        warm_up.start()
+    else:
+        warm_up.skip()
+    try:
+        yield
+    finally:
+        job_pool.stop()
+        cache.close()
+        shutdown_access_logging()
+        shutdown_trace_export()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -9,9 +57,41 @@ app = FastAPI(
     description="A secure, database-backed RESTful API for managing course enrollments",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Admin-requested profiling of single requests, rate limited
+profile_rate_limiter = ProfileRateLimiter()
+app.add_middleware(ProfilingMiddleware, rate_limiter=profile_rate_limiter)
+
+# Cap in-flight requests and shed load once the queue-time budget is spent;
+# health checks are exempt and event streams only count against their own cap.
+# Added before CORS so rejections still carry CORS headers.
+request_limits = build_limits(settings.MAX_CONCURRENT_REQUESTS, {
+    AUTH: settings.MAX_CONCURRENT_AUTH_REQUESTS,
+    CATALOG: settings.MAX_CONCURRENT_CATALOG_REQUESTS,
+    ENROLLMENT_WRITES: settings.MAX_CONCURRENT_ENROLLMENT_WRITES,
+    EVENT_STREAMS: settings.MAX_CONCURRENT_EVENT_STREAMS,
+})
+app.add_middleware(
+    LoadSheddingMiddleware,
+    limits=request_limits,
+    queue_timeout=settings.REQUEST_QUEUE_TIMEOUT_SECONDS,
+    retry_after=settings.LOAD_SHED_RETRY_AFTER_SECONDS
+)
+
+
+def check_load_shedding(db):
+    """Readiness check: a full global limit means requests are queueing"""
+    stats = limit_stats(request_limits)
+    saturated = stats[GLOBAL]["in_flight"] >= stats[GLOBAL]["limit"]
+    return {"status": DEGRADED if saturated else OK, "limits": stats}
+
+
+readiness.register("load_shedding", check_load_shedding)
+readiness.register("cache", check_cache)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,15 +101,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Root span for sampled requests; a no-op unless TRACE_EXPORT is set
+app.add_middleware(TracingMiddleware)
+
+# Outermost, so shed and failed requests are logged with their full latency
+app.add_middleware(AccessLogMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(courses.router)
+app.include_router(terms.router)
 app.include_router(enrollments.router)
+app.include_router(analytics.router)
+app.include_router(audit.router)
+app.include_router(webhooks.router)
+app.include_router(jobs.router)
+app.include_router(profiles.router)
+app.include_router(health_router.router)
 
 
 @app.get("/", tags=["Health"])
-def health_check():
+async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
@@ -39,8 +132,8 @@ def health_check():
 
 
 @app.get("/health", tags=["Health"])
-def health():
-    """Alternative health check endpoint"""
+async def health():
+    """Alternative health check endpoint (liveness only; see /health/ready)"""
     return {"status": "ok"}
 
 
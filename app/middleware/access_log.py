@@ -0,0 +1,110 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.config import settings
+from app.utils.structured_logging import ACCESS_LOGGER
+
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+
+@dataclass
+class RequestMetrics:
+    """Per-request counters filled in while the request is served"""
+    db_time: float = 0.0
+    query_count: int = 0
+    user_id: Optional[int] = None
+
+
+# Set by the middleware; sync endpoints run on threadpool copies of the
+# context, which share this object, so their queries are counted too
+request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def record_request_user(user_id: int) -> None:
+    """Attach the authenticated user to the current request's access log entry"""
+    metrics = request_metrics.get()
+    if metrics is not None:
+        metrics.user_id = user_id
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if request_metrics.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    metrics = request_metrics.get()
+    started = conn.info.get("query_started")
+    if metrics is not None and started:
+        metrics.db_time += time.perf_counter() - started.pop()
+        metrics.query_count += 1
+
+
+def should_log(route: str, status_code: int, latency_ms: float) -> bool:
+    """
+    Decide whether a request gets an access log entry
+
+    Errors and slow requests are always logged; other requests are sampled
+    at their route's rate from ACCESS_LOG_ROUTE_SAMPLE_RATES, falling back
+    to ACCESS_LOG_SAMPLE_RATE.
+    """
+    if status_code >= 400 or latency_ms >= settings.ACCESS_LOG_SLOW_REQUEST_MS:
+        return True
+    rate = settings.ACCESS_LOG_ROUTE_SAMPLE_RATES.get(route, settings.ACCESS_LOG_SAMPLE_RATE)
+    return rate >= 1 or random.random() < rate
+
+
+class AccessLogMiddleware:
+    """
+    Emit one structured access log entry per request
+
+    Entries carry the route template (not the raw path, so they aggregate),
+    status, latency, DB time, query count and user ID. Records go to the
+    `app.access` logger; formatting happens off the request path on the
+    queue listener set up by configure_access_logging.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.reset(token)
+            latency_ms = (time.perf_counter() - started) * 1000
+            route = scope.get("route")
+            template = getattr(route, "path", None) or scope["path"]
+            if should_log(template, status_code, latency_ms):
+                access_logger.info("access", extra={"fields": {
+                    "method": scope["method"],
+                    "route": template,
+                    "status": status_code,
+                    "latency_ms": round(latency_ms, 2),
+                    "db_time_ms": round(metrics.db_time * 1000, 2),
+                    "query_count": metrics.query_count,
+                    "user_id": metrics.user_id,
+                }})
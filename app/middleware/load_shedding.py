@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Limit applied to every non-exempt request
+GLOBAL = "global"
+
+# Route classes with their own in-flight cap
+AUTH = "auth"
+CATALOG = "catalog"
+ENROLLMENT_WRITES = "enrollment_writes"
+EVENT_STREAMS = "event_streams"
+
+# Route classes limited by their own cap only; their requests stay open for
+# minutes and would otherwise hold global slots
+STANDALONE_CLASSES = {EVENT_STREAMS}
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def classify_request(method: str, path: str) -> Optional[str]:
+    """Map a request to its route class; None means only the global cap applies"""
+    if path.startswith("/auth/"):
+        return AUTH
+    if path == "/courses" or path.startswith("/courses/"):
+        return CATALOG if method in READ_METHODS else None
+    if path.startswith("/enrollments/tickets/") and path.endswith("/stream"):
+        return EVENT_STREAMS
+    if path == "/enrollments" or path.startswith("/enrollments/"):
+        return None if method in READ_METHODS else ENROLLMENT_WRITES
+    return None
+
+
+def queued_seconds(headers: Iterable) -> float:
+    """
+    Time a request already spent queued upstream, from X-Request-Start
+
+    Accepts the proxy formats `t=<seconds>` (nginx $msec), `t=<milliseconds>`
+    and `t=<microseconds>`. Missing or malformed headers count as zero.
+    """
+    for name, value in headers:
+        if name != b"x-request-start":
+            continue
+        try:
+            started = float(value.decode("latin-1").strip().removeprefix("t="))
+        except ValueError:
+            return 0.0
+        if started > 1e14:
+            started /= 1e6
+        elif started > 1e11:
+            started /= 1e3
+        return max(0.0, time.time() - started)
+    return 0.0
+
+
+class ConcurrencyLimit:
+    """
+    In-flight request cap with a FIFO wait queue
+
+    Used from the event loop thread only, so no locking is needed. A released
+    slot is handed directly to the oldest waiter so late arrivals cannot
+    overtake requests that are already queued.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.shed = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to timeout seconds; returns whether one was taken"""
+        if self.in_flight < self.limit and not self.waiting:
+            self.in_flight += 1
+            return True
+        if timeout <= 0:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the oldest live waiter if there is one"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class LoadSheddingMiddleware:
+    """
+    Cap in-flight requests globally and per route class
+
+    A request first takes a slot of its route class, then a global slot.
+    Waiting for slots is bounded by a queue-time budget that also counts
+    time spent queued upstream (X-Request-Start); once the budget is spent
+    the request gets a fast 503 with Retry-After instead of piling up in
+    the threadpool. Exempt paths (health checks) bypass the limits, and
+    standalone classes (event streams) only take a slot of their own class.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limits: Dict[str, ConcurrencyLimit],
+        queue_timeout: float,
+        retry_after: int = 1,
+        exempt_paths: Iterable[str] = ("/", "/health"),
+    ):
+        self.app = app
+        self.limits = limits
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.exempt_paths = frozenset(exempt_paths)
+
+    def is_exempt(self, path: str) -> bool:
+        return path in self.exempt_paths or path.startswith("/health/")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.queue_timeout - queued_seconds(scope["headers"])
+
+        route_class = classify_request(scope["method"], scope["path"])
+        limits = [self.limits[route_class]] if route_class in self.limits else []
+        if route_class not in STANDALONE_CLASSES:
+            limits.append(self.limits[GLOBAL])
+
+        acquired = []
+        for limit in limits:
+            if not await limit.acquire(deadline - loop.time()):
+                for held in acquired:
+                    held.release()
+                logger.warning("Shed %s %s: %s limit of %d reached",
+                               scope["method"], scope["path"], limit.name, limit.limit)
+                response = JSONResponse(
+                    status_code=503,
+                    content={"detail": "Server is busy, please retry shortly"},
+                    headers={"Retry-After": str(self.retry_after)}
+                )
+                await response(scope, receive, send)
+                return
+            acquired.append(limit)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for limit in acquired:
+                limit.release()
+
+
+def build_limits(max_concurrent: int, class_limits: Dict[str, int]) -> Dict[str, ConcurrencyLimit]:
+    """Create the global limit and one limit per route class"""
+    limits = {GLOBAL: ConcurrencyLimit(GLOBAL, max_concurrent)}
+    limits.update((name, ConcurrencyLimit(name, limit)) for name, limit in class_limits.items())
+    return limits
+
+
+def limit_stats(limits: Dict[str, ConcurrencyLimit]) -> Dict[str, dict]:
+    """In-flight, waiting and shed counts per limit"""
+    return {
+        name: {"limit": limit.limit, "in_flight": limit.in_flight, "waiting": limit.waiting, "shed": limit.shed}
+        for name, limit in limits.items()
+    }
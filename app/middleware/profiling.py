@@ -0,0 +1,95 @@
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.database import get_db
+from app.dependencies.auth import get_current_user, get_current_active_user, require_admin
+from app.utils.profiling import StackSampler, ProfileRateLimiter, active_sampler, store_profile
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY = "profile"
+
+
+def _wants_profile(scope: Scope) -> bool:
+    if Headers(scope=scope).get(PROFILE_HEADER) == "1":
+        return True
+    return QueryParams(scope.get("query_string", b"")).get(PROFILE_QUERY) == "1"
+
+
+def _check_admin(app, authorization: str) -> None:
+    """Run the require_admin dependency chain for a bearer token"""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    # Honour get_db overrides so the check uses the same database as the routes
+    db_dependency = app.dependency_overrides.get(get_db, get_db)
+    sessions = db_dependency()
+    db = next(sessions)
+    try:
+        require_admin(get_current_active_user(get_current_user(token, db)))
+    finally:
+        sessions.close()
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests on demand for admins
+
+    A request carrying `X-Profile: 1` or `?profile=1` is checked against
+    require_admin, then served with the sampling profiler attached to its
+    endpoint thread. The folded stacks are stored in PROFILE_DIR and the
+    file name is returned in the `X-Profile` response header; admins fetch
+    it from /profiles. One profile runs at a time and at most one starts
+    per PROFILE_MIN_INTERVAL_SECONDS, so the flag cannot be used to load
+    the service; excess requests get 429 with Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, rate_limiter: ProfileRateLimiter):
+        self.app = app
+        self.rate_limiter = rate_limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await run_in_threadpool(_check_admin, scope["app"], Headers(scope=scope).get("authorization", ""))
+        except HTTPException as exc:
+            response = JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
+            await response(scope, receive, send)
+            return
+
+        retry_after = self.rate_limiter.try_acquire()
+        if retry_after is not None:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "A profile was taken recently, please retry later"},
+                headers={"Retry-After": str(int(retry_after) + 1)}
+            )
+            await response(scope, receive, send)
+            return
+
+        sampler = StackSampler()
+        token = active_sampler.set(sampler)
+        profile_name = None
+        sampler.start()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal profile_name
+            if message["type"] == "http.response.start":
+                # The endpoint has returned by now; store before the headers go out
+                sampler.stop()
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                profile_name = await run_in_threadpool(store_profile, sampler.folded(), scope["method"], route)
+                message["headers"] = [*message.get("headers", []), (b"x-profile", profile_name.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            active_sampler.reset(token)
+            if profile_name is None:
+                sampler.stop()
+            self.rate_limiter.release()
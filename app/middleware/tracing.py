@@ -0,0 +1,61 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.tracing import (
+    Trace, SPAN_KIND_SERVER, current_trace, current_span, should_sample, export_enabled, export_trace
+)
+
+
+class TracingMiddleware:
+    """
+    Open a root span for sampled requests and export the finished trace
+
+    Unsampled requests pass straight through. Sampled responses carry a
+    `traceparent` header pointing at the root span, so a slow response can
+    be matched with its trace in the export file.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not export_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        sampled, trace_id, parent_id = should_sample(Headers(scope=scope).get("traceparent"))
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id)
+        root = trace.start_span(scope["method"], parent_id, SPAN_KIND_SERVER, {
+            "http.request.method": scope["method"],
+            "url.path": scope["path"],
+        })
+        trace_token = current_trace.set(trace)
+        span_token = current_span.set(root)
+        traceparent = f"00-{trace.trace_id}-{root.span_id}-01".encode("latin-1")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.attributes["http.response.status_code"] = message["status"]
+                root.error = message["status"] >= 500
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"traceparent", traceparent)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            root.error = True
+            root.attributes["error.type"] = type(exc).__name__
+            raise
+        finally:
+            current_span.reset(span_token)
+            current_trace.reset(trace_token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                root.name = f"{scope['method']} {route}"
+                root.attributes["http.route"] = route
+            root.end()
+            export_trace(trace)
@@ -0,0 +1,17 @@
+# Import every model so relationship() names resolve no matter which
+# module is imported first
+from app.models.user import User, UserRole
+from app.models.term import Term
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.enrollment_archive import ArchivedEnrollment
+from app.models.waitlist import WaitlistEntry
+from app.models.prerequisite import CoursePrerequisite, CoursePrerequisiteClosure
+from app.models.completion import CourseCompletion
+from app.models.meeting import CourseMeeting
+from app.models.related_course import RelatedCourse
+from app.models.enrollment_stats import CourseEnrollmentStats, DailyEnrollmentStats, EnrollmentStatDelta
+from app.models.audit import EnrollmentAuditEvent, AuditAction
+from app.models.outbox import OutboxEvent, WebhookEndpoint, WebhookDelivery, DeliveryStatus
+from app.models.job import BackgroundJob, JobStatus
+from app.models.backfill import BackfillProgress
@@ -0,0 +1,61 @@
+import enum
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import Column, Integer, DateTime, Enum, Index
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.database import Base, add_pending_row, register_pending_rows
+
+# Session.info key holding events not yet written
+PENDING_AUDIT_EVENTS = "pending_audit_events"
+
+
+class AuditAction(str, enum.Enum):
+    """Enrollment audit action enumeration"""
+    ENROLLED = "enrolled"
+    DEREGISTERED = "deregistered"
+    REMOVED = "removed"
+    PROMOTED = "promoted"
+
+
+class EnrollmentAuditEvent(Base):
+    """
+    Append-only history of enrollment changes
+
+    Rows are never updated or deleted and carry no foreign keys, so the
+    history outlives the users, courses and enrollments it mentions.
+    """
+    __tablename__ = "enrollment_audit_events"
+
+    id = Column(Integer, primary_key=True)
+    action = Column(Enum(AuditAction), nullable=False)
+    user_id = Column(Integer, nullable=False)
+    course_id = Column(Integer, nullable=False)
+    actor_id = Column(Integer, nullable=True)  # None for system actions
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('ix_enrollment_audit_events_created', 'created_at', 'id'),
+        Index('ix_enrollment_audit_events_course', 'course_id', 'created_at'),
+        Index('ix_enrollment_audit_events_user', 'user_id', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f"<EnrollmentAuditEvent(id={self.id}, action={self.action}, user_id={self.user_id}, course_id={self.course_id})>"
+
+
+def record_audit_event(db: Session, action: AuditAction, user_id: int, course_id: int,
+                       actor_id: Optional[int] = None) -> None:
+    """
+    Buffer an audit event on the session; it is written when the session commits
+    """
+    add_pending_row(db, PENDING_AUDIT_EVENTS, {
+        "action": action,
+        "user_id": user_id,
+        "course_id": course_id,
+        "actor_id": actor_id,
+        "created_at": datetime.now(timezone.utc),
+    })
+
+
+register_pending_rows(PENDING_AUDIT_EVENTS, EnrollmentAuditEvent.__table__)
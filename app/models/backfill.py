@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class BackfillProgress(Base):
+    """
+    Checkpoint of a chunked data backfill
+
+    Written in the same transaction as each chunk by app.utils.backfill, so
+    an interrupted backfill resumes after the last committed chunk.
+    """
+    __tablename__ = "backfill_progress"
+
+    name = Column(String(100), primary_key=True)
+    last_key = Column(Integer, nullable=False)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    chunks = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<BackfillProgress(name={self.name}, last_key={self.last_key}, finished_at={self.finished_at})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, CheckConstraint, ForeignKey
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -7,11 +7,15 @@ class Course(Base):
     """Course model for managing courses"""
     __tablename__ = "courses"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
     code = Column(String(50), unique=True, index=True, nullable=False)
     capacity = Column(Integer, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    admission_queue_enabled = Column(Boolean, default=False, nullable=False)
+    term_id = Column(Integer, ForeignKey("terms.id"), index=True, nullable=True)
+    # Bumped by admin edits (app.services.preconditions.bump_version), served as the ETag
+    version = Column(Integer, nullable=False, default=1)
     
     # Add check constraint for capacity
     __table_args__ = (
@@ -19,7 +23,11 @@ class Course(Base):
     )
     
     # Relationships
+    term = relationship("Term", back_populates="courses")
     enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
+    meetings = relationship("CourseMeeting", back_populates="course", cascade="all, delete-orphan",
+                            order_by="[CourseMeeting.day_of_week, CourseMeeting.start_minute]")
+    waitlist_entries = relationship("WaitlistEntry", back_populates="course", cascade="all, delete-orphan")
     
     @property
     def enrolled_count(self):
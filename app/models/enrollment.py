@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -8,14 +8,16 @@ class Enrollment(Base):
     """Enrollment model for managing student course enrollments"""
     __tablename__ = "enrollments"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
-    # Unique constraint to prevent duplicate enrollments
+    # Unique constraint to prevent duplicate enrollments; it leads with
+    # user_id, so course rosters and seat counts need their own index
     __table_args__ = (
         UniqueConstraint('user_id', 'course_id', name='unique_user_course_enrollment'),
+        Index('ix_enrollments_course_user', 'course_id', 'user_id'),
     )
     
     # Relationships
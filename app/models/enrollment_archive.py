@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ArchivedEnrollment(Base):
+    """
+    Enrollment of a closed term, moved out of the enrollments table
+
+    Written only by app.jobs.term_archive and read only by the history
+    endpoints; enrollment writes, seat counts and rosters never see it.
+    """
+    __tablename__ = "archived_enrollments"
+
+    id = Column(Integer, primary_key=True)
+    enrollment_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    term_id = Column(Integer, ForeignKey("terms.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Each history endpoint pages through one of these in id order
+    __table_args__ = (
+        Index('ix_archived_enrollments_term', 'term_id', 'id'),
+        Index('ix_archived_enrollments_course', 'course_id', 'id'),
+        Index('ix_archived_enrollments_user', 'user_id', 'id'),
+    )
+
+    course = relationship("Course")
+
+    def __repr__(self):
+        return f"<ArchivedEnrollment(id={self.id}, user_id={self.user_id}, course_id={self.course_id})>"
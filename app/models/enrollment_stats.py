@@ -0,0 +1,88 @@
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, Date, ForeignKey, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models.enrollment import Enrollment
+
+
+class CourseEnrollmentStats(Base):
+    """Per-course enrollment rollup, folded from EnrollmentStatDelta rows"""
+    __tablename__ = "course_enrollment_stats"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    enrolled_count = Column(Integer, nullable=False, default=0)
+    total_enrollments = Column(Integer, nullable=False, default=0)
+    total_drops = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CourseEnrollmentStats(course_id={self.course_id}, enrolled_count={self.enrolled_count})>"
+
+
+class DailyEnrollmentStats(Base):
+    """Per-day (UTC) enrollment and drop counts, folded from EnrollmentStatDelta rows"""
+    __tablename__ = "daily_enrollment_stats"
+
+    day = Column(Date, primary_key=True)
+    enrollments = Column(Integer, nullable=False, default=0)
+    drops = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyEnrollmentStats(day={self.day}, enrollments={self.enrollments}, drops={self.drops})>"
+
+
+class EnrollmentStatDelta(Base):
+    """
+    Enrollment and drop counts of one course in one flush, not yet folded
+
+    Flushes only insert these rows, so concurrent enrollments never wait on
+    a shared rollup row, not even within one course;
+    app.jobs.enrollment_rollups folds them into CourseEnrollmentStats and
+    DailyEnrollmentStats. Deltas without a course were written before
+    per-course rows were folded too, and only count towards their day.
+    """
+    __tablename__ = "enrollment_stat_deltas"
+
+    id = Column(Integer, primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="SET NULL"), nullable=True, index=True)
+    day = Column(Date, nullable=False, index=True)
+    enrollments = Column(Integer, nullable=False, default=0)
+    drops = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EnrollmentStatDelta(course_id={self.course_id}, day={self.day}, enrollments={self.enrollments}, drops={self.drops})>"
+
+
+def upsert_increment(connection, table, key: dict, increments: dict) -> None:
+    """INSERT the increments as initial values, or add them to the existing row"""
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    stmt = dialect_insert(table).values(**key, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={column: table.c[column] + stmt.excluded[column] for column in increments}
+    )
+    connection.execute(stmt)
+
+
+@event.listens_for(Session, "after_flush")
+def roll_up_enrollment_changes(session: Session, flush_context) -> None:
+    """
+    Append the enrollments added or deleted by a flush as rollup deltas
+
+    Runs inside the flushing transaction, so the deltas commit or roll back
+    together with the enrollment rows themselves. Nothing is updated in
+    place: every enrollment of a course would otherwise lock its rollup row
+    until commit. Bulk Core inserts bypass the ORM; reconcile those with
+    app.jobs.enrollment_rollups.
+    """
+    added = Counter(obj.course_id for obj in session.new if isinstance(obj, Enrollment))
+    dropped = Counter(obj.course_id for obj in session.deleted if isinstance(obj, Enrollment))
+    if not added and not dropped:
+        return
+
+    day = datetime.now(timezone.utc).date()
+    session.connection().execute(EnrollmentStatDelta.__table__.insert().values([
+        {"course_id": course_id, "day": day, "enrollments": added[course_id], "drops": dropped[course_id]}
+        for course_id in sorted(added.keys() | dropped.keys())
+    ]))
@@ -0,0 +1,63 @@
+import enum
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Enum, Index
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from app.database import Base, add_pending_row, register_pending_rows
+
+# Session.info key holding jobs not yet written
+PENDING_BACKGROUND_JOBS = "pending_background_jobs"
+
+
+class JobStatus(str, enum.Enum):
+    """Background job status enumeration"""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+
+class BackgroundJob(Base):
+    """Unit of deferred work picked up by the job worker pool"""
+    __tablename__ = "background_jobs"
+
+    id = Column(Integer, primary_key=True)
+    task = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_background_jobs_due', 'status', 'run_at'),
+    )
+
+    def __repr__(self):
+        return f"<BackgroundJob(id={self.id}, task={self.task}, status={self.status})>"
+
+
+def enqueue_job(db: Session, task: str, payload: dict, max_attempts: int, delay_seconds: float = 0) -> None:
+    """
+    Buffer a background job on the session
+
+    The job is written when the session commits, so it only exists if the
+    change that asked for it was committed.
+    """
+    now = datetime.now(timezone.utc)
+    add_pending_row(db, PENDING_BACKGROUND_JOBS, {
+        "task": task,
+        "payload": payload,
+        "status": JobStatus.PENDING,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_at": now + timedelta(seconds=delay_seconds),
+        "created_at": now,
+    })
+
+
+register_pending_rows(PENDING_BACKGROUND_JOBS, BackgroundJob.__table__)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class CourseMeeting(Base):
+    """Weekly meeting slot of a course"""
+    __tablename__ = "course_meetings"
+
+    id = Column(Integer, primary_key=True)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    day_of_week = Column(Integer, nullable=False)  # 0 = Monday
+    start_minute = Column(Integer, nullable=False)  # Minutes since midnight
+    end_minute = Column(Integer, nullable=False)
+
+    # Overlap checks join from a student's enrollments on course_id, then
+    # compare slots on the same day
+    __table_args__ = (
+        CheckConstraint('day_of_week BETWEEN 0 AND 6', name='check_meeting_day'),
+        CheckConstraint('start_minute >= 0 AND end_minute <= 1440 AND start_minute < end_minute', name='check_meeting_minutes'),
+        Index('ix_course_meetings_course_day', 'course_id', 'day_of_week', 'start_minute'),
+    )
+
+    # Relationships
+    course = relationship("Course", back_populates="meetings")
+
+    def __repr__(self):
+        return f"<CourseMeeting(course_id={self.course_id}, day={self.day_of_week}, {self.start_minute}-{self.end_minute})>"
@@ -0,0 +1,90 @@
+import enum
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Enum, Index
+from sqlalchemy.orm import Session, relationship
+from sqlalchemy.sql import func
+from app.database import Base, add_pending_row, register_pending_rows
+
+# Session.info key holding events not yet written
+PENDING_OUTBOX_EVENTS = "pending_outbox_events"
+
+
+class DeliveryStatus(str, enum.Enum):
+    """Webhook delivery status enumeration"""
+    PENDING = "pending"
+    DELIVERED = "delivered"
+    FAILED = "failed"
+
+
+class OutboxEvent(Base):
+    """Domain event written in the same transaction as the change it describes"""
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    dispatched_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_outbox_events_dispatched', 'dispatched_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, event_type={self.event_type})>"
+
+
+class WebhookEndpoint(Base):
+    """Registered receiver of outbox events"""
+    __tablename__ = "webhook_endpoints"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), nullable=False)
+    max_concurrency = Column(Integer, nullable=False, default=2)
+    is_active = Column(Boolean, default=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<WebhookEndpoint(id={self.id}, url={self.url})>"
+
+
+class WebhookDelivery(Base):
+    """Delivery state of one outbox event to one endpoint"""
+    __tablename__ = "webhook_deliveries"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("outbox_events.id", ondelete="CASCADE"), nullable=False)
+    endpoint_id = Column(Integer, ForeignKey("webhook_endpoints.id", ondelete="CASCADE"), nullable=False)
+    status = Column(Enum(DeliveryStatus), nullable=False, default=DeliveryStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    last_error = Column(String(500), nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('ix_webhook_deliveries_due', 'status', 'next_attempt_at'),
+    )
+
+    # Relationships
+    event = relationship("OutboxEvent")
+    endpoint = relationship("WebhookEndpoint")
+
+    def __repr__(self):
+        return f"<WebhookDelivery(id={self.id}, event_id={self.event_id}, endpoint_id={self.endpoint_id}, status={self.status})>"
+
+
+def publish_event(db: Session, event_type: str, payload: dict) -> None:
+    """
+    Buffer an outbox event on the session
+
+    It is written when the session commits; the webhook dispatcher
+    delivers it after that.
+    """
+    add_pending_row(db, PENDING_OUTBOX_EVENTS, {
+        "event_type": event_type,
+        "payload": payload,
+        "created_at": datetime.now(timezone.utc),
+    })
+
+
+register_pending_rows(PENDING_OUTBOX_EVENTS, OutboxEvent.__table__)
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, ForeignKey, CheckConstraint, Index
+from app.database import Base
+
+
+class CoursePrerequisite(Base):
+    """Direct prerequisite edge: course_id requires prerequisite_id"""
+    __tablename__ = "course_prerequisites"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    prerequisite_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (
+        CheckConstraint('course_id <> prerequisite_id', name='check_prerequisite_not_self'),
+    )
+
+    def __repr__(self):
+        return f"<CoursePrerequisite(course_id={self.course_id}, prerequisite_id={self.prerequisite_id})>"
+
+
+class CoursePrerequisiteClosure(Base):
+    """
+    Transitive closure of the prerequisite graph
+
+    One row per (course, course it requires directly or indirectly), kept in
+    sync with CoursePrerequisite so reachability is a single indexed lookup.
+    """
+    __tablename__ = "course_prerequisite_closure"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    required_course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+
+    # Reverse lookups ("which courses depend on X") for incremental updates
+    __table_args__ = (
+        Index('ix_course_prerequisite_closure_required', 'required_course_id'),
+    )
+
+    def __repr__(self):
+        return f"<CoursePrerequisiteClosure(course_id={self.course_id}, required_course_id={self.required_course_id})>"
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RelatedCourse(Base):
+    """
+    Precomputed "students also took" ranking
+
+    Rebuilt by app.jobs.related_courses; the primary key orders each course's
+    related courses by rank so the endpoint reads them with one range scan.
+    """
+    __tablename__ = "related_courses"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+    shared_students = Column(Integer, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<RelatedCourse(course_id={self.course_id}, rank={self.rank}, related_course_id={self.related_course_id})>"
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, CheckConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class Term(Base):
+    """
+    Academic term grouping courses
+
+    Closing a term deactivates its courses; archiving then moves their
+    enrollments to archived_enrollments (app.jobs.term_archive), so the
+    enrollments table only holds open terms.
+    """
+    __tablename__ = "terms"
+
+    id = Column(Integer, primary_key=True)
+    code = Column(String(20), unique=True, index=True, nullable=False)
+    name = Column(String(100), nullable=False)
+    starts_on = Column(Date, nullable=False)
+    ends_on = Column(Date, nullable=False)
+    closed_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        CheckConstraint('ends_on >= starts_on', name='check_term_dates'),
+    )
+
+    courses = relationship("Course", back_populates="term")
+
+    @property
+    def is_closed(self):
+        """Whether the term no longer takes enrollments"""
+        return self.closed_at is not None
+
+    def __repr__(self):
+        return f"<Term(id={self.id}, code={self.code})>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class WaitlistEntry(Base):
+    """Waitlist entry for a student waiting for a seat in a full course"""
+    __tablename__ = "waitlist_entries"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # One entry per student per course; the composite index serves both
+    # "next in line" and "position of entry" lookups without a scan
+    __table_args__ = (
+        UniqueConstraint('user_id', 'course_id', name='unique_user_course_waitlist'),
+        Index('ix_waitlist_entries_course_order', 'course_id', 'created_at', 'id'),
+    )
+
+    # Relationships
+    user = relationship("User")
+    course = relationship("Course", back_populates="waitlist_entries")
+
+    def __repr__(self):
+        return f"<WaitlistEntry(id={self.id}, user_id={self.user_id}, course_id={self.course_id})>"
@@ -0,0 +1,157 @@
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Annotated, List, Optional
+from app.database import get_db
+from app.dependencies.auth import require_admin
+from app.models.user import User
+from app.models.course import Course
+from app.models.enrollment_stats import CourseEnrollmentStats, DailyEnrollmentStats, EnrollmentStatDelta
+from app.schemas.analytics import CourseFillRate, DailyEnrollments, AnalyticsSummary
+from app.utils.exceptions import BadRequestException
+from app.utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"], route_class=TracedRoute)
+
+
+class CourseSort(str, Enum):
+    """Sort order for course analytics"""
+    ENROLLED = "enrolled"
+    FILL_RATE = "fill_rate"
+
+
+def _pending_course_deltas(db: Session):
+    """Per-course sums of the deltas not yet folded into CourseEnrollmentStats"""
+    return db.query(
+        EnrollmentStatDelta.course_id,
+        func.sum(EnrollmentStatDelta.enrollments).label("enrollments"),
+        func.sum(EnrollmentStatDelta.drops).label("drops")
+    ).filter(
+        EnrollmentStatDelta.course_id.isnot(None)
+    ).group_by(EnrollmentStatDelta.course_id).subquery()
+
+
+@router.get("/summary", response_model=AnalyticsSummary)
+def get_analytics_summary(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Get platform-wide enrollment totals for active courses (admin only)
+    
+    Returns capacity, enrolled students and overall fill rate
+    """
+    pending = _pending_course_deltas(db)
+    enrolled = (
+        func.coalesce(CourseEnrollmentStats.enrolled_count, 0)
+        + func.coalesce(pending.c.enrollments, 0) - func.coalesce(pending.c.drops, 0)
+    )
+    active_courses, total_capacity, total_enrolled = db.query(
+        func.count(Course.id),
+        func.coalesce(func.sum(Course.capacity), 0),
+        func.coalesce(func.sum(enrolled), 0)
+    ).outerjoin(
+        CourseEnrollmentStats, CourseEnrollmentStats.course_id == Course.id
+    ).outerjoin(
+        pending, pending.c.course_id == Course.id
+    ).filter(Course.is_active == True).one()
+    
+    return AnalyticsSummary(
+        active_courses=active_courses,
+        total_capacity=total_capacity,
+        total_enrolled=total_enrolled,
+        fill_rate=total_enrolled / total_capacity if total_capacity else 0.0
+    )
+
+
+@router.get("/courses", response_model=List[CourseFillRate])
+def get_course_analytics(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)],
+    sort: CourseSort = CourseSort.ENROLLED,
+    limit: Annotated[int, Query(ge=1, le=500)] = 20
+):
+    """
+    Get per-course enrollment rollups (admin only)
+    
+    - **sort**: `enrolled` for top courses, `fill_rate` for fullest courses
+    - **limit**: Maximum number of courses to return (1-500)
+    
+    Deltas not yet folded into the rollups by the rollup job are added in,
+    so the counts are current.
+    
+    Returns courses with their fill rates, highest first
+    """
+    pending = _pending_course_deltas(db)
+    pending_enrollments = func.coalesce(pending.c.enrollments, 0)
+    pending_drops = func.coalesce(pending.c.drops, 0)
+    enrolled = func.coalesce(CourseEnrollmentStats.enrolled_count, 0) + pending_enrollments - pending_drops
+    fill_rate = enrolled * 1.0 / Course.capacity
+    query = db.query(
+        Course.id.label("course_id"),
+        Course.code,
+        Course.title,
+        Course.capacity,
+        enrolled.label("enrolled_count"),
+        fill_rate.label("fill_rate"),
+        (func.coalesce(CourseEnrollmentStats.total_enrollments, 0) + pending_enrollments).label("total_enrollments"),
+        (func.coalesce(CourseEnrollmentStats.total_drops, 0) + pending_drops).label("total_drops")
+    ).outerjoin(
+        CourseEnrollmentStats, CourseEnrollmentStats.course_id == Course.id
+    ).outerjoin(
+        pending, pending.c.course_id == Course.id
+    )
+    
+    order = enrolled if sort == CourseSort.ENROLLED else fill_rate
+    rows = query.order_by(order.desc(), Course.id).limit(limit).all()
+    
+    return [CourseFillRate(**row._mapping) for row in rows]
+
+
+@router.get("/enrollments/daily", response_model=List[DailyEnrollments])
+def get_daily_enrollments(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)],
+    start: Optional[date] = None,
+    end: Optional[date] = None
+):
+    """
+    Get enrollments and drops per day (admin only)
+    
+    - **start**: First day to include (defaults to 30 days before `end`)
+    - **end**: Last day to include (defaults to today, UTC)
+    
+    Deltas not yet folded into their day by the rollup job are added in,
+    so the counts are current.
+    
+    Returns one bucket per day that had activity, oldest first
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=30)
+    if start > end:
+        raise BadRequestException(detail="start must not be after end")
+    if (end - start).days > 366:
+        raise BadRequestException(detail="Date range cannot exceed one year")
+    
+    days = {
+        row.day: [row.enrollments, row.drops]
+        for row in db.query(DailyEnrollmentStats).filter(
+            DailyEnrollmentStats.day >= start,
+            DailyEnrollmentStats.day <= end
+        )
+    }
+    pending = db.query(
+        EnrollmentStatDelta.day, func.sum(EnrollmentStatDelta.enrollments), func.sum(EnrollmentStatDelta.drops)
+    ).filter(
+        EnrollmentStatDelta.day >= start,
+        EnrollmentStatDelta.day <= end
+    ).group_by(EnrollmentStatDelta.day)
+    for day, enrollments, drops in pending:
+        counts = days.setdefault(day, [0, 0])
+        counts[0] += enrollments
+        counts[1] += drops
+    
+    return [DailyEnrollments(day=day, enrollments=enrollments, drops=drops)
+            for day, (enrollments, drops) in sorted(days.items())]
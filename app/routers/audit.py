@@ -0,0 +1,59 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Annotated, Optional
+from app.database import get_db
+from app.dependencies.auth import require_admin
+from app.models.user import User
+from app.models.audit import EnrollmentAuditEvent, AuditAction
+from app.schemas.audit import AuditEventPage
+from app.utils.exceptions import BadRequestException
+from app.utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/audit", tags=["Audit"], route_class=TracedRoute)
+
+
+@router.get("/enrollments", response_model=AuditEventPage)
+def get_enrollment_audit_events(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    course_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    action: Optional[AuditAction] = None,
+    cursor: Optional[int] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100
+):
+    """
+    Get enrollment history, newest first (admin only)
+    
+    - **start** / **end**: Time range to include
+    - **course_id** / **user_id** / **action**: Optional filters
+    - **cursor**: `next_cursor` from the previous page
+    - **limit**: Page size (1-500)
+    
+    Returns a page of events and the cursor for the next page, if any
+    """
+    if start and end and start > end:
+        raise BadRequestException(detail="start must not be after end")
+    
+    query = db.query(EnrollmentAuditEvent)
+    if start:
+        query = query.filter(EnrollmentAuditEvent.created_at >= start)
+    if end:
+        query = query.filter(EnrollmentAuditEvent.created_at <= end)
+    if course_id is not None:
+        query = query.filter(EnrollmentAuditEvent.course_id == course_id)
+    if user_id is not None:
+        query = query.filter(EnrollmentAuditEvent.user_id == user_id)
+    if action is not None:
+        query = query.filter(EnrollmentAuditEvent.action == action)
+    if cursor is not None:
+        query = query.filter(EnrollmentAuditEvent.id < cursor)
+    
+    # Keyset pagination: fetch one extra row to know whether a next page exists
+    events = query.order_by(EnrollmentAuditEvent.id.desc()).limit(limit + 1).all()
+    next_cursor = events[limit - 1].id if len(events) > limit else None
+    
+    return AuditEventPage(events=events[:limit], next_cursor=next_cursor)
@@ -8,8 +8,9 @@ from app.schemas.user import UserResponse
 from app.models.user import User
 from app.utils.security import hash_password, verify_password, create_access_token
 from app.utils.exceptions import BadRequestException, UnauthorizedException
+from app.utils.tracing import TracedRoute
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TracedRoute)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
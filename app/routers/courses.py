@@ -1,14 +1,36 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import Annotated, List
+from datetime import time
+from typing import Annotated, List, Optional
+from app.config import settings
 from app.database import get_db
 from app.dependencies.auth import get_current_active_user, require_admin
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.models.course import Course
-from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse
+from app.models.completion import CourseCompletion
+from app.models.meeting import CourseMeeting
+from app.models.related_course import RelatedCourse
+from app.schemas.course import (
+    CourseCreate, CourseUpdate, CourseResponse, PrerequisiteUpdate,
+    CoursePrerequisitesResponse, CompletionCreate, CompletionResponse,
+    MeetingSlot, CourseMeetingsUpdate, RelatedCourseResponse
+)
+from app.services.admission import check_admission_mode
+from app.services.schedule import set_meetings
+from app.services.prerequisites import set_prerequisites, get_direct_prerequisites, get_required_courses
+from app.services.waitlist import promote_from_waitlist
+from app.services.catalog import get_catalog
+from app.services.terms import get_open_term
+from app.services.preconditions import version_etag, check_if_match, bump_version
+from app.services.jobs import enqueue
+from app.services.notifications import NOTIFY_COURSE_DEACTIVATED
 from app.utils.exceptions import NotFoundException, BadRequestException
+from app.utils.tracing import TracedRoute
 
-router = APIRouter(prefix="/courses", tags=["Courses"])
+router = APIRouter(prefix="/courses", tags=["Courses"], route_class=TracedRoute)
+
+IfMatch = Annotated[Optional[str], Header(alias="If-Match")]
 
 
 @router.get("", response_model=List[CourseResponse])
@@ -18,32 +40,69 @@ def get_all_active_courses(
     """
     Get all active courses (public endpoint)
     
-    Returns a list of all active courses with enrollment information
+    Returns a list of all active courses with enrollment information.
+    The serialized list is served from the shared cache and dropped
+    whenever a course or enrollment changes.
     """
-    courses = db.query(Course).filter(Course.is_active == True).all()
-    return courses
+    return JSONResponse(content=get_catalog(db))
 
 
 @router.get("/{course_id}", response_model=CourseResponse)
 def get_course_by_id(
     course_id: int,
+    response: Response,
     db: Annotated[Session, Depends(get_db)]
 ):
     """
     Get a specific course by ID (public endpoint)
     
-    Returns course details with enrollment information
+    Returns course details with enrollment information. The `ETag` header
+    carries the course version to send as `If-Match` when updating it.
     """
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise NotFoundException(detail="Course not found")
     
+    response.headers["ETag"] = version_etag(course.version)
     return course
 
 
+@router.get("/{course_id}/related", response_model=List[RelatedCourseResponse])
+def get_related_courses(
+    course_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    limit: Annotated[int, Query(ge=1, le=settings.RELATED_COURSES_TOP_K)] = settings.RELATED_COURSES_TOP_K
+):
+    """
+    Get courses frequently taken together with a course (public endpoint)
+    
+    - **limit**: Maximum number of courses to return (1 to RELATED_COURSES_TOP_K,
+      the number of rankings stored per course)
+    
+    Rankings come from the periodic `app.jobs.related_courses` job, so new
+    enrollments show up after its next run. Inactive courses are skipped.
+    
+    Returns related active courses, most similar first
+    """
+    rows = db.query(
+        Course.id, Course.title, Course.code, RelatedCourse.score, RelatedCourse.shared_students
+    ).join(
+        Course, Course.id == RelatedCourse.related_course_id
+    ).filter(
+        RelatedCourse.course_id == course_id,
+        Course.is_active == True
+    ).order_by(RelatedCourse.rank).limit(limit).all()
+    
+    if not rows and not db.query(Course.id).filter(Course.id == course_id).first():
+        raise NotFoundException(detail="Course not found")
+    
+    return [RelatedCourseResponse(**row._mapping) for row in rows]
+
+
 @router.post("", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 def create_course(
     course_data: CourseCreate,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(require_admin)]
 ):
@@ -54,6 +113,9 @@ def create_course(
     - **code**: Unique course code (2-50 characters, will be converted to uppercase)
     - **capacity**: Maximum number of students (must be > 0)
     - **is_active**: Whether the course is active (defaults to true)
+    - **admission_queue_enabled**: Queue enrollment requests through the admission queue (defaults to false;
+      only while a single server worker runs)
+    - **term_id**: Open term the course runs in (optional)
     
     Returns the created course
     """
@@ -62,18 +124,24 @@ def create_course(
     if existing_course:
         raise BadRequestException(detail=f"Course with code '{course_data.code}' already exists")
     
+    get_open_term(db, course_data.term_id)
+    check_admission_mode(course_data.admission_queue_enabled)
+    
     # Create new course
     new_course = Course(
         title=course_data.title,
         code=course_data.code,
         capacity=course_data.capacity,
-        is_active=course_data.is_active
+        is_active=course_data.is_active,
+        admission_queue_enabled=course_data.admission_queue_enabled,
+        term_id=course_data.term_id
     )
     
     db.add(new_course)
     db.commit()
     db.refresh(new_course)
     
+    response.headers["ETag"] = version_etag(new_course.version)
     return new_course
 
 
@@ -81,8 +149,10 @@ def create_course(
 def update_course(
     course_id: int,
     course_data: CourseUpdate,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)]
+    current_user: Annotated[User, Depends(require_admin)],
+    if_match: IfMatch = None
 ):
     """
     Update a course (admin only)
@@ -93,14 +163,34 @@ def update_course(
     - **code**: Unique course code (2-50 characters, will be converted to uppercase)
     - **capacity**: Maximum number of students (must be > 0)
     - **is_active**: Whether the course is active
+    - **admission_queue_enabled**: Queue enrollment requests through the admission queue
+      (only while a single server worker runs)
+    - **term_id**: Open term the course runs in
+    
+    Courses of closed terms cannot be reactivated or moved.
+    
+    Requires `If-Match` with the course's current `ETag` (428 without it);
+    an edit made since that ETag was read gives 412 instead of being
+    overwritten.
     
-    Returns the updated course
+    Returns the updated course and its new `ETag`
     """
     # Get course
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise NotFoundException(detail="Course not found")
     
+    check_if_match(if_match, course.version)
+    
+    if course_data.term_id is not None and course_data.term_id != course.term_id:
+        if course.term is not None and course.term.is_closed:
+            raise BadRequestException(detail="Course belongs to a closed term")
+        get_open_term(db, course_data.term_id)
+    if course_data.is_active and course.term is not None and course.term.is_closed:
+        raise BadRequestException(detail="Course belongs to a closed term")
+    if not course.admission_queue_enabled:
+        check_admission_mode(course_data.admission_queue_enabled)
+    
     # Check if new code conflicts with existing course
     if course_data.code and course_data.code != course.code:
         existing_course = db.query(Course).filter(Course.code == course_data.code).first()
@@ -108,13 +198,20 @@ def update_course(
             raise BadRequestException(detail=f"Course with code '{course_data.code}' already exists")
     
     # Update fields
+    expected_version = course.version
     update_data = course_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(course, field, value)
     
+    # Extra capacity goes to the waitlist first
+    promote_from_waitlist(db, course)
+    
+    # Only commits if nobody changed the course since the version checked above
+    bump_version(db, course, expected_version)
     db.commit()
     db.refresh(course)
     
+    response.headers["ETag"] = version_etag(course.version)
     return course
 
 
@@ -122,25 +219,189 @@ def update_course(
 def toggle_course_activation(
     course_id: int,
     is_active: bool,
+    response: Response,
     db: Annotated[Session, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)]
+    current_user: Annotated[User, Depends(require_admin)],
+    if_match: IfMatch = None
 ):
     """
     Activate or deactivate a course (admin only)
     
     - **is_active**: True to activate, False to deactivate
     
-    Returns the updated course
+    Courses of closed terms cannot be reactivated. Requires `If-Match`
+    with the course's current `ETag`, as for updates.
+    
+    Returns the updated course and its new `ETag`
     """
     # Get course
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise NotFoundException(detail="Course not found")
     
-    # Update activation status
+    check_if_match(if_match, course.version)
+    
+    if is_active and course.term is not None and course.term.is_closed:
+        raise BadRequestException(detail="Course belongs to a closed term")
+    
+    # Update activation status; enrolled students are told off the request path,
+    # and the notification is dropped with the rollback if the update loses a race
+    expected_version = course.version
+    if course.is_active and not is_active:
+        enqueue(db, NOTIFY_COURSE_DEACTIVATED, {"course_id": course.id})
     course.is_active = is_active
     
+    bump_version(db, course, expected_version)
     db.commit()
     db.refresh(course)
     
+    response.headers["ETag"] = version_etag(course.version)
     return course
+
+
+@router.get("/{course_id}/prerequisites", response_model=CoursePrerequisitesResponse)
+def get_course_prerequisites(
+    course_id: int,
+    db: Annotated[Session, Depends(get_db)]
+):
+    """
+    Get the prerequisites of a course (public endpoint)
+    
+    Returns the direct prerequisites and every course required transitively
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise NotFoundException(detail="Course not found")
+    
+    return CoursePrerequisitesResponse(
+        course_id=course.id,
+        prerequisite_ids=get_direct_prerequisites(db, course.id),
+        required_course_ids=get_required_courses(db, course.id)
+    )
+
+
+@router.put("/{course_id}/prerequisites", response_model=CoursePrerequisitesResponse)
+def update_course_prerequisites(
+    course_id: int,
+    prerequisite_data: PrerequisiteUpdate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Replace the direct prerequisites of a course (admin only)
+    
+    - **prerequisite_ids**: IDs of the courses that must be completed first
+    
+    Changes that would create a prerequisite cycle are rejected.
+    
+    Returns the updated prerequisites
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise NotFoundException(detail="Course not found")
+    
+    set_prerequisites(db, course, prerequisite_data.prerequisite_ids)
+    db.commit()
+    
+    return CoursePrerequisitesResponse(
+        course_id=course.id,
+        prerequisite_ids=get_direct_prerequisites(db, course.id),
+        required_course_ids=get_required_courses(db, course.id)
+    )
+
+
+@router.post("/{course_id}/completions", response_model=CompletionResponse, status_code=status.HTTP_201_CREATED)
+def record_course_completion(
+    course_id: int,
+    completion_data: CompletionCreate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Record that a student completed a course (admin only)
+    
+    - **user_id**: ID of the student
+    
+    Returns the completion record
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise NotFoundException(detail="Course not found")
+    
+    student = db.query(User).filter(User.id == completion_data.user_id).first()
+    if not student or student.role != UserRole.STUDENT:
+        raise NotFoundException(detail="Student not found")
+    
+    existing = db.query(CourseCompletion).filter(
+        CourseCompletion.user_id == student.id,
+        CourseCompletion.course_id == course.id
+    ).first()
+    if existing:
+        raise BadRequestException(detail="Completion already recorded")
+    
+    completion = CourseCompletion(user_id=student.id, course_id=course.id)
+    db.add(completion)
+    db.commit()
+    db.refresh(completion)
+    
+    return completion
+
+
+def _meeting_slots(db: Session, course_id: int) -> List[MeetingSlot]:
+    """Load a course's meeting slots in weekly order"""
+    meetings = db.query(CourseMeeting).filter(
+        CourseMeeting.course_id == course_id
+    ).order_by(CourseMeeting.day_of_week, CourseMeeting.start_minute).all()
+    return [
+        MeetingSlot(
+            day_of_week=meeting.day_of_week,
+            start_time=time(meeting.start_minute // 60, meeting.start_minute % 60),
+            end_time=time(meeting.end_minute // 60, meeting.end_minute % 60)
+        )
+        for meeting in meetings
+    ]
+
+
+@router.get("/{course_id}/meetings", response_model=List[MeetingSlot])
+def get_course_meetings(
+    course_id: int,
+    db: Annotated[Session, Depends(get_db)]
+):
+    """
+    Get the weekly meeting slots of a course (public endpoint)
+    
+    Returns the meeting slots ordered by day and start time
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise NotFoundException(detail="Course not found")
+    
+    return _meeting_slots(db, course.id)
+
+
+@router.put("/{course_id}/meetings", response_model=List[MeetingSlot])
+def update_course_meetings(
+    course_id: int,
+    meeting_data: CourseMeetingsUpdate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Replace the weekly meeting slots of a course (admin only)
+    
+    - **meetings**: List of slots with `day_of_week` (0 = Monday), `start_time` and `end_time`
+    
+    Enrollments that would overlap with a student's other courses are rejected.
+    
+    Returns the updated meeting slots
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise NotFoundException(detail="Course not found")
+    
+    set_meetings(db, course, [
+        (slot.day_of_week, slot.start_minute, slot.end_minute) for slot in meeting_data.meetings
+    ])
+    db.commit()
+    
+    return _meeting_slots(db, course.id)
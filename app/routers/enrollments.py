@@ -1,4 +1,7 @@
+import asyncio
 from fastapi import APIRouter, Depends, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Annotated, List
 from app.database import get_db
@@ -6,13 +9,34 @@ from app.dependencies.auth import get_current_active_user, require_admin
 from app.models.user import User, UserRole
 from app.models.course import Course
 from app.models.enrollment import Enrollment
-from app.schemas.enrollment import EnrollmentCreate, EnrollmentResponse, EnrollmentList
-from app.utils.exceptions import NotFoundException, BadRequestException, ForbiddenException
+from app.models.waitlist import WaitlistEntry
+from app.models.audit import AuditAction
+from app.schemas.enrollment import (
+    EnrollmentCreate, EnrollmentCheckout, EnrollmentResponse, EnrollmentList, AdmissionTicketResponse
+)
+from app.schemas.waitlist import WaitlistJoin, WaitlistEntryResponse
+from app.server import admission_available
+from app.services.admission import admission_queue, AdmissionQueueFull, AdmissionTicket
+from app.services.enrollment import get_enrollable_course, enroll_student, enroll_student_in_courses, drop_enrollment
+from app.services.waitlist import join_waitlist, waitlist_position
+from app.utils.exceptions import NotFoundException, BadRequestException, ForbiddenException, ServiceUnavailableException
+from app.utils.tracing import TracedRoute
 
-router = APIRouter(prefix="/enrollments", tags=["Enrollments"])
+router = APIRouter(prefix="/enrollments", tags=["Enrollments"], route_class=TracedRoute)
 
+# Interval between keep-alive comments on ticket event streams
+TICKET_STREAM_KEEPALIVE_SECONDS = 15
 
-@router.post("", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
+# How often open ticket event streams check their ticket
+TICKET_STREAM_POLL_SECONDS = 0.5
+
+
+@router.post(
+    "",
+    response_model=EnrollmentResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": AdmissionTicketResponse}}
+)
 def enroll_in_course(
     enrollment_data: EnrollmentCreate,
     db: Annotated[Session, Depends(get_db)],
@@ -29,44 +53,116 @@ def enroll_in_course(
     - Course must be active
     - Course must not be full
     
-    Returns the created enrollment
+    Returns the created enrollment. For courses in admission mode the request
+    is queued instead and a 202 with an admission ticket is returned; poll
+    `/enrollments/tickets/{ticket_id}` or stream its `/stream` endpoint for the outcome.
     """
     # Only students can enroll
     if current_user.role != UserRole.STUDENT:
         raise ForbiddenException(detail="Only students can enroll in courses")
     
-    # Check if course exists
-    course = db.query(Course).filter(Course.id == enrollment_data.course_id).first()
-    if not course:
-        raise NotFoundException(detail="Course not found")
+    course = get_enrollable_course(db, enrollment_data.course_id)
     
-    # Check if course is active
-    if not course.is_active:
-        raise BadRequestException(detail="Cannot enroll in inactive course")
+    # Hot courses are served by a single writer instead of contending on the row;
+    # under several workers the queue is unavailable and they enroll directly
+    if course.admission_queue_enabled and admission_available():
+        try:
+            ticket = admission_queue.submit(current_user.id, course.id)
+        except AdmissionQueueFull:
+            raise ServiceUnavailableException(detail="Admission queue is full, please retry shortly")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=jsonable_encoder(AdmissionTicketResponse.model_validate(ticket))
+        )
     
-    # Check if already enrolled
-    existing_enrollment = db.query(Enrollment).filter(
-        Enrollment.user_id == current_user.id,
-        Enrollment.course_id == enrollment_data.course_id
-    ).first()
-    if existing_enrollment:
-        raise BadRequestException(detail="Already enrolled in this course")
+    new_enrollment = enroll_student(db, current_user, course)
+    db.commit()
+    db.refresh(new_enrollment)
+    
+    return new_enrollment
+
+
+@router.post("/checkout", response_model=List[EnrollmentResponse], status_code=status.HTTP_201_CREATED)
+def checkout_enrollments(
+    checkout_data: EnrollmentCheckout,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Enroll the current user in several courses at once (student only)
     
-    # Check if course is full
-    if course.is_full:
-        raise BadRequestException(detail="Course is full")
+    - **course_ids**: IDs of the courses to enroll in (1-10)
     
-    # Create enrollment
-    new_enrollment = Enrollment(
-        user_id=current_user.id,
-        course_id=enrollment_data.course_id
-    )
+    All enrollments succeed or none do; the same business rules as single
+    enrollment apply to every course. Courses in admission mode must be
+    enrolled in individually.
     
-    db.add(new_enrollment)
+    Returns the created enrollments
+    """
+    enrollments = enroll_student_in_courses(db, current_user, checkout_data.course_ids)
     db.commit()
-    db.refresh(new_enrollment)
     
-    return new_enrollment
+    return enrollments
+
+
+def _get_own_ticket(ticket_id: str, current_user: User) -> AdmissionTicket:
+    """Look up an admission ticket that belongs to the current user"""
+    ticket = admission_queue.get_ticket(ticket_id)
+    if ticket is None or ticket.user_id != current_user.id:
+        raise NotFoundException(detail="Ticket not found")
+    return ticket
+
+
+@router.get("/tickets/{ticket_id}", response_model=AdmissionTicketResponse)
+def get_admission_ticket(
+    ticket_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Get the status of an admission ticket
+    
+    - **ticket_id**: ID returned when the enrollment request was queued
+    
+    Returns the ticket with its current status
+    """
+    return _get_own_ticket(ticket_id, current_user)
+
+
+@router.get("/tickets/{ticket_id}/stream")
+def stream_admission_ticket(
+    ticket_id: str,
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Stream the status of an admission ticket as server-sent events
+    
+    - **ticket_id**: ID returned when the enrollment request was queued
+    
+    Emits the current ticket state, an update whenever its queue position
+    changes, then the final state once it is processed
+    """
+    ticket = _get_own_ticket(ticket_id, current_user)
+    
+    # Polls on the event loop, so open streams do not hold threadpool threads
+    async def events():
+        loop = asyncio.get_running_loop()
+        position = ticket.position
+        yield f"data: {AdmissionTicketResponse.model_validate(ticket).model_dump_json()}\n\n"
+        last_sent = loop.time()
+        while not ticket.is_done:
+            await asyncio.sleep(TICKET_STREAM_POLL_SECONDS)
+            if ticket.is_done:
+                break
+            if ticket.position != position:
+                position = ticket.position
+                yield f"data: {AdmissionTicketResponse.model_validate(ticket).model_dump_json()}\n\n"
+                last_sent = loop.time()
+            elif loop.time() - last_sent >= TICKET_STREAM_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = loop.time()
+        yield f"data: {AdmissionTicketResponse.model_validate(ticket).model_dump_json()}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
 @router.delete("/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -95,8 +191,91 @@ def deregister_from_course(
     if not enrollment:
         raise NotFoundException(detail="Enrollment not found")
     
-    # Delete enrollment
-    db.delete(enrollment)
+    # Delete enrollment and hand the freed seat to the waitlist
+    drop_enrollment(db, enrollment, AuditAction.DEREGISTERED, current_user)
+    db.commit()
+    
+    return None
+
+
+def _waitlist_response(db: Session, entry: WaitlistEntry) -> WaitlistEntryResponse:
+    """Build a waitlist response with the entry's current position"""
+    return WaitlistEntryResponse(
+        id=entry.id,
+        user_id=entry.user_id,
+        course_id=entry.course_id,
+        created_at=entry.created_at,
+        position=waitlist_position(db, entry)
+    )
+
+
+@router.post("/waitlist", response_model=WaitlistEntryResponse, status_code=status.HTTP_201_CREATED)
+def join_course_waitlist(
+    waitlist_data: WaitlistJoin,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Join the waitlist of a full course (student only)
+    
+    - **course_id**: ID of the course to wait for
+    
+    Students are promoted automatically, in join order, when a seat frees up.
+    
+    Returns the waitlist entry with its position
+    """
+    course = get_enrollable_course(db, waitlist_data.course_id)
+    entry = join_waitlist(db, current_user, course)
+    db.commit()
+    db.refresh(entry)
+    
+    return _waitlist_response(db, entry)
+
+
+@router.get("/waitlist/{course_id}", response_model=WaitlistEntryResponse)
+def get_waitlist_position(
+    course_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Get the current user's position on a course waitlist
+    
+    - **course_id**: ID of the course
+    
+    Returns the waitlist entry with its position
+    """
+    entry = db.query(WaitlistEntry).filter(
+        WaitlistEntry.user_id == current_user.id,
+        WaitlistEntry.course_id == course_id
+    ).first()
+    if not entry:
+        raise NotFoundException(detail="Not on the waitlist for this course")
+    
+    return _waitlist_response(db, entry)
+
+
+@router.delete("/waitlist/{course_id}", status_code=status.HTTP_204_NO_CONTENT)
+def leave_course_waitlist(
+    course_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Leave a course waitlist
+    
+    - **course_id**: ID of the course
+    
+    Returns 204 No Content on success
+    """
+    entry = db.query(WaitlistEntry).filter(
+        WaitlistEntry.user_id == current_user.id,
+        WaitlistEntry.course_id == course_id
+    ).first()
+    if not entry:
+        raise NotFoundException(detail="Not on the waitlist for this course")
+    
+    db.delete(entry)
     db.commit()
     
     return None
@@ -157,8 +336,8 @@ def remove_student_from_course(
     if not enrollment:
         raise NotFoundException(detail="Enrollment not found")
     
-    # Delete enrollment
-    db.delete(enrollment)
+    # Delete enrollment and hand the freed seat to the waitlist
+    drop_enrollment(db, enrollment, AuditAction.REMOVED, current_user)
     db.commit()
     
     return None
@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from app.database import get_db
+from app.services.health import readiness
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+# Readiness runs on threads of its own: the shared threadpool is exactly
+# what is exhausted when the application is overloaded
+readiness_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="readiness")
+
+
+def _check_readiness(session_dependency):
+    """Run the readiness checks with a session from the (possibly overridden) get_db dependency"""
+    sessions = session_dependency()
+    db = next(sessions)
+    try:
+        return readiness.run(db)
+    finally:
+        sessions.close()
+
+
+@router.get("/live")
+async def liveness():
+    """
+    Liveness probe
+    
+    Succeeds while the process can serve requests; it does not touch
+    the database, so a database outage does not get workers restarted.
+    Answered on the event loop, so a saturated threadpool does not delay it.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness_probe(request: Request):
+    """
+    Readiness probe
+    
+    Checks database connectivity and latency, connection pool saturation
+    and background subsystems. The verdict is cached for
+    HEALTH_READY_CACHE_SECONDS so frequent probes do not load the database.
+    The checks run on a small executor of their own rather than the
+    request threadpool.
+    
+    Returns 200 when ready, otherwise 503 with the same report
+    """
+    session_dependency = request.app.dependency_overrides.get(get_db, get_db)
+    ready, checks = await asyncio.get_running_loop().run_in_executor(
+        readiness_executor, _check_readiness, session_dependency
+    )
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "not_ready", "checks": checks}
+    )
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from typing import Annotated, List, Optional
+from app.database import get_db
+from app.dependencies.auth import require_admin
+from app.models.user import User
+from app.models.job import BackgroundJob, JobStatus
+from app.schemas.job import JobCreate, JobResponse
+from app.services.jobs import enqueue
+from app.utils.exceptions import NotFoundException, BadRequestException
+from app.utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=TracedRoute)
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+def schedule_job(
+    job_data: JobCreate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Schedule a maintenance job (admin only)
+    
+    - **task**: `rollups.reconcile`, `rollups.fold_daily` or `related_courses.rebuild`
+    
+    Returns 202 Accepted; the job runs on the background worker pool
+    """
+    enqueue(db, job_data.task)
+    db.commit()
+    
+    return {"task": job_data.task, "status": JobStatus.PENDING}
+
+
+@router.get("", response_model=List[JobResponse])
+def get_jobs(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)],
+    job_status: Annotated[Optional[JobStatus], Query(alias="status")] = None,
+    task: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100
+):
+    """
+    Get background jobs, newest first (admin only)
+    
+    - **status**: Optional filter, e.g. `dead` for dead-lettered jobs
+    - **task**: Optional task name filter
+    - **limit**: Maximum number of jobs (1-500)
+    
+    Returns the list of jobs
+    """
+    query = db.query(BackgroundJob)
+    if job_status is not None:
+        query = query.filter(BackgroundJob.status == job_status)
+    if task is not None:
+        query = query.filter(BackgroundJob.task == task)
+    
+    return query.order_by(BackgroundJob.id.desc()).limit(limit).all()
+
+
+@router.post("/{job_id}/retry", response_model=JobResponse)
+def retry_job(
+    job_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Requeue a dead-lettered job with a fresh set of attempts (admin only)
+    
+    - **job_id**: ID of the job
+    
+    Returns the requeued job
+    """
+    job = db.query(BackgroundJob).filter(BackgroundJob.id == job_id).first()
+    if not job:
+        raise NotFoundException(detail="Job not found")
+    if job.status != JobStatus.DEAD:
+        raise BadRequestException(detail="Only dead jobs can be retried")
+    
+    job.status = JobStatus.PENDING
+    job.attempts = 0
+    job.run_at = datetime.now(timezone.utc)
+    job.finished_at = None
+    db.commit()
+    db.refresh(job)
+    
+    return job
@@ -0,0 +1,45 @@
+import os
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from typing import Annotated, List
+from app.config import settings
+from app.dependencies.auth import require_admin
+from app.models.user import User
+from app.utils.profiling import PROFILE_NAME, list_profiles
+from app.utils.exceptions import NotFoundException
+from app.utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"], route_class=TracedRoute)
+
+
+@router.get("", response_model=List[str])
+def get_profiles(
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Get the stored request profiles, newest first (admin only)
+    
+    Profile a request by sending it with `X-Profile: 1` or `?profile=1`
+    as an admin; the stored file name is returned in the `X-Profile` header.
+    """
+    return list_profiles()
+
+
+@router.get("/{name}", response_class=PlainTextResponse)
+def get_profile(
+    name: str,
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Download a stored profile as collapsed stacks (admin only)
+    
+    - **name**: Profile file name
+    
+    Returns `frame;frame;frame count` lines, readable by flamegraph.pl and speedscope
+    """
+    path = os.path.join(settings.PROFILE_DIR, name)
+    if not PROFILE_NAME.match(name) or not os.path.isfile(path):
+        raise NotFoundException(detail="Profile not found")
+    
+    with open(path, encoding="utf-8") as profile:
+        return profile.read()
@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session, joinedload
+from typing import Annotated, List, Optional
+from app.database import get_db
+from app.dependencies.auth import require_admin
+from app.models.user import User
+from app.models.term import Term
+from app.models.enrollment_archive import ArchivedEnrollment
+from app.schemas.term import TermCreate, TermResponse, ArchivedEnrollmentPage
+from app.services.terms import close_term
+from app.utils.exceptions import NotFoundException, BadRequestException
+from app.utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/terms", tags=["Terms"], route_class=TracedRoute)
+
+
+@router.get("", response_model=List[TermResponse])
+def get_terms(
+    db: Annotated[Session, Depends(get_db)]
+):
+    """
+    Get all terms, latest first (public endpoint)
+    
+    Returns the list of terms with their closing and archival times
+    """
+    return db.query(Term).order_by(Term.starts_on.desc()).all()
+
+
+@router.post("", response_model=TermResponse, status_code=status.HTTP_201_CREATED)
+def create_term(
+    term_data: TermCreate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Create a term (admin only)
+    
+    - **code**: Unique term code, e.g. `2026-FA` (converted to uppercase)
+    - **name**: Display name
+    - **starts_on** / **ends_on**: First and last day of the term
+    
+    Returns the created term
+    """
+    if db.query(Term.id).filter(Term.code == term_data.code).first():
+        raise BadRequestException(detail=f"Term with code '{term_data.code}' already exists")
+    
+    term = Term(**term_data.model_dump())
+    db.add(term)
+    db.commit()
+    db.refresh(term)
+    
+    return term
+
+
+@router.post("/{term_id}/close", response_model=TermResponse, status_code=status.HTTP_202_ACCEPTED)
+def close_term_and_archive(
+    term_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Close a term (admin only)
+    
+    Deactivates the term's courses and schedules the `terms.archive` job,
+    which moves their enrollments out of the enrollments table. Archived
+    enrollments are served by `GET /terms/{term_id}/enrollments` and
+    `GET /users/me/history`; `archived_at` is set once the job has finished.
+    
+    Returns 202 Accepted with the closed term
+    """
+    term = db.get(Term, term_id)
+    if not term:
+        raise NotFoundException(detail="Term not found")
+    if term.is_closed:
+        raise BadRequestException(detail="Term is already closed")
+    
+    close_term(db, term)
+    db.commit()
+    db.refresh(term)
+    
+    return term
+
+
+@router.get("/{term_id}/enrollments", response_model=ArchivedEnrollmentPage)
+def get_archived_enrollments(
+    term_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)],
+    course_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    cursor: Optional[int] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 100
+):
+    """
+    Get the archived enrollments of a closed term, newest first (admin only)
+    
+    - **course_id** / **user_id**: Optional filters
+    - **cursor**: `next_cursor` from the previous page
+    - **limit**: Page size (1-500)
+    
+    Returns a page of enrollments and the cursor for the next page, if any
+    """
+    if not db.query(Term.id).filter(Term.id == term_id).first():
+        raise NotFoundException(detail="Term not found")
+    
+    query = db.query(ArchivedEnrollment).filter(ArchivedEnrollment.term_id == term_id)
+    if course_id is not None:
+        query = query.filter(ArchivedEnrollment.course_id == course_id)
+    if user_id is not None:
+        query = query.filter(ArchivedEnrollment.user_id == user_id)
+    if cursor is not None:
+        query = query.filter(ArchivedEnrollment.id < cursor)
+    
+    # Keyset pagination: fetch one extra row to know whether a next page exists
+    enrollments = query.options(joinedload(ArchivedEnrollment.course)).order_by(
+        ArchivedEnrollment.id.desc()
+    ).limit(limit + 1).all()
+    next_cursor = enrollments[limit - 1].id if len(enrollments) > limit else None
+    
+    return ArchivedEnrollmentPage(enrollments=enrollments[:limit], next_cursor=next_cursor)
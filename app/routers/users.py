@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends
-from typing import Annotated
+from sqlalchemy.orm import Session, joinedload
+from typing import Annotated, List
+from app.database import get_db
 from app.dependencies.auth import get_current_active_user
 from app.models.user import User
+from app.models.enrollment_archive import ArchivedEnrollment
 from app.schemas.user import UserProfile
+from app.schemas.term import ArchivedEnrollmentResponse
+from app.utils.tracing import TracedRoute
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=TracedRoute)
 
 
 @router.get("/me", response_model=UserProfile)
@@ -19,3 +24,21 @@ def get_user_profile(
     Returns the user's profile information
     """
     return current_user
+
+
+@router.get("/me/history", response_model=List[ArchivedEnrollmentResponse])
+def get_enrollment_history(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """
+    Get the current user's enrollments in closed terms, newest first
+    
+    Enrollments of open terms are listed in the profile (`GET /users/me`)
+    until their term is closed and archived.
+    
+    Returns the archived enrollments with their courses
+    """
+    return db.query(ArchivedEnrollment).options(joinedload(ArchivedEnrollment.course)).filter(
+        ArchivedEnrollment.user_id == current_user.id
+    ).order_by(ArchivedEnrollment.id.desc()).all()
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+from typing import Annotated, List
+from app.database import get_db
+from app.dependencies.auth import require_admin
+from app.models.user import User
+from app.models.outbox import WebhookEndpoint
+from app.schemas.webhook import WebhookEndpointCreate, WebhookEndpointResponse
+from app.utils.exceptions import NotFoundException
+from app.utils.tracing import TracedRoute
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"], route_class=TracedRoute)
+
+
+@router.post("", response_model=WebhookEndpointResponse, status_code=status.HTTP_201_CREATED)
+def register_webhook(
+    endpoint_data: WebhookEndpointCreate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Register a webhook endpoint for enrollment events (admin only)
+    
+    - **url**: URL that receives `POST {"events": [...]}` batches
+    - **max_concurrency**: Maximum in-flight requests to this endpoint (1-32)
+    
+    Returns the registered endpoint
+    """
+    endpoint = WebhookEndpoint(url=endpoint_data.url, max_concurrency=endpoint_data.max_concurrency)
+    db.add(endpoint)
+    db.commit()
+    db.refresh(endpoint)
+    
+    return endpoint
+
+
+@router.get("", response_model=List[WebhookEndpointResponse])
+def get_webhooks(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Get all registered webhook endpoints (admin only)
+    
+    Returns the list of endpoints
+    """
+    return db.query(WebhookEndpoint).order_by(WebhookEndpoint.id).all()
+
+
+@router.delete("/{endpoint_id}", status_code=status.HTTP_204_NO_CONTENT)
+def deactivate_webhook(
+    endpoint_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: Annotated[User, Depends(require_admin)]
+):
+    """
+    Stop delivering events to a webhook endpoint (admin only)
+    
+    Pending deliveries are kept but no longer sent.
+    
+    Returns 204 No Content on success
+    """
+    endpoint = db.query(WebhookEndpoint).filter(WebhookEndpoint.id == endpoint_id).first()
+    if not endpoint:
+        raise NotFoundException(detail="Webhook endpoint not found")
+    
+    endpoint.is_active = False
+    db.commit()
+    
+    return None
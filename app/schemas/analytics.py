@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from datetime import date
+
+
+class CourseFillRate(BaseModel):
+    """Schema for a course's enrollment rollup"""
+    course_id: int
+    code: str
+    title: str
+    capacity: int
+    enrolled_count: int
+    fill_rate: float
+    total_enrollments: int
+    total_drops: int
+
+
+class DailyEnrollments(BaseModel):
+    """Schema for a daily enrollment bucket"""
+    day: date
+    enrollments: int
+    drops: int
+
+
+class AnalyticsSummary(BaseModel):
+    """Schema for platform-wide enrollment totals"""
+    active_courses: int
+    total_capacity: int
+    total_enrolled: int
+    fill_rate: float
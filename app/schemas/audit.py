@@ -0,0 +1,22 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+from app.models.audit import AuditAction
+
+
+class AuditEventResponse(BaseModel):
+    """Schema for an enrollment audit event"""
+    id: int
+    action: AuditAction
+    user_id: int
+    course_id: int
+    actor_id: Optional[int] = None
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuditEventPage(BaseModel):
+    """Schema for a page of audit events"""
+    events: List[AuditEventResponse]
+    next_cursor: Optional[int] = None
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from datetime import datetime, time
+from typing import List, Optional
 
 
 class CourseBase(BaseModel):
@@ -26,6 +27,8 @@ class CourseBase(BaseModel):
 class CourseCreate(CourseBase):
     """Schema for creating a course"""
     is_active: bool = True
+    admission_queue_enabled: bool = False
+    term_id: Optional[int] = None
 
 
 class CourseUpdate(BaseModel):
@@ -34,6 +37,8 @@ class CourseUpdate(BaseModel):
     code: Optional[str] = Field(None, min_length=2, max_length=50)
     capacity: Optional[int] = Field(None, gt=0)
     is_active: Optional[bool] = None
+    admission_queue_enabled: Optional[bool] = None
+    term_id: Optional[int] = None
     
     @field_validator('code')
     @classmethod
@@ -54,7 +59,71 @@ class CourseResponse(CourseBase):
     """Schema for course response"""
     id: int
     is_active: bool
+    admission_queue_enabled: bool = False
+    term_id: Optional[int] = None
+    version: int = 1
     enrolled_count: int = 0
     available_slots: int = 0
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class PrerequisiteUpdate(BaseModel):
+    """Schema for replacing a course's direct prerequisites"""
+    prerequisite_ids: List[int]
+
+
+class CoursePrerequisitesResponse(BaseModel):
+    """Schema for a course's prerequisites"""
+    course_id: int
+    prerequisite_ids: List[int]
+    required_course_ids: List[int]
+
+
+class CompletionCreate(BaseModel):
+    """Schema for recording a course completion"""
+    user_id: int
+
+
+class CompletionResponse(BaseModel):
+    """Schema for course completion response"""
+    user_id: int
+    course_id: int
+    completed_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MeetingSlot(BaseModel):
+    """Schema for a weekly course meeting slot"""
+    day_of_week: int = Field(..., ge=0, le=6, description="0 = Monday, 6 = Sunday")
+    start_time: time
+    end_time: time
+    
+    @model_validator(mode='after')
+    def validate_times(self):
+        if self.end_time <= self.start_time:
+            raise ValueError('End time must be after start time')
+        return self
+    
+    @property
+    def start_minute(self) -> int:
+        return self.start_time.hour * 60 + self.start_time.minute
+    
+    @property
+    def end_minute(self) -> int:
+        return self.end_time.hour * 60 + self.end_time.minute
+
+
+class CourseMeetingsUpdate(BaseModel):
+    """Schema for replacing a course's meeting slots"""
+    meetings: List[MeetingSlot]
+
+
+class RelatedCourseResponse(BaseModel):
+    """Schema for a co-enrollment recommendation"""
+    id: int
+    title: str
+    code: str
+    score: float
+    shared_students: int
@@ -1,6 +1,9 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+# Upper bound on courses in a single checkout
+MAX_CHECKOUT_COURSES = 10
 
 
 class EnrollmentCreate(BaseModel):
@@ -8,6 +11,11 @@ class EnrollmentCreate(BaseModel):
     course_id: int
 
 
+class EnrollmentCheckout(BaseModel):
+    """Schema for enrolling in several courses at once"""
+    course_ids: List[int] = Field(..., min_length=1, max_length=MAX_CHECKOUT_COURSES)
+
+
 class EnrollmentUserInfo(BaseModel):
     """Schema for user info in enrollment response"""
     id: int
@@ -42,3 +50,17 @@ class EnrollmentList(BaseModel):
     """Schema for list of enrollments"""
     enrollments: list[EnrollmentResponse]
     total: int
+
+
+class AdmissionTicketResponse(BaseModel):
+    """Schema for an admission queue ticket"""
+    id: str
+    course_id: int
+    position: int
+    status: str
+    detail: Optional[str] = None
+    enrollment_id: Optional[int] = None
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Literal, Optional
+from app.models.job import JobStatus
+from app.jobs.tasks import RECONCILE_ROLLUPS, FOLD_DAILY_ROLLUPS, REBUILD_RELATED_COURSES
+
+
+class JobCreate(BaseModel):
+    """Schema for scheduling a maintenance job"""
+    task: Literal[RECONCILE_ROLLUPS, FOLD_DAILY_ROLLUPS, REBUILD_RELATED_COURSES]
+
+
+class JobResponse(BaseModel):
+    """Schema for background job response"""
+    id: int
+    task: str
+    payload: dict
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    last_error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
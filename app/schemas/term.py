@@ -0,0 +1,58 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from datetime import date, datetime
+from typing import List, Optional
+from app.schemas.enrollment import EnrollmentCourseInfo
+
+
+class TermCreate(BaseModel):
+    """Schema for creating a term"""
+    code: str = Field(..., min_length=2, max_length=20)
+    name: str = Field(..., min_length=2, max_length=100)
+    starts_on: date
+    ends_on: date
+    
+    @field_validator('code')
+    @classmethod
+    def validate_code(cls, v):
+        if not v.strip():
+            raise ValueError('Code cannot be empty or whitespace')
+        return v.strip().upper()
+    
+    @model_validator(mode='after')
+    def validate_dates(self):
+        if self.ends_on < self.starts_on:
+            raise ValueError('Term must not end before it starts')
+        return self
+
+
+class TermResponse(BaseModel):
+    """Schema for term response"""
+    id: int
+    code: str
+    name: str
+    starts_on: date
+    ends_on: date
+    closed_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArchivedEnrollmentResponse(BaseModel):
+    """Schema for an enrollment of a closed term"""
+    id: int
+    enrollment_id: int
+    user_id: int
+    course_id: int
+    term_id: int
+    created_at: datetime
+    archived_at: datetime
+    course: Optional[EnrollmentCourseInfo] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArchivedEnrollmentPage(BaseModel):
+    """Schema for a page of archived enrollments"""
+    enrollments: List[ArchivedEnrollmentResponse]
+    next_cursor: Optional[int] = None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+
+
+class WaitlistJoin(BaseModel):
+    """Schema for joining a course waitlist"""
+    course_id: int
+
+
+class WaitlistEntryResponse(BaseModel):
+    """Schema for waitlist entry response"""
+    id: int
+    user_id: int
+    course_id: int
+    created_at: datetime
+    position: int
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from datetime import datetime
+
+
+class WebhookEndpointCreate(BaseModel):
+    """Schema for registering a webhook endpoint"""
+    url: str = Field(..., max_length=500)
+    max_concurrency: int = Field(2, ge=1, le=32)
+    
+    @field_validator('url')
+    @classmethod
+    def validate_url(cls, v):
+        if not v.startswith(("http://", "https://")):
+            raise ValueError('URL must start with http:// or https://')
+        return v
+
+
+class WebhookEndpointResponse(BaseModel):
+    """Schema for webhook endpoint response"""
+    id: int
+    url: str
+    max_concurrency: int
+    is_active: bool
+    created_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,233 @@
+"""
+Process setup for the multi-worker launch mode
+
+`gunicorn app.main:app -c gunicorn.conf.py` imports the application once
+in the master process (preload_app) and forks the workers from it, so
+they share the imported code instead of each paying the import.
+Connections must not be shared across the fork. Each worker's lifespan
+calls prepare_worker(), which replaces anything connection-backed
+inherited from the master, then starts a WarmUp; readiness reports the
+worker not ready until the warm-up has finished.
+
+gunicorn.conf.py exports the worker count as SERVER_WORKERS and, before
+forking, calls check_worker_settings() to warn about settings that are
+only correct within a single process.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.services.cache import cache
+from app.services.catalog import get_catalog
+from app.services.health import readiness, OK, DEGRADED, FAIL
+from app.utils.security import warm_up_security
+
+logger = logging.getLogger(__name__)
+
+# Process that imported the application; differs in forked workers
+_IMPORT_PID = os.getpid()
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def available_cpus(cgroup_cpu_max: str = CGROUP_CPU_MAX) -> int:
+    """
+    CPUs this process may use
+
+    Takes the CPU affinity mask and, in containers, the cgroup v2 CPU
+    quota into account; os.cpu_count() reports the host's CPUs instead.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(cgroup_cpu_max, encoding="ascii") as limits:
+            quota, period = limits.read().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+
+def worker_count(cpus: Optional[int] = None, environ: Mapping[str, str] = os.environ) -> int:
+    """
+    Number of server worker processes
+
+    WEB_CONCURRENCY (set by several hosting platforms) wins, then
+    WEB_WORKERS. Otherwise the count is WEB_WORKERS_PER_CPU per available
+    CPU, capped so that every worker's full connection pool
+    (DB_POOL_SIZE + DB_MAX_OVERFLOW) fits in DB_CONNECTION_BUDGET.
+    """
+    if environ.get("WEB_CONCURRENCY"):
+        return max(1, int(environ["WEB_CONCURRENCY"]))
+    if settings.WEB_WORKERS > 0:
+        return settings.WEB_WORKERS
+    cpus = cpus or available_cpus()
+    per_worker_connections = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    connection_cap = max(1, settings.DB_CONNECTION_BUDGET // per_worker_connections)
+    return max(1, min(cpus * settings.WEB_WORKERS_PER_CPU, connection_cap))
+
+
+def serving_workers(environ: Mapping[str, str] = os.environ) -> int:
+    """Worker processes serving the application; 1 unless launched through gunicorn.conf.py"""
+    return max(1, int(environ.get("SERVER_WORKERS") or 1))
+
+
+def admission_available(environ: Mapping[str, str] = os.environ) -> bool:
+    """
+    Whether admission queues can run
+
+    Their tickets and single writer per course live in the process that
+    accepted the request, so they need the application to run as one worker.
+    """
+    return serving_workers(environ) == 1
+
+
+def check_worker_settings(workers: int) -> None:
+    """
+    Warn about settings that only work within a single process
+
+    Several workers never block startup. Admission mode is then unavailable:
+    courses already in admission mode enroll directly, and the API refuses
+    to turn it on. The memory cache backend keeps cached principals and
+    the catalog per worker.
+    """
+    if workers <= 1:
+        return
+    logger.warning(
+        "Starting %d workers: the admission queue needs a single worker, so courses in admission "
+        "mode enroll directly; set WEB_WORKERS=1 to use it", workers
+    )
+    if settings.CACHE_BACKEND == "memory":
+        logger.warning(
+            "Starting %d workers with CACHE_BACKEND=memory: cached principals and the course catalog "
+            "are private to each worker; set CACHE_BACKEND=redis to share them", workers
+        )
+
+
+def prepare_worker() -> bool:
+    """
+    Give a forked worker its own database pool and cache connections
+
+    Pooled connections inherited from the master are dropped without being
+    closed, since the master still owns them. Returns whether this process
+    was forked after import.
+    """
+    if os.getpid() == _IMPORT_PID:
+        return False
+    engine.dispose(close=False)
+    cache.after_fork()
+    logger.info("Worker %d: replaced inherited database pool and cache connections", os.getpid())
+    return True
+
+
+def open_pool_connections(bind: Engine, count: int) -> int:
+    """Open up to count pooled connections at once and return them to the pool; returns how many"""
+    # Pools without a size (e.g. StaticPool) hold a single connection
+    pool_size = bind.pool.size() if callable(getattr(bind.pool, "size", None)) else 1
+    connections = []
+    try:
+        for _ in range(min(count, pool_size)):
+            connection = bind.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+class WarmUp:
+    """
+    Pay first-request costs before the worker reports ready
+
+    Steps run in order on a background thread, so liveness is answered
+    meanwhile:
+
+    - connections: open WARM_UP_CONNECTIONS pooled connections
+    - catalog: prime the course catalog cache
+    - serializers: build the OpenAPI schema, which builds every route's
+      model schemas (and serves /docs without delay)
+    - security: load the bcrypt backend and round-trip a JWT
+
+    A failing step is logged and reported as degraded but does not keep
+    the worker out of rotation; the other checks cover a broken database.
+    """
+
+    def __init__(self, app: FastAPI, session_factory: Callable[[], Session] = SessionLocal,
+                 bind: Engine = engine, connections: Optional[int] = None):
+        self.app = app
+        self.session_factory = session_factory
+        self.bind = bind
+        self.connections = settings.WARM_UP_CONNECTIONS if connections is None else connections
+        self.steps: Dict[str, dict] = {}
+        self.done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _open_connections(self) -> dict:
+        return {"opened": open_pool_connections(self.bind, self.connections)}
+
+    def _prime_catalog(self) -> dict:
+        db = self.session_factory()
+        try:
+            return {"courses": len(get_catalog(db))}
+        finally:
+            db.close()
+
+    def _build_serializers(self) -> dict:
+        return {"paths": len(self.app.openapi()["paths"])}
+
+    def _load_security(self) -> dict:
+        warm_up_security()
+        return {}
+
+    def run(self) -> None:
+        """Run every step, then mark the worker warm"""
+        steps = (
+            ("connections", self._open_connections),
+            ("catalog", self._prime_catalog),
+            ("serializers", self._build_serializers),
+            ("security", self._load_security),
+        )
+        try:
+            for name, step in steps:
+                started = time.perf_counter()
+                try:
+                    result = {"status": OK, **step()}
+                except Exception as exc:
+                    logger.exception("Warm-up step %s failed", name)
+                    result = {"status": DEGRADED, "error": f"{type(exc).__name__}: {exc}".splitlines()[0][:200]}
+                result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+                self.steps[name] = result
+        finally:
+            self.done.set()
+            readiness.invalidate()
+
+    def start(self) -> None:
+        """Run the warm-up on a background thread"""
+        self._thread = threading.Thread(target=self.run, name="warm-up", daemon=True)
+        self._thread.start()
+
+    def skip(self) -> None:
+        """Mark the worker warm without warming anything"""
+        self.done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+    def health_check(self, db: Session) -> dict:
+        """Readiness check: failing until the warm-up has finished"""
+        if not self.done.is_set():
+            return {"status": FAIL, "warming": True, "steps": dict(self.steps)}
+        degraded = any(step["status"] != OK for step in self.steps.values())
+        return {"status": DEGRADED if degraded else OK, "steps": dict(self.steps)}
@@ -0,0 +1,246 @@
+import enum
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.user import User
+from app.server import admission_available
+from app.services.enrollment import get_enrollable_course, enroll_student
+from app.utils.exceptions import BadRequestException
+
+
+class TicketStatus(str, enum.Enum):
+    """Admission ticket status enumeration"""
+    QUEUED = "queued"
+    ENROLLED = "enrolled"
+    REJECTED = "rejected"
+
+
+class AdmissionQueueFull(Exception):
+    """Raised when a course's admission queue cannot accept more tickets"""
+
+
+def check_admission_mode(enabled: Optional[bool]) -> None:
+    """
+    Ensure admission mode can be turned on for a course
+
+    Queues, tickets and writer threads live in the process that accepted the
+    request, so admission mode needs the application to run as one worker.
+
+    Raises:
+        BadRequestException: If enabling it while several workers serve the application
+    """
+    if enabled and not admission_available():
+        raise BadRequestException(detail="The admission queue needs a single server worker (WEB_WORKERS=1)")
+
+
+class CourseLine:
+    """Tickets issued and served for one course, for live queue positions"""
+
+    def __init__(self):
+        self.issued = 0
+        self.served = 0
+
+
+class AdmissionTicket:
+    """A student's place in a course admission queue"""
+
+    def __init__(self, user_id: int, course_id: int, line: "CourseLine"):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.course_id = course_id
+        line.issued += 1
+        self._line = line
+        self._number = line.issued
+        self.status = TicketStatus.QUEUED
+        self.detail: Optional[str] = None
+        self.enrollment_id: Optional[int] = None
+        self.created_at = datetime.now(timezone.utc)
+        self.processed_at: Optional[datetime] = None
+        self._done = threading.Event()
+
+    @property
+    def is_done(self) -> bool:
+        """Check if the ticket has been processed"""
+        return self._done.is_set()
+
+    @property
+    def position(self) -> int:
+        """Place in the course's queue, 1 while being processed; 0 once processed"""
+        if self.is_done:
+            return 0
+        return max(1, self._number - self._line.served)
+
+    def resolve(self, status: TicketStatus, detail: Optional[str] = None,
+                enrollment_id: Optional[int] = None) -> None:
+        """Record the outcome of processing the ticket and wake up waiters"""
+        self.status = status
+        self.detail = detail
+        self.enrollment_id = enrollment_id
+        self.processed_at = datetime.now(timezone.utc)
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the ticket is processed or the timeout expires"""
+        return self._done.wait(timeout)
+
+
+class AdmissionQueue:
+    """
+    Bounded FIFO admission queues with a single writer thread per course
+
+    Enrollment requests for courses in admission mode are queued instead of
+    contending on the course row. Each course gets one worker thread that
+    applies the enrollment rules to tickets in arrival order, so requests are
+    served first come, first served and only one transaction at a time
+    touches the course. Workers exit after being idle for a while.
+
+    The queues are held in memory, so they only give one writer per course
+    while a single server process runs the application; see
+    check_admission_mode and app.server.check_worker_settings.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_size: int = settings.ADMISSION_QUEUE_MAX_SIZE,
+        idle_timeout: float = settings.ADMISSION_WORKER_IDLE_SECONDS,
+        max_tickets: int = settings.ADMISSION_TICKET_RETENTION,
+    ):
+        self.session_factory = session_factory
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_tickets = max_tickets
+        self._lock = threading.Lock()
+        self._queues: Dict[int, queue.Queue] = {}
+        self._lines: Dict[int, CourseLine] = {}
+        self._workers: Dict[int, threading.Thread] = {}
+        self._tickets: "OrderedDict[str, AdmissionTicket]" = OrderedDict()
+
+    def submit(self, user_id: int, course_id: int) -> AdmissionTicket:
+        """
+        Queue an enrollment request for a course
+
+        Args:
+            user_id: ID of the student requesting a seat
+            course_id: ID of the course
+
+        Returns:
+            The ticket the client can poll or stream
+
+        Raises:
+            AdmissionQueueFull: If the course's queue is at capacity
+        """
+        with self._lock:
+            course_queue = self._queues.get(course_id)
+            if course_queue is None:
+                course_queue = queue.Queue(maxsize=self.max_size)
+                self._queues[course_id] = course_queue
+                self._lines[course_id] = CourseLine()
+            if course_queue.full():
+                raise AdmissionQueueFull(f"Admission queue for course {course_id} is full")
+
+            # Only the worker takes from the queue, so it cannot fill up meanwhile
+            ticket = AdmissionTicket(user_id, course_id, self._lines[course_id])
+            course_queue.put_nowait(ticket)
+
+            self._remember(ticket)
+            self._ensure_worker(course_id)
+
+        return ticket
+
+    def get_ticket(self, ticket_id: str) -> Optional[AdmissionTicket]:
+        """Look up a ticket by ID"""
+        with self._lock:
+            return self._tickets.get(ticket_id)
+
+    def pending(self, course_id: int) -> int:
+        """Number of tickets waiting for a course"""
+        with self._lock:
+            course_queue = self._queues.get(course_id)
+            return course_queue.qsize() if course_queue else 0
+
+    def _remember(self, ticket: AdmissionTicket) -> None:
+        # Drop the oldest processed tickets once the retention limit is hit
+        self._tickets[ticket.id] = ticket
+        while len(self._tickets) > self.max_tickets:
+            oldest_id, oldest = next(iter(self._tickets.items()))
+            if not oldest.is_done:
+                break
+            del self._tickets[oldest_id]
+
+    def _ensure_worker(self, course_id: int) -> None:
+        worker = self._workers.get(course_id)
+        if worker is not None and worker.is_alive():
+            return
+
+        worker = threading.Thread(
+            target=self._run_worker,
+            args=(course_id,),
+            name=f"admission-course-{course_id}",
+            daemon=True,
+        )
+        self._workers[course_id] = worker
+        worker.start()
+
+    def _run_worker(self, course_id: int) -> None:
+        course_queue = self._queues[course_id]
+        line = self._lines[course_id]
+        while True:
+            try:
+                ticket = course_queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    # Re-check under the lock so a concurrent submit never
+                    # queues a ticket without a live worker
+                    if course_queue.empty():
+                        del self._workers[course_id]
+                        del self._queues[course_id]
+                        del self._lines[course_id]
+                        return
+                continue
+
+            try:
+                self._process(ticket)
+            finally:
+                line.served += 1
+                course_queue.task_done()
+
+    def _process(self, ticket: AdmissionTicket) -> None:
+        try:
+            db = self.session_factory()
+        except Exception as exc:
+            ticket.resolve(TicketStatus.REJECTED, detail=f"Enrollment failed: {type(exc).__name__}")
+            return
+
+        try:
+            user = db.query(User).filter(User.id == ticket.user_id).first()
+            course = get_enrollable_course(db, ticket.course_id)
+            enrollment = enroll_student(db, user, course)
+            db.commit()
+            ticket.resolve(TicketStatus.ENROLLED, enrollment_id=enrollment.id)
+        except HTTPException as exc:
+            db.rollback()
+            ticket.resolve(TicketStatus.REJECTED, detail=exc.detail)
+        except Exception as exc:
+            db.rollback()
+            ticket.resolve(TicketStatus.REJECTED, detail=f"Enrollment failed: {type(exc).__name__}")
+        finally:
+            db.close()
+
+    def join(self, course_id: int) -> None:
+        """Block until every queued ticket for a course has been processed"""
+        with self._lock:
+            course_queue = self._queues.get(course_id)
+        if course_queue is not None:
+            course_queue.join()
+
+
+# Process-wide admission queue used by the enrollment router
+admission_queue = AdmissionQueue()
@@ -0,0 +1,571 @@
+"""
+Shared cache with in-memory and Redis-protocol backends
+
+The API runs as several uvicorn workers, so anything cached privately by
+one process can disagree with the others. CACHE_BACKEND selects:
+
+- "memory": an LRU/TTL cache private to the process; right for a single
+  worker and for tests.
+- "redis": any server speaking the Redis protocol at CACHE_URL, shared by
+  all workers. Reads go through a small per-worker near cache; every
+  write publishes the key on an invalidation channel so the other workers
+  drop their near copy. A near copy is never older than
+  CACHE_NEAR_TTL_SECONDS, even if an invalidation is lost.
+
+Values must be JSON-serializable and treated as immutable by callers.
+Cache failures never fail a request: reads miss, writes are dropped and
+the error is counted in the backend's stats.
+"""
+import json
+import logging
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from app.config import settings
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.user import User
+from app.services.health import OK, DEGRADED
+
+logger = logging.getLogger(__name__)
+
+# Session.info key of cache keys to drop once the transaction commits
+PENDING_CACHE_INVALIDATIONS = "pending_cache_invalidations"
+
+# Invalidation message asking workers to drop their whole near cache
+INVALIDATE_ALL = "*"
+
+
+class CacheStats:
+    """Thread-safe counters reported by every backend"""
+
+    FIELDS = ("hits", "misses", "evictions", "expirations", "invalidations", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] += amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = round(counts["hits"] / lookups, 4) if lookups else None
+        return counts
+
+
+class CacheBackend:
+    """Interface of the cache backends"""
+
+    name = "base"
+
+    def __init__(self):
+        self._stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value, or None on a miss"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds"""
+        raise NotImplementedError
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store a value only if the key is absent; returns whether it was stored"""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        """Drop keys, in every worker"""
+        raise NotImplementedError
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Increment a counter that expires ttl seconds after its first increment"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop every key"""
+        raise NotImplementedError
+
+    def ping(self) -> None:
+        """Raise if the backend is unreachable"""
+
+    def start(self) -> None:
+        """Start background work, e.g. listening for invalidations"""
+
+    def close(self) -> None:
+        """Stop background work and release connections"""
+
+    def after_fork(self) -> None:
+        """Drop connections inherited from the parent process"""
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit, miss, eviction and error counts"""
+        return {"backend": self.name, **self._stats.snapshot()}
+
+
+class MemoryCache(CacheBackend):
+    """
+    LRU cache with per-key expiry, private to the process
+
+    The least recently used entry is evicted once max_entries is reached;
+    expired entries are dropped when they are next touched.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: Optional[int] = None):
+        super().__init__()
+        self.max_entries = max_entries or settings.CACHE_MAX_ENTRIES
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _live(self, key: str, now: float) -> Optional[Tuple[float, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= now:
+            del self._entries[key]
+            self._stats.incr("expirations")
+            return None
+        return entry
+
+    def _store(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.incr("evictions")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._live(key, time.monotonic())
+            if entry is None:
+                self._stats.incr("misses")
+                return None
+            self._entries.move_to_end(key)
+        self._stats.incr("hits")
+        return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._store(key, value, time.monotonic() + ttl)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._live(key, now) is not None:
+                return False
+            self._store(key, value, now + ttl)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            dropped = sum(1 for key in keys if self._entries.pop(key, None) is not None)
+        if dropped:
+            self._stats.incr("invalidations", dropped)
+
+    def incr(self, key: str, ttl: float) -> int:
+        with self._lock:
+            now = time.monotonic()
+            entry = self._live(key, now)
+            count = entry[1] + 1 if entry is not None else 1
+            self._store(key, count, entry[0] if entry is not None else now + ttl)
+            return count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "entries": len(self._entries), "max_entries": self.max_entries}
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+def encode_command(*args) -> bytes:
+    """Encode a command as a RESP array of bulk strings"""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+def read_reply(reader) -> Any:
+    """Read one RESP reply; error replies are returned as RespError instances"""
+    line = reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by cache server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RespError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        return None if length < 0 else reader.read(length + 2)[:-2]
+    if kind == b"*":
+        length = int(rest)
+        return None if length < 0 else [read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Malformed reply from cache server: {line!r}")
+
+
+class RespConnection:
+    """Blocking connection to a Redis-protocol server"""
+
+    def __init__(self, host: str, port: int, db: int = 0, password: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        try:
+            if password:
+                self.execute(("AUTH", password))
+            if db:
+                self.execute(("SELECT", db))
+        except Exception:
+            self.close()
+            raise
+
+    def execute(self, *commands: tuple) -> List[Any]:
+        """Send commands in one round trip and return their replies in order"""
+        self.sock.sendall(b"".join(encode_command(*command) for command in commands))
+        replies = [read_reply(self.reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def close(self) -> None:
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.reader.close()
+        self.sock.close()
+
+
+# Failures that turn a cache operation into a miss or a dropped write
+CACHE_ERRORS = (OSError, RespError)
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache on a Redis-protocol server shared by all workers
+
+    Keys are namespaced with CACHE_KEY_PREFIX. Connections are pooled per
+    worker. With a near cache, a subscriber thread listens on
+    `<prefix>invalidate` and drops keys that other workers changed; after
+    a reconnect the near cache is emptied, since messages may have been
+    missed in between.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: Optional[str] = None, prefix: Optional[str] = None,
+                 near_entries: Optional[int] = None, near_ttl: Optional[float] = None,
+                 timeout: Optional[float] = None):
+        super().__init__()
+        parts = urlsplit(url or settings.CACHE_URL)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.strip("/") or 0)
+        self.password = parts.password
+        self.timeout = timeout or settings.CACHE_TIMEOUT_SECONDS
+        self.prefix = settings.CACHE_KEY_PREFIX if prefix is None else prefix
+        self.channel = f"{self.prefix}invalidate"
+        near_entries = settings.CACHE_NEAR_MAX_ENTRIES if near_entries is None else near_entries
+        self.near = MemoryCache(near_entries) if near_entries > 0 else None
+        self.near_ttl = near_ttl or settings.CACHE_NEAR_TTL_SECONDS
+        # Lets the subscriber skip invalidations this worker published itself
+        self.instance_id = uuid.uuid4().hex
+        self._idle: List[RespConnection] = []
+        self._idle_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._subscriber: Optional[threading.Thread] = None
+        self._subscriber_conn: Optional[RespConnection] = None
+        self.subscribed = threading.Event()
+
+    def _connect(self, timeout: Optional[float]) -> RespConnection:
+        return RespConnection(self.host, self.port, self.db, self.password, timeout)
+
+    def _release(self, conn: RespConnection) -> None:
+        with self._idle_lock:
+            self._idle.append(conn)
+
+    def _execute(self, *commands: tuple) -> List[Any]:
+        """Run commands on a pooled connection in one round trip"""
+        while True:
+            with self._idle_lock:
+                conn = self._idle.pop() if self._idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect(self.timeout)
+            try:
+                replies = conn.execute(*commands)
+            except RespError:
+                self._release(conn)
+                raise
+            except BaseException as exc:
+                # The connection may hold unread replies; never reuse it
+                conn.close()
+                # An idle connection dropped by the server (e.g. a restart) is retried on a new one
+                if reused and isinstance(exc, ConnectionError):
+                    continue
+                raise
+            self._release(conn)
+            return replies
+
+    def _failed(self, operation: str, exc: Exception) -> None:
+        self._stats.incr("errors")
+        logger.warning("Cache %s failed: %s: %s", operation, type(exc).__name__, exc)
+
+    def _invalidation(self, key: str) -> tuple:
+        return ("PUBLISH", self.channel, f"{self.instance_id} {key}")
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.near is not None:
+            value = self.near.get(key)
+            if value is not None:
+                self._stats.incr("hits")
+                return value
+        try:
+            raw = self._execute(("GET", self.prefix + key))[0]
+        except CACHE_ERRORS as exc:
+            self._failed("get", exc)
+            raw = None
+        if raw is None:
+            self._stats.incr("misses")
+            return None
+        self._stats.incr("hits")
+        value = json.loads(raw)
+        if self.near is not None:
+            self.near.set(key, value, self.near_ttl)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        commands = [("SET", self.prefix + key, json.dumps(value), "PX", int(ttl * 1000))]
+        if self.near is not None:
+            self.near.delete(key)
+            commands.append(self._invalidation(key))
+        try:
+            self._execute(*commands)
+        except CACHE_ERRORS as exc:
+            self._failed("set", exc)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        try:
+            added = self._execute(("SET", self.prefix + key, json.dumps(value), "PX", int(ttl * 1000), "NX"))[0]
+        except CACHE_ERRORS as exc:
+            self._failed("add", exc)
+            return False
+        if added is not None and self.near is not None:
+            self.near.delete(key)
+            try:
+                self._execute(self._invalidation(key))
+            except CACHE_ERRORS as exc:
+                self._failed("publish", exc)
+        return added is not None
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        commands = [("DEL", *(self.prefix + key for key in keys))]
+        if self.near is not None:
+            self.near.delete(*keys)
+            commands.extend(self._invalidation(key) for key in keys)
+        try:
+            self._execute(*commands)
+        except CACHE_ERRORS as exc:
+            self._failed("delete", exc)
+            return
+        self._stats.incr("invalidations", len(keys))
+
+    def incr(self, key: str, ttl: float) -> int:
+        # SET NX starts the window; INCR keeps the expiry of an existing key
+        try:
+            return self._execute(
+                ("SET", self.prefix + key, 0, "PX", int(ttl * 1000), "NX"), ("INCR", self.prefix + key)
+            )[1]
+        except CACHE_ERRORS as exc:
+            self._failed("incr", exc)
+            return 0
+
+    def clear(self) -> None:
+        if self.near is not None:
+            self.near.clear()
+        try:
+            keys = self._execute(("KEYS", self.prefix + "*"))[0]
+            commands = [("DEL", *keys)] if keys else []
+            if self.near is not None:
+                commands.append(self._invalidation(INVALIDATE_ALL))
+            if commands:
+                self._execute(*commands)
+        except CACHE_ERRORS as exc:
+            self._failed("clear", exc)
+
+    def ping(self) -> None:
+        self._execute(("PING",))
+
+    def start(self) -> None:
+        if self.near is None or self._subscriber is not None:
+            return
+        self._stop.clear()
+        self._subscriber = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._subscriber.start()
+
+    def _listen(self) -> None:
+        backoff = 0.1
+        while not self._stop.is_set():
+            try:
+                conn = self._connect(self.timeout)
+                self._subscriber_conn = conn
+                conn.execute(("SUBSCRIBE", self.channel))
+                conn.sock.settimeout(None)
+                # Invalidations published while disconnected were lost
+                self.near.clear()
+                self.subscribed.set()
+                backoff = 0.1
+                while True:
+                    message = read_reply(conn.reader)
+                    if isinstance(message, list) and len(message) == 3 and message[0] == b"message":
+                        self._invalidated(message[2].decode())
+            except CACHE_ERRORS as exc:
+                self.subscribed.clear()
+                if self._stop.is_set():
+                    break
+                self._failed("subscribe", exc)
+                self.near.clear()
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 5.0)
+            finally:
+                if self._subscriber_conn is not None:
+                    self._subscriber_conn.close()
+                    self._subscriber_conn = None
+
+    def _invalidated(self, message: str) -> None:
+        origin, _, key = message.partition(" ")
+        if origin == self.instance_id:
+            return
+        if key == INVALIDATE_ALL:
+            self.near.clear()
+        else:
+            self.near.delete(key)
+
+    def after_fork(self) -> None:
+        # The parent still uses these sockets, so they are dropped, not closed
+        with self._idle_lock:
+            self._idle = []
+        self._subscriber = None
+        self._subscriber_conn = None
+        self.subscribed.clear()
+        # Workers forked from one parent must not skip each other's invalidations
+        self.instance_id = uuid.uuid4().hex
+
+    def close(self) -> None:
+        self._stop.set()
+        conn = self._subscriber_conn
+        if conn is not None:
+            conn.close()
+        if self._subscriber is not None:
+            self._subscriber.join()
+            self._subscriber = None
+        with self._idle_lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        if self.near is not None:
+            near = self.near.stats()
+            stats["evictions"] = near["evictions"]
+            stats["near_cache"] = {
+                "entries": near["entries"], "max_entries": near["max_entries"],
+                "evictions": near["evictions"], "expirations": near["expirations"],
+                "subscribed": self.subscribed.is_set(),
+            }
+        return stats
+
+
+def create_cache() -> CacheBackend:
+    """Build the backend selected by CACHE_BACKEND"""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache()
+    if settings.CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND {settings.CACHE_BACKEND!r}")
+    return MemoryCache()
+
+
+cache = create_cache()
+
+
+def check_cache(db: Session) -> dict:
+    """Readiness check: an unreachable cache degrades the instance, requests fall back to the database"""
+    try:
+        cache.ping()
+    except CACHE_ERRORS as exc:
+        return {"status": DEGRADED, "error": f"{type(exc).__name__}: {exc}", **cache.stats()}
+    stats = cache.stats()
+    near = stats.get("near_cache")
+    status = DEGRADED if near is not None and not near["subscribed"] else OK
+    return {"status": status, **stats}
+
+
+def invalidate_on_commit(db: Session, *keys: str) -> None:
+    """Drop cache keys once the session's transaction commits"""
+    db.info.setdefault(PENDING_CACHE_INVALIDATIONS, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def flush_cache_invalidations(session: Session) -> None:
+    keys = session.info.pop(PENDING_CACHE_INVALIDATIONS, None)
+    if keys:
+        cache.delete(*keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_cache_invalidations(session: Session) -> None:
+    session.info.pop(PENDING_CACHE_INVALIDATIONS, None)
+
+
+# Cached views and the writes that invalidate them
+
+# Generation of the active courses served by GET /courses (see
+# app.services.catalog); seat counts change with enrollments
+CATALOG_KEY = "catalog:active_courses"
+
+
+def principal_key(email: str) -> str:
+    """Key of the authenticated-user snapshot for an email"""
+    return f"principal:{email}"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    emails = {target.email, *inspect(target).attrs.email.history.deleted}
+    invalidate_on_commit(object_session(target), *(principal_key(email) for email in emails))
+
+
+@event.listens_for(Course, "after_insert")
+@event.listens_for(Course, "after_update")
+@event.listens_for(Course, "after_delete")
+@event.listens_for(Enrollment, "after_insert")
+@event.listens_for(Enrollment, "after_delete")
+def _invalidate_catalog(mapper, connection, target) -> None:
+    invalidate_on_commit(object_session(target), CATALOG_KEY)
@@ -0,0 +1,224 @@
+"""
+Local stand-in for a Redis server
+
+Speaks enough of the Redis protocol for RedisCache: strings with expiry,
+counters, key listing and pub/sub. Data lives in memory and is lost on
+exit. Tests start it on a free port; to try several workers locally
+against a shared cache without installing Redis, run:
+
+    python -m app.services.cache_server --port 6379
+"""
+import argparse
+import fnmatch
+import socketserver
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+from app.services.cache import read_reply
+
+OK = b"+OK\r\n"
+NIL = b"$-1\r\n"
+
+
+def _bulk(value: Optional[bytes]) -> bytes:
+    return NIL if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+def _integer(value: int) -> bytes:
+    return b":%d\r\n" % value
+
+
+def _array(items: List[bytes]) -> bytes:
+    return b"*%d\r\n" % len(items) + b"".join(items)
+
+
+def _error(message: str) -> bytes:
+    return f"-ERR {message}\r\n".encode()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """One client connection; subscribed connections also receive published messages"""
+
+    def setup(self) -> None:
+        super().setup()
+        self.write_lock = threading.Lock()
+        self.server.clients.add(self)
+
+    def finish(self) -> None:
+        self.server.clients.discard(self)
+        self.server.store.unsubscribe_all(self)
+        super().finish()
+
+    def send(self, data: bytes) -> None:
+        with self.write_lock:
+            self.wfile.write(data)
+            self.wfile.flush()
+
+    def handle(self) -> None:
+        while True:
+            try:
+                command = read_reply(self.rfile)
+            except (ConnectionError, OSError, ValueError):
+                return
+            if not isinstance(command, list) or not command:
+                self.send(_error("Protocol error: expected an array of bulk strings"))
+                return
+            self.send(self.server.store.execute(self, command))
+
+
+class _Store:
+    """Keys with optional expiry and pub/sub channels, shared by all connections"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.channels: Dict[bytes, Set[_Handler]] = defaultdict(set)
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry[0]
+
+    def unsubscribe_all(self, client: _Handler) -> None:
+        with self.lock:
+            for subscribers in self.channels.values():
+                subscribers.discard(client)
+
+    def execute(self, client: _Handler, command: List[bytes]) -> bytes:
+        name = command[0].decode().upper()
+        args = command[1:]
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return _error(f"unknown command '{name}'")
+        try:
+            with self.lock:
+                return handler(client, *args)
+        except (TypeError, ValueError, IndexError):
+            return _error(f"wrong arguments for '{name}' command")
+
+    def cmd_ping(self, client, *args) -> bytes:
+        return b"+PONG\r\n"
+
+    def cmd_auth(self, client, *args) -> bytes:
+        return OK
+
+    def cmd_select(self, client, db) -> bytes:
+        return OK
+
+    def cmd_get(self, client, key) -> bytes:
+        return _bulk(self._get(key))
+
+    def cmd_set(self, client, key, value, *options) -> bytes:
+        expires_at = None
+        only_new = False
+        options = [option.upper() for option in options]
+        for index, option in enumerate(options):
+            if option == b"PX":
+                expires_at = time.monotonic() + int(options[index + 1]) / 1000
+            elif option == b"EX":
+                expires_at = time.monotonic() + int(options[index + 1])
+            elif option == b"NX":
+                only_new = True
+        if only_new and self._get(key) is not None:
+            return NIL
+        self.data[key] = (value, expires_at)
+        return OK
+
+    def cmd_del(self, client, *keys) -> bytes:
+        return _integer(sum(1 for key in keys if self._get(key) is not None and self.data.pop(key)))
+
+    def cmd_incr(self, client, key) -> bytes:
+        current = self._get(key)
+        expires_at = self.data[key][1] if current is not None else None
+        value = int(current or 0) + 1
+        self.data[key] = (str(value).encode(), expires_at)
+        return _integer(value)
+
+    def cmd_pexpire(self, client, key, milliseconds) -> bytes:
+        current = self._get(key)
+        if current is None:
+            return _integer(0)
+        self.data[key] = (current, time.monotonic() + int(milliseconds) / 1000)
+        return _integer(1)
+
+    def cmd_keys(self, client, pattern) -> bytes:
+        matching = [key for key in list(self.data) if fnmatch.fnmatchcase(key.decode(), pattern.decode())]
+        return _array([_bulk(key) for key in matching if self._get(key) is not None])
+
+    def cmd_flushdb(self, client) -> bytes:
+        self.data.clear()
+        return OK
+
+    def cmd_publish(self, client, channel, message) -> bytes:
+        subscribers = list(self.channels.get(channel, ()))
+        payload = _array([_bulk(b"message"), _bulk(channel), _bulk(message)])
+        for subscriber in subscribers:
+            try:
+                subscriber.send(payload)
+            except OSError:
+                self.channels[channel].discard(subscriber)
+        return _integer(len(subscribers))
+
+    def cmd_subscribe(self, client, *channels) -> bytes:
+        replies = []
+        for channel in channels:
+            self.channels[channel].add(client)
+            count = sum(1 for subscribers in self.channels.values() if client in subscribers)
+            replies.append(_array([_bulk(b"subscribe"), _bulk(channel), _integer(count)]))
+        return b"".join(replies)
+
+
+class LocalCacheServer:
+    """Threaded Redis-protocol server on localhost; port 0 picks a free port"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = socketserver.ThreadingTCPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.store = _Store()
+        self._server.clients = set()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> "LocalCacheServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), name="cache-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def disconnect_clients(self) -> None:
+        """Drop every client connection, as a server restart would"""
+        for client in list(self._server.clients):
+            try:
+                client.connection.shutdown(2)
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self.disconnect_clients()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local stand-in Redis server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    options = parser.parse_args()
+    server = LocalCacheServer(options.host, options.port).start()
+    print(f"Serving {server.url}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,45 @@
+import uuid
+from typing import List, Optional
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.course import Course
+from app.schemas.course import CourseResponse
+from app.services.cache import cache, CATALOG_KEY
+
+
+def _catalog_generation() -> Optional[str]:
+    """Current catalog generation, starting a new one after an invalidation"""
+    generation = cache.get(CATALOG_KEY)
+    if generation is None:
+        cache.add(CATALOG_KEY, uuid.uuid4().hex, settings.CATALOG_CACHE_TTL_SECONDS)
+        generation = cache.get(CATALOG_KEY)
+    return generation
+
+
+def catalog_key(generation: str) -> str:
+    """Key of the cached catalog of one generation"""
+    return f"{CATALOG_KEY}:{generation}"
+
+
+def get_catalog(db: Session) -> List[dict]:
+    """
+    Active courses serialized as CourseResponse, from the shared cache when possible
+
+    The list is cached under the current generation. A course or
+    enrollment change drops the generation (see app.services.cache), so a
+    reader that loaded the courses before the change stores its stale list
+    under a generation nobody reads any more. Entries expire after
+    CATALOG_CACHE_TTL_SECONDS.
+    """
+    generation = _catalog_generation()
+    if generation is not None:
+        catalog = cache.get(catalog_key(generation))
+        if catalog is not None:
+            return catalog
+
+    courses = db.query(Course).filter(Course.is_active == True).all()
+    catalog = jsonable_encoder([CourseResponse.model_validate(course) for course in courses])
+    if generation is not None:
+        cache.set(catalog_key(generation), catalog, settings.CATALOG_CACHE_TTL_SECONDS)
+    return catalog
@@ -0,0 +1,191 @@
+from typing import List
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.waitlist import WaitlistEntry
+from app.models.audit import AuditAction
+from app.server import admission_available
+from app.services.prerequisites import check_prerequisites
+from app.services.schedule import check_schedule
+from app.services.events import record_enrollment_change
+from app.services.waitlist import promote_from_waitlist
+from app.utils.exceptions import NotFoundException, BadRequestException, ForbiddenException
+
+
+def get_enrollable_course(db: Session, course_id: int) -> Course:
+    """
+    Load a course and check that it accepts enrollments
+
+    Args:
+        db: Database session
+        course_id: ID of the course
+
+    Returns:
+        The course
+
+    Raises:
+        NotFoundException: If the course does not exist
+        BadRequestException: If the course is inactive
+    """
+    course = db.query(Course).filter(Course.id == course_id).first()
+    if not course:
+        raise NotFoundException(detail="Course not found")
+
+    if not course.is_active:
+        raise BadRequestException(detail="Cannot enroll in inactive course")
+
+    return course
+
+
+def enroll_student(db: Session, user: User, course: Course) -> Enrollment:
+    """
+    Apply the enrollment business rules and add the enrollment to the session
+
+    The caller owns the transaction: nothing is committed here.
+
+    Args:
+        db: Database session
+        user: Student to enroll
+        course: Course to enroll in (see get_enrollable_course)
+
+    Returns:
+        The new, flushed enrollment
+
+    Raises:
+        ForbiddenException: If the user is not a student
+        BadRequestException: If already enrolled, prerequisites are
+            missing, meetings clash or the course is full
+    """
+    # Only students can enroll
+    if user.role != UserRole.STUDENT:
+        raise ForbiddenException(detail="Only students can enroll in courses")
+
+    # Check if already enrolled
+    existing_enrollment = db.query(Enrollment).filter(
+        Enrollment.user_id == user.id,
+        Enrollment.course_id == course.id
+    ).first()
+    if existing_enrollment:
+        raise BadRequestException(detail="Already enrolled in this course")
+
+    # Check that every required course has been completed
+    check_prerequisites(db, user.id, [course.id])
+
+    # Check that the course fits in the student's timetable
+    check_schedule(db, user.id, [course.id])
+
+    # Check if course is full
+    if course.is_full:
+        raise BadRequestException(detail="Course is full")
+
+    enrollment = Enrollment(user_id=user.id, course_id=course.id)
+    db.add(enrollment)
+
+    # A seat obtained directly supersedes any waitlist entry
+    db.query(WaitlistEntry).filter(
+        WaitlistEntry.user_id == user.id,
+        WaitlistEntry.course_id == course.id
+    ).delete(synchronize_session=False)
+    db.flush()
+
+    record_enrollment_change(db, AuditAction.ENROLLED, user.id, course.id, actor_id=user.id)
+
+    return enrollment
+
+
+def enroll_student_in_courses(db: Session, user: User, course_ids: List[int]) -> List[Enrollment]:
+    """
+    Enroll a student in several courses, all or nothing
+
+    Course rows are locked in ascending ID order so concurrent checkouts
+    over overlapping course sets cannot deadlock. Capacity and duplicate
+    checks each run as one grouped query for the whole set. The caller
+    owns the transaction: nothing is committed here.
+
+    Args:
+        db: Database session
+        user: Student to enroll
+        course_ids: IDs of the courses to enroll in
+
+    Returns:
+        The new, flushed enrollments in course ID order
+
+    Raises:
+        ForbiddenException: If the user is not a student
+        NotFoundException: If any course does not exist
+        BadRequestException: If any course is inactive, in admission mode,
+            full, has missing prerequisites or clashing meetings, or already
+            has the student enrolled
+    """
+    if user.role != UserRole.STUDENT:
+        raise ForbiddenException(detail="Only students can enroll in courses")
+
+    course_ids = sorted(set(course_ids))
+
+    courses = db.query(Course).filter(
+        Course.id.in_(course_ids)
+    ).order_by(Course.id).with_for_update().all()
+
+    missing = set(course_ids) - {course.id for course in courses}
+    if missing:
+        raise NotFoundException(detail=f"Courses not found: {sorted(missing)}")
+
+    for course in courses:
+        if not course.is_active:
+            raise BadRequestException(detail=f"Cannot enroll in inactive course {course.code}")
+        if course.admission_queue_enabled and admission_available():
+            raise BadRequestException(detail=f"Course {course.code} only accepts enrollments through its admission queue")
+
+    already_enrolled = db.query(Enrollment.course_id).filter(
+        Enrollment.user_id == user.id,
+        Enrollment.course_id.in_(course_ids)
+    ).all()
+    if already_enrolled:
+        codes = [course.code for course in courses if course.id in {row.course_id for row in already_enrolled}]
+        raise BadRequestException(detail=f"Already enrolled in: {', '.join(codes)}")
+
+    check_prerequisites(db, user.id, course_ids)
+    check_schedule(db, user.id, course_ids)
+
+    enrolled_counts = dict(
+        db.query(Enrollment.course_id, func.count(Enrollment.id)).filter(
+            Enrollment.course_id.in_(course_ids)
+        ).group_by(Enrollment.course_id).all()
+    )
+    full = [course.code for course in courses if enrolled_counts.get(course.id, 0) >= course.capacity]
+    if full:
+        raise BadRequestException(detail=f"Courses are full: {', '.join(full)}")
+
+    enrollments = [Enrollment(user_id=user.id, course_id=course_id) for course_id in course_ids]
+    db.add_all(enrollments)
+
+    db.query(WaitlistEntry).filter(
+        WaitlistEntry.user_id == user.id,
+        WaitlistEntry.course_id.in_(course_ids)
+    ).delete(synchronize_session=False)
+    db.flush()
+
+    for course_id in course_ids:
+        record_enrollment_change(db, AuditAction.ENROLLED, user.id, course_id, actor_id=user.id)
+
+    return enrollments
+
+
+def drop_enrollment(db: Session, enrollment: Enrollment, action: AuditAction, actor: User) -> None:
+    """
+    Delete an enrollment, record who did it and hand the seat to the waitlist
+
+    The caller owns the transaction: nothing is committed here.
+
+    Args:
+        db: Database session
+        enrollment: Enrollment to delete
+        action: AuditAction.DEREGISTERED or AuditAction.REMOVED
+        actor: User performing the change
+    """
+    course = enrollment.course
+    record_enrollment_change(db, action, enrollment.user_id, enrollment.course_id, actor_id=actor.id)
+    db.delete(enrollment)
+    promote_from_waitlist(db, course)
@@ -0,0 +1,24 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.audit import AuditAction, record_audit_event
+from app.models.outbox import publish_event
+from app.services.jobs import enqueue
+from app.services.notifications import NOTIFY_ENROLLMENT, ENROLLMENT_MESSAGES
+
+
+def record_enrollment_change(db: Session, action: AuditAction, user_id: int, course_id: int,
+                             actor_id: Optional[int] = None) -> None:
+    """
+    Audit an enrollment change, publish it to webhook subscribers and
+    schedule the student's notification
+
+    All three are buffered on the session and written when it commits.
+    """
+    record_audit_event(db, action, user_id, course_id, actor_id=actor_id)
+    publish_event(db, f"enrollment.{action.value}", {
+        "user_id": user_id,
+        "course_id": course_id,
+        "actor_id": actor_id,
+    })
+    if action.value in ENROLLMENT_MESSAGES:
+        enqueue(db, NOTIFY_ENROLLMENT, {"user_id": user_id, "course_id": course_id, "action": action.value})
@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.config import settings
+
+# Check outcomes; any failing check makes the instance not ready
+OK = "ok"
+DEGRADED = "degraded"
+FAIL = "fail"
+
+ReadinessCheck = Callable[[Session], dict]
+
+
+def check_connection_pool(db: Session) -> dict:
+    """
+    Report connection pool usage
+
+    A busy pool only degrades the instance: under a traffic spike every
+    worker saturates together, and failing readiness would take the whole
+    fleet out of the load balancer at once.
+    """
+    pool = db.get_bind().engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"status": OK, "pool": type(pool).__name__}
+
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    if saturation >= settings.HEALTH_POOL_DEGRADED_SATURATION:
+        status = DEGRADED
+    else:
+        status = OK
+    return {"status": status, "checked_out": checked_out, "capacity": capacity,
+            "saturation": round(saturation, 2)}
+
+
+def check_database(db: Session) -> dict:
+    """
+    Round-trip a trivial query and report its latency
+
+    Skipped, as degraded, when the pool has no free connection: checking
+    one out would block for the pool timeout, long past the probe's own
+    deadline. Connection errors fail the check.
+    """
+    pool = check_connection_pool(db)
+    if pool.get("saturation", 0) >= 1:
+        return {"status": DEGRADED, "skipped": "No free connection in the pool"}
+
+    started = time.perf_counter()
+    db.execute(text("SELECT 1"))
+    latency_ms = (time.perf_counter() - started) * 1000
+    status = DEGRADED if latency_ms >= settings.HEALTH_DB_SLOW_MS else OK
+    return {"status": status, "latency_ms": round(latency_ms, 2)}
+
+
+class ReadinessProbe:
+    """
+    Run registered readiness checks and cache the verdict
+
+    Load balancers probe every instance every few seconds; the cached
+    report keeps those probes from adding their own load to the database.
+    Subsystems register a check with register(); a check returns a dict
+    with a "status" of ok, degraded or fail, and raising counts as fail.
+    """
+
+    def __init__(self, ttl: float = settings.HEALTH_READY_CACHE_SECONDS):
+        self.ttl = ttl
+        self.checks: Dict[str, ReadinessCheck] = {}
+        self._lock = threading.Lock()
+        self._cached: Optional[Tuple[float, bool, dict]] = None
+
+    def register(self, name: str, check: ReadinessCheck) -> None:
+        self.checks[name] = check
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._cached = None
+
+    def run(self, db: Session) -> Tuple[bool, dict]:
+        """Return (ready, per-check report), from cache when fresh"""
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is not None and now - self._cached[0] < self.ttl:
+                return self._cached[1], self._cached[2]
+
+            report = {}
+            for name, check in self.checks.items():
+                try:
+                    report[name] = check(db)
+                except Exception as exc:
+                    report[name] = {"status": FAIL, "error": f"{type(exc).__name__}: {exc}"[:200]}
+            ready = all(result["status"] != FAIL for result in report.values())
+            self._cached = (now, ready, report)
+            return ready, report
+
+
+readiness = ReadinessProbe()
+readiness.register("connection_pool", check_connection_pool)
+readiness.register("database", check_database)
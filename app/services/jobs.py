@@ -0,0 +1,228 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.job import BackgroundJob, JobStatus, enqueue_job
+from app.services.health import OK, DEGRADED
+
+logger = logging.getLogger(__name__)
+
+# Task name -> handler(db, **payload)
+TASKS: Dict[str, Callable[..., None]] = {}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def task(name: str):
+    """Register a function as the handler of a background task"""
+    def register(func: Callable[..., None]) -> Callable[..., None]:
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(db: Session, task_name: str, payload: Optional[dict] = None,
+            delay_seconds: float = 0, max_attempts: Optional[int] = None) -> None:
+    """
+    Schedule a background task in the caller's transaction
+
+    Nothing is written until the caller commits; a rollback drops the job.
+
+    Args:
+        db: Database session
+        task_name: Name of a registered task
+        payload: JSON-serializable keyword arguments for the handler
+        delay_seconds: Earliest start, relative to now
+        max_attempts: Attempts before the job is dead-lettered
+    """
+    enqueue_job(db, task_name, payload or {}, max_attempts or settings.JOB_MAX_ATTEMPTS, delay_seconds)
+
+
+class JobWorkerPool:
+    """
+    Run background jobs from the background_jobs table
+
+    Each worker thread claims the oldest due job with a conditional UPDATE
+    (PENDING -> RUNNING), so workers in this or other processes never run
+    the same job twice. Handlers may commit their own work (maintenance
+    jobs commit in chunks), so the SUCCEEDED mark is a separate commit and
+    a crash in between runs the job again: handlers must be idempotent.
+    Failures are retried with exponential backoff; after max_attempts the
+    job is dead-lettered (status DEAD) and kept for inspection. Jobs left
+    RUNNING by a crashed worker are requeued after JOB_LOCK_TIMEOUT_SECONDS,
+    or dead-lettered if that run was their last attempt.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        workers: int = settings.JOB_WORKERS,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+        retry_base: float = settings.JOB_RETRY_BASE_SECONDS,
+        retry_max: float = settings.JOB_RETRY_MAX_SECONDS,
+        lock_timeout: float = settings.JOB_LOCK_TIMEOUT_SECONDS,
+        tasks: Optional[Dict[str, Callable[..., None]]] = None,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.lock_timeout = lock_timeout
+        self.tasks = TASKS if tasks is None else tasks
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def claim(self, db: Session) -> Optional[BackgroundJob]:
+        """Claim the oldest due job; returns None when nothing is due"""
+        now = _utcnow()
+        candidates = db.query(BackgroundJob.id).filter(
+            BackgroundJob.status == JobStatus.PENDING,
+            BackgroundJob.run_at <= now
+        ).order_by(BackgroundJob.run_at, BackgroundJob.id).limit(self.workers + 1).with_for_update(
+            skip_locked=True
+        ).all()
+
+        for row in candidates:
+            claimed = db.execute(
+                update(BackgroundJob).where(
+                    BackgroundJob.id == row.id,
+                    BackgroundJob.status == JobStatus.PENDING
+                ).values(
+                    status=JobStatus.RUNNING, locked_at=now, attempts=BackgroundJob.attempts + 1
+                )
+            ).rowcount
+            if claimed:
+                db.commit()
+                return db.get(BackgroundJob, row.id)
+        db.rollback()
+        return None
+
+    def requeue_stale(self, db: Session) -> int:
+        """
+        Return jobs left RUNNING past the lock timeout to the queue
+
+        The lost run already counted as an attempt when the job was claimed.
+        Jobs that have used up max_attempts are dead-lettered instead, so a
+        job that keeps crashing its worker is not retried forever.
+        """
+        now = _utcnow()
+        stale = (
+            BackgroundJob.status == JobStatus.RUNNING,
+            BackgroundJob.locked_at < now - timedelta(seconds=self.lock_timeout),
+        )
+        error = "Worker lost: lock timed out"
+        dead = db.execute(
+            update(BackgroundJob).where(
+                *stale, BackgroundJob.attempts >= BackgroundJob.max_attempts
+            ).values(status=JobStatus.DEAD, locked_at=None, finished_at=now, last_error=error)
+        ).rowcount
+        requeued = db.execute(
+            update(BackgroundJob).where(*stale).values(status=JobStatus.PENDING, locked_at=None, last_error=error)
+        ).rowcount
+        db.commit()
+        if dead:
+            logger.error("Dead-lettered %d stale background jobs after their last attempt", dead)
+        if requeued:
+            logger.warning("Requeued %d stale background jobs", requeued)
+        return requeued
+
+    def run_job(self, job_id: int) -> None:
+        """Run a claimed job and record the outcome"""
+        db = self.session_factory()
+        try:
+            job = db.get(BackgroundJob, job_id)
+            handler = self.tasks.get(job.task)
+            if handler is None:
+                self._finish(db, job, JobStatus.DEAD, f"Unknown task {job.task!r}")
+                return
+            try:
+                handler(db, **job.payload)
+            except Exception as exc:
+                db.rollback()
+                logger.exception("Background job %d (%s) failed", job.id, job.task)
+                job = db.get(BackgroundJob, job_id)
+                self._fail(db, job, f"{type(exc).__name__}: {exc}"[:500])
+                return
+            self._finish(db, job, JobStatus.SUCCEEDED)
+        finally:
+            db.close()
+
+    def _finish(self, db: Session, job: BackgroundJob, status: JobStatus, error: Optional[str] = None) -> None:
+        job.status = status
+        job.locked_at = None
+        job.finished_at = _utcnow()
+        job.last_error = error
+        db.commit()
+
+    def _fail(self, db: Session, job: BackgroundJob, error: str) -> None:
+        if job.attempts >= job.max_attempts:
+            logger.error("Background job %d (%s) dead-lettered after %d attempts", job.id, job.task, job.attempts)
+            self._finish(db, job, JobStatus.DEAD, error)
+            return
+        delay = min(self.retry_max, self.retry_base * 2 ** (job.attempts - 1))
+        job.status = JobStatus.PENDING
+        job.locked_at = None
+        job.run_at = _utcnow() + timedelta(seconds=delay)
+        job.last_error = error
+        db.commit()
+
+    def run_once(self) -> bool:
+        """Claim and run one due job; returns whether a job ran"""
+        db = self.session_factory()
+        try:
+            job = self.claim(db)
+            job_id = job.id if job else None
+        except Exception:
+            db.rollback()
+            logger.exception("Claiming a background job failed")
+            return False
+        finally:
+            db.close()
+
+        if job_id is None:
+            return False
+        self.run_job(job_id)
+        return True
+
+    def _run_worker(self, index: int) -> None:
+        while not self._stop.is_set():
+            if self.run_once():
+                continue
+            # Only one worker sweeps for stale jobs while idle
+            if index == 0:
+                db = self.session_factory()
+                try:
+                    self.requeue_stale(db)
+                except Exception:
+                    db.rollback()
+                    logger.exception("Requeueing stale background jobs failed")
+                finally:
+                    db.close()
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run_worker, args=(index,), name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def health_check(self, db: Session) -> dict:
+        """Readiness check: dead worker threads degrade the instance"""
+        alive = sum(1 for thread in self._threads if thread.is_alive())
+        return {"status": OK if alive >= self.workers else DEGRADED, "workers": self.workers, "alive": alive}
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker threads after their current job"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
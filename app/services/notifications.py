@@ -0,0 +1,43 @@
+import logging
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.services.jobs import task
+
+# Notifications are written to this logger until a mail transport is configured
+notification_logger = logging.getLogger("app.notifications")
+
+NOTIFY_ENROLLMENT = "notifications.enrollment"
+NOTIFY_COURSE_DEACTIVATED = "notifications.course_deactivated"
+
+# Enrollment changes students are told about, keyed by AuditAction value
+ENROLLMENT_MESSAGES = {
+    "enrolled": "You are enrolled in {code} - {title}",
+    "promoted": "A seat opened up: you are now enrolled in {code} - {title}",
+    "removed": "You were removed from {code} - {title}",
+}
+
+
+@task(NOTIFY_ENROLLMENT)
+def notify_enrollment(db: Session, user_id: int, course_id: int, action: str) -> None:
+    """Tell a student about a change to one of their enrollments"""
+    user = db.get(User, user_id)
+    course = db.get(Course, course_id)
+    if user is None or course is None:
+        return
+    message = ENROLLMENT_MESSAGES[action].format(code=course.code, title=course.title)
+    notification_logger.info("To %s: %s", user.email, message)
+
+
+@task(NOTIFY_COURSE_DEACTIVATED)
+def notify_course_deactivated(db: Session, course_id: int) -> None:
+    """Tell every enrolled student that a course was deactivated"""
+    course = db.get(Course, course_id)
+    if course is None or course.is_active:
+        return
+    emails = db.query(User.email).join(Enrollment, Enrollment.user_id == User.id).filter(
+        Enrollment.course_id == course_id
+    ).all()
+    for row in emails:
+        notification_logger.info("To %s: %s - %s has been deactivated", row.email, course.code, course.title)
@@ -0,0 +1,50 @@
+from typing import Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.utils.exceptions import PreconditionFailedException, PreconditionRequiredException
+
+
+def version_etag(version: int) -> str:
+    """Strong ETag of a versioned row"""
+    return f'"{version}"'
+
+
+def check_if_match(if_match: Optional[str], version: int) -> None:
+    """
+    Enforce an If-Match precondition against the version just read
+
+    Raises:
+        PreconditionRequiredException: If the header is missing
+        PreconditionFailedException: If no listed ETag is the current one
+    """
+    if if_match is None:
+        raise PreconditionRequiredException(detail="If-Match header with the resource's ETag is required")
+    etags = {etag.strip() for etag in if_match.split(",")}
+    current = version_etag(version)
+    if "*" not in etags and current not in etags:
+        raise PreconditionFailedException(detail="Resource was modified; fetch it again and retry", etag=current)
+
+
+def bump_version(db: Session, row, expected: int) -> None:
+    """
+    Move a versioned row to its next version if it still has the expected one
+
+    Run it after the row's other changes, in the same transaction and before
+    the commit. The version check at read time leaves a window until then;
+    this conditional UPDATE closes it without holding a row lock while the
+    request runs. Other writers (enrollments, term closing) do not go through
+    here, so only If-Match writes can be refused.
+
+    Raises:
+        PreconditionFailedException: If the row changed since it was read;
+            the transaction is rolled back
+    """
+    model = type(row)
+    db.flush()
+    bumped = db.execute(
+        update(model).where(model.id == row.id, model.version == expected).values(version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not bumped:
+        db.rollback()
+        raise PreconditionFailedException(detail="Resource was modified concurrently; fetch it again and retry")
@@ -0,0 +1,191 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+from sqlalchemy.orm import Session
+from app.models.course import Course
+from app.models.completion import CourseCompletion
+from app.models.prerequisite import CoursePrerequisite, CoursePrerequisiteClosure
+from app.utils.exceptions import NotFoundException, BadRequestException
+
+
+def get_direct_prerequisites(db: Session, course_id: int) -> List[int]:
+    """Get the IDs of the courses a course directly requires"""
+    rows = db.query(CoursePrerequisite.prerequisite_id).filter(
+        CoursePrerequisite.course_id == course_id
+    ).order_by(CoursePrerequisite.prerequisite_id).all()
+    return [row.prerequisite_id for row in rows]
+
+
+def get_required_courses(db: Session, course_id: int) -> List[int]:
+    """Get the IDs of every course a course requires, directly or indirectly"""
+    rows = db.query(CoursePrerequisiteClosure.required_course_id).filter(
+        CoursePrerequisiteClosure.course_id == course_id
+    ).order_by(CoursePrerequisiteClosure.required_course_id).all()
+    return [row.required_course_id for row in rows]
+
+
+def _get_dependents(db: Session, course_id: int) -> Set[int]:
+    """Get the IDs of every course that requires a course, directly or indirectly"""
+    rows = db.query(CoursePrerequisiteClosure.course_id).filter(
+        CoursePrerequisiteClosure.required_course_id == course_id
+    ).all()
+    return {row.course_id for row in rows}
+
+
+def _rebuild_closure(db: Session, course_ids: Iterable[int]) -> None:
+    """Recompute closure rows for the given courses from the direct edges"""
+    course_ids = set(course_ids)
+    graph: Dict[int, Set[int]] = defaultdict(set)
+    for edge in db.query(CoursePrerequisite).all():
+        graph[edge.course_id].add(edge.prerequisite_id)
+
+    db.query(CoursePrerequisiteClosure).filter(
+        CoursePrerequisiteClosure.course_id.in_(course_ids)
+    ).delete(synchronize_session=False)
+
+    rows = []
+    for course_id in course_ids:
+        reachable: Set[int] = set()
+        stack = list(graph[course_id])
+        while stack:
+            required = stack.pop()
+            if required in reachable:
+                continue
+            reachable.add(required)
+            stack.extend(graph[required])
+        rows.extend(
+            {"course_id": course_id, "required_course_id": required}
+            for required in reachable
+        )
+
+    if rows:
+        db.execute(CoursePrerequisiteClosure.__table__.insert(), rows)
+
+
+def set_prerequisites(db: Session, course: Course, prerequisite_ids: List[int]) -> None:
+    """
+    Replace the direct prerequisites of a course and update the closure
+
+    Only the closure rows of the course and of the courses that depend on it
+    are touched. Adding edges extends those rows in place; removing edges
+    recomputes them from the direct edges. The caller owns the transaction.
+
+    Concurrent changes that could close a cycle together are serialized:
+    the course, the courses depending on it, the new prerequisites and the
+    courses they require are locked in id order before the cycle check, so
+    each check sees the other change once it has committed.
+
+    Raises:
+        NotFoundException: If a prerequisite course does not exist
+        BadRequestException: If the change would create a cycle
+    """
+    new_ids = set(prerequisite_ids)
+    related = _get_dependents(db, course.id) | {course.id} | new_ids
+    if new_ids:
+        related.update(
+            row.required_course_id for row in db.query(CoursePrerequisiteClosure.required_course_id).filter(
+                CoursePrerequisiteClosure.course_id.in_(new_ids)
+            ).all()
+        )
+    locked = {
+        row.id for row in db.query(Course.id).filter(
+            Course.id.in_(related)
+        ).order_by(Course.id).with_for_update().all()
+    }
+
+    old_ids = set(get_direct_prerequisites(db, course.id))
+    if new_ids == old_ids:
+        return
+
+    missing = new_ids - locked
+    if missing:
+        raise NotFoundException(detail=f"Courses not found: {sorted(missing)}")
+
+    # A new edge course -> prerequisite closes a cycle exactly when the
+    # prerequisite already requires the course (or is the course itself)
+    added = new_ids - old_ids
+    if course.id in added:
+        raise BadRequestException(detail="A course cannot be its own prerequisite")
+    if added and db.query(CoursePrerequisiteClosure).filter(
+        CoursePrerequisiteClosure.course_id.in_(added),
+        CoursePrerequisiteClosure.required_course_id == course.id
+    ).first():
+        raise BadRequestException(detail="Prerequisites would create a cycle")
+
+    removed = old_ids - new_ids
+    if removed:
+        db.query(CoursePrerequisite).filter(
+            CoursePrerequisite.course_id == course.id,
+            CoursePrerequisite.prerequisite_id.in_(removed)
+        ).delete(synchronize_session=False)
+    db.add_all(CoursePrerequisite(course_id=course.id, prerequisite_id=p) for p in added)
+    db.flush()
+
+    affected = _get_dependents(db, course.id) | {course.id}
+    if removed:
+        _rebuild_closure(db, affected)
+        return
+
+    # Pure additions: everything affected now also requires the new
+    # prerequisites and whatever they require
+    gained = set(added)
+    gained.update(
+        row.required_course_id for row in db.query(CoursePrerequisiteClosure.required_course_id).filter(
+            CoursePrerequisiteClosure.course_id.in_(added)
+        ).all()
+    )
+    present = {
+        (row.course_id, row.required_course_id)
+        for row in db.query(CoursePrerequisiteClosure).filter(
+            CoursePrerequisiteClosure.course_id.in_(affected),
+            CoursePrerequisiteClosure.required_course_id.in_(gained)
+        ).all()
+    }
+    rows = [
+        {"course_id": course_id, "required_course_id": required}
+        for course_id in affected
+        for required in gained
+        if (course_id, required) not in present
+    ]
+    if rows:
+        db.execute(CoursePrerequisiteClosure.__table__.insert(), rows)
+
+
+def get_missing_prerequisites(db: Session, user_id: int, course_ids: List[int]) -> Dict[int, List[int]]:
+    """
+    Find the required courses a student has not completed
+
+    Runs one indexed query over the closure and the student's completions
+    for the whole set of courses.
+
+    Returns:
+        Mapping of course ID to the IDs of its missing required courses;
+        courses with nothing missing are omitted
+    """
+    completed = db.query(CourseCompletion.course_id).filter(
+        CourseCompletion.user_id == user_id
+    )
+    rows = db.query(CoursePrerequisiteClosure).filter(
+        CoursePrerequisiteClosure.course_id.in_(course_ids),
+        CoursePrerequisiteClosure.required_course_id.not_in(completed)
+    ).all()
+
+    missing: Dict[int, List[int]] = defaultdict(list)
+    for row in rows:
+        missing[row.course_id].append(row.required_course_id)
+    return dict(missing)
+
+
+def check_prerequisites(db: Session, user_id: int, course_ids: List[int]) -> None:
+    """
+    Ensure a student has completed everything the courses require
+
+    Raises:
+        BadRequestException: If any required course is not completed
+    """
+    missing = get_missing_prerequisites(db, user_id, course_ids)
+    if not missing:
+        return
+
+    required_ids = sorted({required for ids in missing.values() for required in ids})
+    codes = [row.code for row in db.query(Course.code).filter(Course.id.in_(required_ids)).order_by(Course.code).all()]
+    raise BadRequestException(detail=f"Missing prerequisites: {', '.join(codes)}")
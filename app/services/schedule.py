@@ -0,0 +1,116 @@
+from typing import List, Tuple
+from sqlalchemy.orm import Session, aliased
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.meeting import CourseMeeting
+from app.utils.exceptions import BadRequestException
+
+
+def set_meetings(db: Session, course: Course, slots: List[Tuple[int, int, int]]) -> None:
+    """
+    Replace the weekly meeting slots of a course
+
+    Args:
+        db: Database session
+        course: Course to update
+        slots: (day_of_week, start_minute, end_minute) tuples
+
+    Raises:
+        BadRequestException: If two of the course's own slots overlap
+    """
+    ordered = sorted(slots)
+    for previous, current in zip(ordered, ordered[1:]):
+        if previous[0] == current[0] and current[1] < previous[2]:
+            raise BadRequestException(detail="Meeting slots of a course cannot overlap")
+
+    db.query(CourseMeeting).filter(CourseMeeting.course_id == course.id).delete(synchronize_session=False)
+    db.add_all(
+        CourseMeeting(course_id=course.id, day_of_week=day, start_minute=start, end_minute=end)
+        for day, start, end in ordered
+    )
+    db.flush()
+    db.expire(course, ["meetings"])
+
+
+def find_schedule_conflicts(db: Session, user_id: int, course_ids: List[int]) -> List[Tuple[str, str]]:
+    """
+    Find meeting overlaps between candidate courses and a student's timetable
+
+    The student's enrollments drive the join, so the cost grows with the
+    slots that actually share a day with a candidate slot rather than with
+    every meeting of every enrolled course. Candidate courses are also
+    checked against each other. Courses only clash with courses of their
+    own term or with courses that have no term, so a Fall timetable does
+    not block Spring courses meeting at the same time.
+
+    Args:
+        db: Database session
+        user_id: ID of the student
+        course_ids: IDs of the courses the student wants to add
+
+    Returns:
+        Distinct (candidate course code, conflicting course code) pairs
+    """
+    candidate = aliased(CourseMeeting)
+    existing = aliased(CourseMeeting)
+    candidate_course = aliased(Course)
+    existing_course = aliased(Course)
+
+    def overlaps():
+        return (
+            (existing.day_of_week == candidate.day_of_week)
+            & (existing.start_minute < candidate.end_minute)
+            & (candidate.start_minute < existing.end_minute)
+        )
+
+    # Symmetric: a course without a term clashes with every term
+    same_term = (
+        existing_course.term_id.is_(None)
+        | candidate_course.term_id.is_(None)
+        | (existing_course.term_id == candidate_course.term_id)
+    )
+
+    with_enrolled = db.query(candidate_course.code, existing_course.code).select_from(candidate).join(
+        existing, overlaps()
+    ).join(
+        Enrollment, (Enrollment.course_id == existing.course_id) & (Enrollment.user_id == user_id)
+    ).join(
+        candidate_course, candidate_course.id == candidate.course_id
+    ).join(
+        existing_course, existing_course.id == existing.course_id
+    ).filter(
+        candidate.course_id.in_(course_ids),
+        existing.course_id.not_in(course_ids),
+        same_term
+    )
+
+    conflicts = set(with_enrolled.all())
+
+    if len(course_ids) > 1:
+        among_candidates = db.query(candidate_course.code, existing_course.code).select_from(candidate).join(
+            existing, overlaps() & (existing.course_id > candidate.course_id)
+        ).join(
+            candidate_course, candidate_course.id == candidate.course_id
+        ).join(
+            existing_course, existing_course.id == existing.course_id
+        ).filter(
+            candidate.course_id.in_(course_ids),
+            existing.course_id.in_(course_ids),
+            same_term
+        )
+        conflicts.update(among_candidates.all())
+
+    return sorted(tuple(conflict) for conflict in conflicts)
+
+
+def check_schedule(db: Session, user_id: int, course_ids: List[int]) -> None:
+    """
+    Ensure candidate courses fit in a student's timetable
+
+    Raises:
+        BadRequestException: If any meeting slots overlap
+    """
+    conflicts = find_schedule_conflicts(db, user_id, course_ids)
+    if conflicts:
+        clashes = ", ".join(f"{code} overlaps {other}" for code, other in conflicts)
+        raise BadRequestException(detail=f"Schedule conflict: {clashes}")
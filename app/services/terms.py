@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.course import Course
+from app.models.term import Term
+from app.jobs.tasks import ARCHIVE_TERM
+from app.services.jobs import enqueue
+from app.utils.exceptions import BadRequestException
+
+
+def get_open_term(db: Session, term_id: Optional[int]) -> Optional[Term]:
+    """
+    Term that a course may be placed in
+
+    Raises:
+        BadRequestException: If the term does not exist or is closed
+    """
+    if term_id is None:
+        return None
+    term = db.get(Term, term_id)
+    if term is None:
+        raise BadRequestException(detail="Term not found")
+    if term.is_closed:
+        raise BadRequestException(detail=f"Term '{term.code}' is closed")
+    return term
+
+
+def close_term(db: Session, term: Term) -> int:
+    """
+    Close a term and schedule the archival of its enrollments
+
+    The term's courses are deactivated, so they take no new enrollments
+    while the archive job moves the existing ones out of the enrollments
+    table. Nothing is written until the caller commits.
+
+    Returns:
+        Number of courses deactivated
+    """
+    term.closed_at = datetime.now(timezone.utc)
+    courses = db.query(Course).filter(Course.term_id == term.id, Course.is_active == True).all()
+    for course in courses:
+        course.is_active = False
+        # Invalidates ETags held by admins; a concurrent If-Match edit gets 412
+        course.version = Course.version + 1
+    enqueue(db, ARCHIVE_TERM, {"term_id": term.id})
+    return len(courses)
@@ -0,0 +1,140 @@
+from typing import List
+from sqlalchemy import func, or_, and_
+from sqlalchemy.orm import Session, aliased
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.waitlist import WaitlistEntry
+from app.models.audit import AuditAction
+from app.services.prerequisites import check_prerequisites
+from app.services.schedule import check_schedule
+from app.services.events import record_enrollment_change
+from app.utils.exceptions import BadRequestException, ForbiddenException
+
+
+def count_enrolled(db: Session, course_id: int) -> int:
+    """Count enrollments for a course with a query rather than loading the collection"""
+    return db.query(func.count(Enrollment.id)).filter(Enrollment.course_id == course_id).scalar()
+
+
+def join_waitlist(db: Session, user: User, course: Course) -> WaitlistEntry:
+    """
+    Add a student to the waitlist of a full course
+
+    The caller owns the transaction: nothing is committed here.
+
+    Raises:
+        ForbiddenException: If the user is not a student
+        BadRequestException: If the course has seats, prerequisites are
+            missing, meetings clash, or the student is already enrolled or
+            waitlisted
+    """
+    if user.role != UserRole.STUDENT:
+        raise ForbiddenException(detail="Only students can join waitlists")
+
+    enrolled = db.query(Enrollment.id).filter(
+        Enrollment.user_id == user.id,
+        Enrollment.course_id == course.id
+    ).first()
+    if enrolled:
+        raise BadRequestException(detail="Already enrolled in this course")
+
+    waitlisted = db.query(WaitlistEntry.id).filter(
+        WaitlistEntry.user_id == user.id,
+        WaitlistEntry.course_id == course.id
+    ).first()
+    if waitlisted:
+        raise BadRequestException(detail="Already on the waitlist for this course")
+
+    check_prerequisites(db, user.id, [course.id])
+    check_schedule(db, user.id, [course.id])
+
+    if count_enrolled(db, course.id) < course.capacity:
+        raise BadRequestException(detail="Course has available seats, enroll directly")
+
+    entry = WaitlistEntry(user_id=user.id, course_id=course.id)
+    db.add(entry)
+    db.flush()
+
+    return entry
+
+
+def waitlist_position(db: Session, entry: WaitlistEntry) -> int:
+    """
+    Get the 1-based position of a waitlist entry
+
+    Counts the entries ahead of it with a range scan on the
+    (course_id, created_at, id) index.
+    """
+    # Compare against the stored timestamp in SQL so values never round-trip
+    # through Python and lose their database representation
+    target = aliased(WaitlistEntry)
+    ahead = db.query(func.count(WaitlistEntry.id)).join(
+        target, target.course_id == WaitlistEntry.course_id
+    ).filter(
+        target.id == entry.id,
+        or_(
+            WaitlistEntry.created_at < target.created_at,
+            and_(WaitlistEntry.created_at == target.created_at, WaitlistEntry.id < target.id)
+        )
+    ).scalar()
+    return ahead + 1
+
+
+def is_eligible(db: Session, user_id: int, course: Course) -> bool:
+    """Check that a waitlisted student still meets the enrollment rules of a course"""
+    try:
+        check_prerequisites(db, user_id, [course.id])
+        check_schedule(db, user_id, [course.id])
+    except BadRequestException:
+        return False
+    return True
+
+
+def promote_from_waitlist(db: Session, course: Course) -> List[Enrollment]:
+    """
+    Fill free seats of a course from the head of its waitlist
+
+    Call this in the same transaction that frees seats (deregistration,
+    removal, capacity increase) so a freed seat is never visible to other
+    requests before the waitlist gets it. Nothing is committed here.
+
+    Inactive courses promote nobody. Students who no longer meet the
+    prerequisites or whose timetable now clashes with the course are
+    skipped and keep their place for a later seat.
+
+    Returns:
+        The enrollments created for promoted students
+    """
+    db.flush()
+    if not course.is_active:
+        return []
+    free_seats = course.capacity - count_enrolled(db, course.id)
+    if free_seats <= 0:
+        return []
+
+    waiting = db.query(WaitlistEntry).filter(
+        WaitlistEntry.course_id == course.id
+    ).order_by(
+        WaitlistEntry.created_at, WaitlistEntry.id
+    ).with_for_update()
+
+    promoted = []
+    skipped = 0
+    while len(promoted) < free_seats:
+        # Promoted entries are deleted, so the skipped ones are all that lie ahead
+        entries = waiting.offset(skipped).limit(free_seats - len(promoted)).all()
+        if not entries:
+            break
+        for entry in entries:
+            if not is_eligible(db, entry.user_id, course):
+                skipped += 1
+                continue
+            enrollment = Enrollment(user_id=entry.user_id, course_id=entry.course_id)
+            db.add(enrollment)
+            db.delete(entry)
+            record_enrollment_change(db, AuditAction.PROMOTED, entry.user_id, entry.course_id)
+            promoted.append(enrollment)
+        db.flush()
+
+    return promoted
@@ -0,0 +1,208 @@
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+import httpx
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
+from app.config import settings
+from app.database import SessionLocal
+from app.models.outbox import OutboxEvent, WebhookEndpoint, WebhookDelivery, DeliveryStatus
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def event_payload(event: OutboxEvent) -> dict:
+    """Build the JSON body sent to receivers for one outbox event"""
+    return {
+        "id": event.id,
+        "type": event.event_type,
+        "occurred_at": event.created_at.isoformat() if event.created_at else None,
+        "data": event.payload,
+    }
+
+
+class WebhookDispatcher:
+    """
+    Deliver outbox events to registered webhook endpoints
+
+    Each cycle fans new outbox events out into one delivery row per active
+    endpoint, then sends due deliveries in batches (one POST carries up to
+    WEBHOOK_BATCH_SIZE events). Requests to one endpoint never exceed its
+    max_concurrency. Failed batches are retried with exponential backoff
+    and marked failed after WEBHOOK_MAX_ATTEMPTS.
+
+    Due rows are leased rather than held locked: a short SKIP LOCKED
+    transaction counts the attempt and moves next_attempt_at
+    WEBHOOK_LEASE_SECONDS ahead, then commits before anything is posted, so
+    several dispatchers can run side by side and slow receivers never keep
+    a transaction open. Each batch's outcome is recorded in its own short
+    transaction; a dispatcher that dies mid-batch leaves its rows to be
+    retried once the lease runs out.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        client: Optional[httpx.Client] = None,
+        batch_size: int = settings.WEBHOOK_BATCH_SIZE,
+        max_attempts: int = settings.WEBHOOK_MAX_ATTEMPTS,
+        retry_base: float = settings.WEBHOOK_RETRY_BASE_SECONDS,
+        retry_max: float = settings.WEBHOOK_RETRY_MAX_SECONDS,
+        poll_interval: float = settings.WEBHOOK_POLL_INTERVAL_SECONDS,
+        lease_seconds: float = settings.WEBHOOK_LEASE_SECONDS,
+        max_workers: int = 16,
+    ):
+        self.session_factory = session_factory
+        self.client = client or httpx.Client(timeout=settings.WEBHOOK_TIMEOUT_SECONDS)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="webhook")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def fan_out(self, db: Session) -> int:
+        """Create deliveries for undispatched outbox events; returns events dispatched"""
+        events = db.query(OutboxEvent).filter(
+            OutboxEvent.dispatched_at.is_(None)
+        ).order_by(OutboxEvent.id).limit(self.batch_size * 10).with_for_update(skip_locked=True).all()
+        if not events:
+            return 0
+
+        now = _utcnow()
+        endpoint_ids = [row.id for row in db.query(WebhookEndpoint.id).filter(WebhookEndpoint.is_active == True)]
+        if endpoint_ids:
+            db.execute(WebhookDelivery.__table__.insert(), [
+                {"event_id": event.id, "endpoint_id": endpoint_id, "status": DeliveryStatus.PENDING,
+                 "attempts": 0, "next_attempt_at": now}
+                for event in events
+                for endpoint_id in endpoint_ids
+            ])
+        for event in events:
+            event.dispatched_at = now
+        db.commit()
+        return len(events)
+
+    def deliver_due(self, db: Session) -> int:
+        """Lease due deliveries, send them and record each outcome; returns deliveries attempted"""
+        now = _utcnow()
+        due = db.query(WebhookDelivery).join(WebhookDelivery.endpoint).filter(
+            WebhookDelivery.status == DeliveryStatus.PENDING,
+            WebhookDelivery.next_attempt_at <= now,
+            WebhookEndpoint.is_active == True
+        ).options(
+            selectinload(WebhookDelivery.event), selectinload(WebhookDelivery.endpoint)
+        ).order_by(WebhookDelivery.id).limit(self.batch_size * 20).with_for_update(
+            of=WebhookDelivery, skip_locked=True
+        ).all()
+        if not due:
+            return 0
+
+        by_endpoint: Dict[int, List[WebhookDelivery]] = defaultdict(list)
+        for delivery in due:
+            delivery.attempts += 1
+            delivery.next_attempt_at = now + timedelta(seconds=self.lease_seconds)
+            by_endpoint[delivery.endpoint_id].append(delivery)
+
+        # Build request bodies before the commit expires the rows; the session stays on this thread
+        requests = []
+        for deliveries in by_endpoint.values():
+            endpoint = deliveries[0].endpoint
+            limiter = threading.Semaphore(max(1, endpoint.max_concurrency))
+            for start in range(0, len(deliveries), self.batch_size):
+                batch = deliveries[start:start + self.batch_size]
+                leases = [(delivery.id, delivery.attempts) for delivery in batch]
+                body = {"events": [event_payload(delivery.event) for delivery in batch]}
+                requests.append((leases, limiter, endpoint.url, body))
+        db.commit()
+
+        futures = {
+            self._executor.submit(self._post, limiter, url, body): leases
+            for leases, limiter, url, body in requests
+        }
+        for future in as_completed(futures):
+            self._record(db, futures[future], future.result())
+        return len(due)
+
+    def _record(self, db: Session, leases: List[Tuple[int, int]], error: Optional[str]) -> None:
+        """
+        Record the outcome of one batch in its own transaction
+
+        Rows are matched on their leased attempt count, so an outcome that
+        arrives after the lease ran out and another dispatcher retried the
+        row does not overwrite the newer attempt.
+        """
+        now = _utcnow()
+        by_attempts: Dict[int, List[int]] = defaultdict(list)
+        for delivery_id, attempts in leases:
+            by_attempts[attempts].append(delivery_id)
+
+        for attempts, delivery_ids in by_attempts.items():
+            if error is None:
+                values = {"status": DeliveryStatus.DELIVERED, "delivered_at": now, "last_error": None}
+            elif attempts >= self.max_attempts:
+                values = {"status": DeliveryStatus.FAILED, "last_error": error}
+            else:
+                delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+                values = {"next_attempt_at": now + timedelta(seconds=delay), "last_error": error}
+            db.execute(update(WebhookDelivery).where(
+                WebhookDelivery.id.in_(delivery_ids),
+                WebhookDelivery.attempts == attempts,
+                WebhookDelivery.status == DeliveryStatus.PENDING
+            ).values(**values).execution_options(synchronize_session=False))
+        db.commit()
+
+    def _post(self, limiter: threading.Semaphore, url: str, body: dict) -> Optional[str]:
+        """POST one batch; returns None on success or an error description"""
+        with limiter:
+            try:
+                response = self.client.post(url, json=body)
+            except httpx.HTTPError as exc:
+                return f"{type(exc).__name__}: {exc}"[:500]
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}"
+
+    def run_once(self) -> int:
+        """Run one fan-out and delivery cycle; returns deliveries attempted"""
+        db = self.session_factory()
+        try:
+            self.fan_out(db)
+            return self.deliver_due(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Webhook dispatch cycle failed")
+            return 0
+        finally:
+            db.close()
+
+    def run_forever(self) -> None:
+        """Dispatch until stop() is called"""
+        while not self._stop.is_set():
+            if not self.run_once():
+                self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        """Run the dispatcher on a background thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread and release HTTP resources"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._executor.shutdown(wait=True)
+        self.client.close()
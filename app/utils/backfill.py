@@ -0,0 +1,239 @@
+"""
+Online, chunked data backfills for large tables
+
+Filling a new column of enrollments with one UPDATE locks every row it
+touches until it commits, so enrollment writes stall for as long as the
+statement runs. run_backfill walks the table in primary key order instead,
+one short transaction per chunk:
+
+    SELECT max(id) FROM (SELECT id FROM t WHERE id > :last ORDER BY id LIMIT :size)
+    UPDATE t SET ... WHERE id > :last AND id <= :upper
+    UPDATE backfill_progress SET last_key = :upper, ...
+
+The checkpoint commits with its chunk, so an interrupted backfill resumes
+after the last committed chunk and no chunk is applied twice. Chunks taking
+longer than BACKFILL_CHUNK_TARGET_SECONDS are halved, and the backfill
+pauses BACKFILL_PAUSE_SECONDS between chunks.
+
+Schema changes and backfills go in separate revisions, so that no deploy
+holds a lock for longer than a DDL statement:
+
+1. Expand: add the column as nullable (no table rewrite) and deploy code
+   that writes it for new rows.
+2. Backfill: a revision that only calls backfill_in_migration. It runs
+   outside the migration transaction; rerunning `alembic upgrade` after an
+   interruption resumes it.
+3. Contract: in a later release, call require_backfilled, then add the
+   NOT NULL constraint or index that needs every row filled.
+
+A backfill revision describes tables with sa.table() rather than the
+models, which keep changing after the revision is written:
+
+    enrollments = sa.table('enrollments', sa.column('id', sa.Integer), sa.column('source', sa.String))
+
+    def upgrade() -> None:
+        backfill_in_migration('enrollments_source', enrollments,
+                              update_step(enrollments, {'source': 'web'}, enrollments.c.source.is_(None)))
+
+Show the progress of every backfill:
+
+    python -m app.utils.backfill [--database-url URL]
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from sqlalchemy import create_engine, delete, func, select, update
+from sqlalchemy.engine import Connection, Engine
+from app.config import settings
+from app.database import engine_options
+from app.models.backfill import BackfillProgress
+
+logger = logging.getLogger(__name__)
+
+# step(connection, lower, upper) processes the rows with lower < key <= upper
+# in the chunk's transaction and returns how many it changed
+ChunkStep = Callable[[Connection, int, int], int]
+
+PROGRESS = BackfillProgress.__table__
+
+
+def update_step(table, values: dict, *where, key: str = "id") -> ChunkStep:
+    """Chunk step setting values on the chunk's rows that match where"""
+    key_column = table.c[key]
+
+    def step(connection: Connection, lower: int, upper: int) -> int:
+        statement = update(table).where(key_column > lower, key_column <= upper, *where).values(values)
+        return max(connection.execute(statement).rowcount, 0)
+
+    return step
+
+
+def chunk_upper_bound(connection: Connection, key_column, after: int, size: int) -> Optional[int]:
+    """Key of the size-th row after the given key, or of the last row if fewer remain"""
+    keys = select(key_column).where(key_column > after).order_by(key_column).limit(size).subquery()
+    return connection.execute(select(func.max(keys.c[0]))).scalar()
+
+
+def load_progress(connection: Connection, name: str) -> Optional[dict]:
+    row = connection.execute(select(PROGRESS).where(PROGRESS.c.name == name)).mappings().first()
+    return dict(row) if row else None
+
+
+def start_progress(connection: Connection, name: str, key_column) -> dict:
+    """Checkpoint of the backfill, created before the table's first key if it has none"""
+    progress = load_progress(connection, name)
+    if progress is None:
+        first_key = connection.execute(select(func.min(key_column))).scalar()
+        now = datetime.now(timezone.utc)
+        connection.execute(PROGRESS.insert().values(
+            name=name, last_key=(first_key or 1) - 1, rows_processed=0, chunks=0, started_at=now, updated_at=now,
+        ))
+        progress = load_progress(connection, name)
+    return progress
+
+
+def save_progress(connection: Connection, progress: dict, finished: bool) -> None:
+    now = datetime.now(timezone.utc)
+    connection.execute(update(PROGRESS).where(PROGRESS.c.name == progress["name"]).values(
+        last_key=progress["last_key"],
+        rows_processed=progress["rows_processed"],
+        chunks=progress["chunks"],
+        updated_at=now,
+        finished_at=now if finished else None,
+    ))
+
+
+def run_backfill(engine: Engine, name: str, table, step: ChunkStep, key: str = "id",
+                 chunk_size: Optional[int] = None, pause_seconds: Optional[float] = None,
+                 target_seconds: Optional[float] = None, max_seconds: Optional[float] = None) -> dict:
+    """
+    Apply step to the whole table, one primary key chunk per transaction
+
+    Rows inserted after the backfill starts are left alone; the code that
+    inserts them is expected to fill the new data itself. Runs stopped by
+    max_seconds, an error or a restart continue from the last committed
+    chunk; a finished backfill is not run again unless reset.
+
+    Returns:
+        The backfill's checkpoint: last_key, rows_processed, chunks and finished_at
+    """
+    chunk_size = chunk_size or settings.BACKFILL_CHUNK_SIZE
+    pause_seconds = settings.BACKFILL_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+    target_seconds = target_seconds or settings.BACKFILL_CHUNK_TARGET_SECONDS
+    key_column = table.c[key]
+
+    with engine.begin() as connection:
+        progress = start_progress(connection, name, key_column)
+        ceiling = connection.execute(select(func.max(key_column))).scalar()
+        if progress["finished_at"] is None and (ceiling is None or progress["last_key"] >= ceiling):
+            save_progress(connection, progress, finished=True)
+            progress = load_progress(connection, name)
+    if progress["finished_at"] is not None:
+        logger.info("Backfill %s already finished (%d rows)", name, progress["rows_processed"])
+        return progress
+
+    logger.info("Backfill %s: %s keys %d to %d, chunks of %d", name, table.name,
+                progress["last_key"] + 1, ceiling, chunk_size)
+    started = time.monotonic()
+    start_key = progress["last_key"]
+    size = chunk_size
+    while True:
+        chunk_started = time.monotonic()
+        with engine.begin() as connection:
+            upper = chunk_upper_bound(connection, key_column, progress["last_key"], size)
+            upper = ceiling if upper is None else min(upper, ceiling)
+            rows = step(connection, progress["last_key"], upper)
+            progress["last_key"] = upper
+            progress["rows_processed"] += rows
+            progress["chunks"] += 1
+            finished = upper >= ceiling
+            save_progress(connection, progress, finished)
+        elapsed = time.monotonic() - chunk_started
+
+        running = time.monotonic() - started
+        keys_per_second = (upper - start_key) / running if running > 0 else 0.0
+        remaining = (ceiling - upper) / keys_per_second if keys_per_second else 0.0
+        logger.info(
+            "Backfill %s: key %d of %d (%.1f%%), %d rows changed, chunk of %d took %.2fs, about %.0fs left",
+            name, upper, ceiling, 100.0 * upper / ceiling if ceiling > 0 else 100.0,
+            progress["rows_processed"], size, elapsed, remaining,
+        )
+
+        if finished:
+            logger.info("Backfill %s finished: %d rows in %d chunks", name, progress["rows_processed"],
+                        progress["chunks"])
+            break
+        if max_seconds is not None and running >= max_seconds:
+            logger.info("Backfill %s stopped after %.0fs at key %d; run it again to resume",
+                        name, running, upper)
+            break
+
+        # Keep each chunk's locks short: halve slow chunks, grow back once fast again
+        if elapsed > target_seconds and size > 1:
+            size //= 2
+        elif elapsed < target_seconds / 2 and size < chunk_size:
+            size = min(size * 2, chunk_size)
+        time.sleep(pause_seconds)
+
+    with engine.connect() as connection:
+        return load_progress(connection, name)
+
+
+def reset_backfill(engine: Engine, name: str) -> None:
+    """Forget a backfill's checkpoint so its next run starts from the first row"""
+    with engine.begin() as connection:
+        connection.execute(delete(PROGRESS).where(PROGRESS.c.name == name))
+
+
+def require_backfilled(connection: Connection, name: str) -> None:
+    """
+    Fail unless the named backfill has finished
+
+    Contract revisions call this before adding constraints that every row
+    must already satisfy.
+    """
+    progress = load_progress(connection, name)
+    if progress is None or progress["finished_at"] is None:
+        raise RuntimeError(
+            f"Backfill {name} has not finished; run the revision that backfills it first"
+        )
+
+
+def backfill_in_migration(name: str, table, step: ChunkStep, **options) -> dict:
+    """
+    Run a backfill from an Alembic revision
+
+    The migration's transaction is committed first and the chunks run on
+    their own connections, so neither the preceding DDL nor the backfill
+    holds locks for longer than one chunk.
+    """
+    from alembic import op
+
+    if op.get_context().as_sql:
+        raise RuntimeError(f"Backfill {name} needs a database connection and cannot be rendered as SQL")
+    with op.get_context().autocommit_block():
+        return run_backfill(op.get_bind().engine, name, table, step, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the progress of data backfills")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url, **engine_options(args.database_url))
+    try:
+        with engine.connect() as connection:
+            rows = connection.execute(select(PROGRESS).order_by(PROGRESS.c.started_at)).mappings().all()
+    finally:
+        engine.dispose()
+
+    for row in rows:
+        state = f"finished {row['finished_at']:%Y-%m-%d %H:%M}" if row["finished_at"] else "in progress"
+        print(f"{row['name']:40} {state:28} last key {row['last_key']:>10}  "
+              f"{row['rows_processed']:>10} rows  {row['chunks']:>6} chunks")
+
+
+if __name__ == "__main__":
+    main()
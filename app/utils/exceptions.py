@@ -1,3 +1,4 @@
+from typing import Optional
 from fastapi import HTTPException, status
 
 
@@ -29,3 +30,30 @@ class ConflictException(HTTPException):
     """Exception for resource conflict"""
     def __init__(self, detail: str = "Resource conflict"):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class PreconditionFailedException(HTTPException):
+    """Exception for a failed If-Match precondition"""
+    def __init__(self, detail: str = "Precondition failed", etag: Optional[str] = None):
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail=detail,
+            headers={"ETag": etag} if etag else None
+        )
+
+
+class PreconditionRequiredException(HTTPException):
+    """Exception for a conditional request sent without its precondition"""
+    def __init__(self, detail: str = "Precondition required"):
+        super().__init__(status_code=status.HTTP_428_PRECONDITION_REQUIRED, detail=detail)
+
+
+class ServiceUnavailableException(HTTPException):
+    """Exception for temporarily rejected requests"""
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)}
+        )
+
@@ -0,0 +1,146 @@
+"""
+Sampling profiler for single requests
+
+A background thread samples the stacks of the threads registered for the
+profiled request every PROFILE_SAMPLE_INTERVAL_SECONDS and folds them
+into the collapsed-stack format read by flamegraph.pl, speedscope and
+similar tools: one `frame;frame;frame count` line per distinct stack,
+root first.
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Set
+from app.config import settings
+
+# File name pattern of stored profiles
+PROFILE_NAME = re.compile(r"^[\w.-]+\.folded$")
+
+
+class StackSampler:
+    """Periodically sample the stacks of registered threads"""
+
+    def __init__(self, interval: Optional[float] = None):
+        self.interval = interval or settings.PROFILE_SAMPLE_INTERVAL_SECONDS
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._threads: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def add_thread(self, ident: int) -> None:
+        self._threads.add(ident)
+
+    def remove_thread(self, ident: int) -> None:
+        self._threads.discard(ident)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self._threads:
+                continue
+            frames = sys._current_frames()
+            for ident in list(self._threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.counts[_fold(frame)] += 1
+                    self.samples += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks, heaviest first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+def _fold(frame) -> str:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+# Sampler of the current request, only set while it is being profiled
+active_sampler: ContextVar[Optional[StackSampler]] = ContextVar("active_sampler", default=None)
+
+
+@contextmanager
+def profiled_thread() -> Iterator[None]:
+    """Include the calling thread in the current request's profile, if any"""
+    sampler = active_sampler.get()
+    if sampler is None:
+        yield
+        return
+    ident = threading.get_ident()
+    sampler.add_thread(ident)
+    try:
+        yield
+    finally:
+        sampler.remove_thread(ident)
+
+
+class ProfileRateLimiter:
+    """Allow one profile at a time and at most one per min_interval seconds"""
+
+    def __init__(self, min_interval: float = settings.PROFILE_MIN_INTERVAL_SECONDS):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_started: Optional[float] = None
+
+    def try_acquire(self) -> Optional[float]:
+        """Reserve the profiler; returns None on success or seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            if self._running:
+                return self.min_interval
+            if self._last_started is not None and now - self._last_started < self.min_interval:
+                return self.min_interval - (now - self._last_started)
+            self._running = True
+            self._last_started = now
+            return None
+
+    def release(self) -> None:
+        with self._lock:
+            self._running = False
+
+
+def store_profile(folded: str, method: str, route: str, directory: Optional[str] = None) -> str:
+    """
+    Write a folded profile and prune the oldest beyond PROFILE_RETENTION
+
+    Returns:
+        File name of the stored profile
+    """
+    directory = directory or settings.PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    slug = re.sub(r"[^\w]+", "_", route).strip("_") or "root"
+    name = f"{stamp}-{method.lower()}-{slug}.folded"
+    with open(os.path.join(directory, name), "w", encoding="utf-8") as output:
+        output.write(folded)
+
+    stored = list_profiles(directory)
+    for old in stored[settings.PROFILE_RETENTION:]:
+        os.remove(os.path.join(directory, old))
+    return name
+
+
+def list_profiles(directory: Optional[str] = None) -> List[str]:
+    """Stored profile file names, newest first"""
+    directory = directory or settings.PROFILE_DIR
+    if not os.path.isdir(directory):
+        return []
+    return sorted((name for name in os.listdir(directory) if PROFILE_NAME.match(name)), reverse=True)
@@ -1,21 +1,33 @@
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 from app.config import settings
+from app.utils.tracing import traced
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# passlib and jose (which loads cryptography) are imported on first use
+# rather than with the application; together they are close to a tenth
+# of its import time. The startup warm-up loads them before the first request.
+
+
+@lru_cache(maxsize=None)
+def password_context() -> "CryptContext":
+    """Password hashing context, built on first use"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS)
 
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+    return password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -29,6 +41,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token string
     """
+    from jose import jwt
+
     to_encode = data.copy()
     
     if expires_delta:
@@ -42,6 +56,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+@traced("decode_access_token")
 def decode_access_token(token: str) -> Optional[dict]:
     """
     Decode and validate a JWT access token
@@ -52,8 +67,16 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token data or None if invalid
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
+
+
+def warm_up_security() -> None:
+    """Load the bcrypt backend and JWT signing code ahead of the first login"""
+    password_context().handler().get_backend()
+    decode_access_token(create_access_token(data={"sub": "warm-up"}))
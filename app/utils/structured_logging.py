@@ -0,0 +1,92 @@
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, TextIO
+
+# Logger receiving one record per request; see app.middleware.access_log
+ACCESS_LOGGER = "app.access"
+
+# Running queue listeners by logger name
+_listeners: Dict[str, QueueListener] = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as one JSON object per line, merging its `fields` extra"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        else:
+            entry["message"] = record.getMessage()
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue records without formatting them
+
+    The stock QueueHandler formats the message in the calling thread;
+    here all formatting happens on the listener thread, so the request
+    path only pays for an enqueue.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def attach_queue_handler(logger_name: str, output: logging.Handler) -> None:
+    """Send a logger's records through a queue to output, formatted on the listener thread"""
+    if logger_name in _listeners:
+        return
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    _listeners[logger_name] = listener
+
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(DeferredQueueHandler(records))
+
+
+def is_attached(logger_name: str) -> bool:
+    """Whether a logger currently has a running queue listener"""
+    return logger_name in _listeners
+
+
+def detach_queue_handler(logger_name: str) -> None:
+    """Flush a logger's queued records and detach its queue handler"""
+    listener = _listeners.pop(logger_name, None)
+    if listener is None:
+        return
+
+    logger = logging.getLogger(logger_name)
+    for handler in [h for h in logger.handlers if isinstance(h, DeferredQueueHandler)]:
+        logger.removeHandler(handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def configure_access_logging(stream: Optional[TextIO] = None) -> None:
+    """Route the access logger through a queue to a JSON handler on stream (stdout by default)"""
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    attach_queue_handler(ACCESS_LOGGER, output)
+
+
+def shutdown_access_logging() -> None:
+    """Flush queued access log records and detach the queue handler"""
+    detach_queue_handler(ACCESS_LOGGER)
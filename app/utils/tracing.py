@@ -0,0 +1,335 @@
+"""
+Lightweight request tracing with OTLP-compatible JSON export
+
+Traces are sampled at the head: the decision is made once when a request
+arrives (or, with TRACE_TRUST_PARENT_SAMPLING, taken from an incoming W3C
+`traceparent` header) and every
+span helper is a no-op for unsampled requests. Finished traces are
+written as one OTLP/JSON `ExportTraceServiceRequest` per line, to a file
+or stdout, through the same queue listener used for access logs, so no
+collector is needed and serialization stays off the request path.
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.utils.profiling import profiled_thread
+from app.utils.structured_logging import attach_queue_handler, detach_queue_handler, is_attached
+
+# Logger carrying finished traces to the exporter
+TRACE_LOGGER = "app.traces"
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+# Longest SQL statement text recorded on a span
+MAX_STATEMENT_LENGTH = 1000
+
+trace_logger = logging.getLogger(TRACE_LOGGER)
+
+_NO_SPAN = nullcontext()
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+class Span:
+    """Timed operation within a trace"""
+
+    __slots__ = ("name", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent_id: Optional[str], kind: int = SPAN_KIND_INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None, start_ns: Optional[int] = None):
+        self.name = name
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = start_ns or time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error = False
+
+    def end(self, end_ns: Optional[int] = None) -> None:
+        self.end_ns = end_ns or time.time_ns()
+
+
+class Trace:
+    """Spans recorded for one sampled request"""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or _new_id(128)
+        self.spans: List[Span] = []
+        # Set when the endpoint returns; the rest of the route handler is serialization
+        self.endpoint_returned_ns: Optional[int] = None
+
+    def start_span(self, name: str, parent_id: Optional[str], kind: int = SPAN_KIND_INTERNAL,
+                   attributes: Optional[Dict[str, Any]] = None, start_ns: Optional[int] = None) -> Span:
+        span = Span(name, parent_id, kind, attributes, start_ns)
+        self.spans.append(span)
+        return span
+
+
+# Trace of the current request, only set when it is sampled
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+# Innermost open span, parent of the next one
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: str):
+    """
+    Parse a W3C traceparent header
+
+    Returns:
+        (trace_id, parent_span_id, sampled), or None if the header is malformed
+    """
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+def should_sample(traceparent: Optional[str]):
+    """
+    Make the head sampling decision for a request
+
+    An incoming traceparent names the caller's trace, which a sampled
+    request continues. Its sampled flag only decides when
+    TRACE_TRUST_PARENT_SAMPLING is set, i.e. when the header comes from a
+    trusted proxy or service; otherwise any client could force every
+    request to be traced, so TRACE_SAMPLE_RATE applies.
+
+    Returns:
+        (sampled, trace_id, parent_span_id)
+    """
+    parent = parse_traceparent(traceparent) if traceparent else None
+    if parent is not None and settings.TRACE_TRUST_PARENT_SAMPLING:
+        trace_id, parent_id, sampled = parent
+        return sampled, trace_id, parent_id
+    rate = settings.TRACE_SAMPLE_RATE
+    sampled = rate >= 1 or random.random() < rate
+    if parent is not None:
+        return sampled, parent[0], parent[1]
+    return sampled, None, None
+
+
+@contextmanager
+def _span(trace: Trace, name: str, attributes: Optional[Dict[str, Any]]):
+    parent = current_span.get()
+    span = trace.start_span(name, parent.span_id if parent else None, attributes=attributes)
+    token = current_span.set(span)
+    try:
+        yield span
+    except Exception as exc:
+        span.error = True
+        span.attributes["error.type"] = type(exc).__name__
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+def span(name: str, **attributes):
+    """Context manager timing a block as a child of the current span; no-op when not sampled"""
+    trace = current_trace.get()
+    if trace is None:
+        return _NO_SPAN
+    return _span(trace, name, attributes)
+
+
+def traced(name: str):
+    """Decorate a function so each call is a span; keeps the signature for FastAPI dependencies"""
+    def decorate(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _mark_endpoint_returned() -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.endpoint_returned_ns = time.time_ns()
+
+
+def _wrap_endpoint(endpoint: Callable) -> Callable:
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_endpoint(*args, **kwargs):
+            with profiled_thread():
+                result = await endpoint(*args, **kwargs)
+            _mark_endpoint_returned()
+            return result
+        return async_endpoint
+
+    @functools.wraps(endpoint)
+    def sync_endpoint(*args, **kwargs):
+        with profiled_thread():
+            result = endpoint(*args, **kwargs)
+        _mark_endpoint_returned()
+        return result
+    return sync_endpoint
+
+
+class TracedRoute(APIRoute):
+    """
+    API route recording a `serialize_response` span
+
+    FastAPI validates and serializes the endpoint's return value inside the
+    route handler; the span covers the time from the endpoint returning to
+    the handler producing the response. The endpoint's thread is also
+    registered with the request's profiler, if one is running.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _wrap_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            response = await handler(request)
+            trace = current_trace.get()
+            if trace is not None and trace.endpoint_returned_ns is not None:
+                parent = current_span.get()
+                trace.start_span(
+                    "serialize_response", parent.span_id if parent else None,
+                    start_ns=trace.endpoint_returned_ns
+                ).end()
+                trace.endpoint_returned_ns = None
+            return response
+
+        return traced_handler
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany):
+    trace = current_trace.get()
+    if trace is None:
+        return
+    parent = current_span.get()
+    conn.info.setdefault("trace_spans", []).append(trace.start_span(
+        "db.query", parent.span_id if parent else None, SPAN_KIND_CLIENT,
+        {"db.system.name": conn.dialect.name, "db.query.text": statement[:MAX_STATEMENT_LENGTH]}
+    ))
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("trace_spans")
+    if spans and current_trace.get() is not None:
+        spans.pop().end()
+
+
+@event.listens_for(Engine, "handle_error")
+def _fail_statement_span(context):
+    spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+    if spans and current_trace.get() is not None:
+        failed = spans.pop()
+        failed.error = True
+        failed.attributes["error.type"] = type(context.original_exception).__name__
+        failed.end()
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def to_otlp(trace: Trace, service_name: str) -> dict:
+    """Render a trace as an OTLP/JSON ExportTraceServiceRequest"""
+    spans = []
+    for recorded in trace.spans:
+        span_json = {
+            "traceId": trace.trace_id,
+            "spanId": recorded.span_id,
+            "name": recorded.name,
+            "kind": recorded.kind,
+            "startTimeUnixNano": str(recorded.start_ns),
+            "endTimeUnixNano": str(recorded.end_ns or recorded.start_ns),
+            "attributes": _otlp_attributes(recorded.attributes),
+            "status": {"code": STATUS_CODE_ERROR} if recorded.error else {},
+        }
+        if recorded.parent_id:
+            span_json["parentSpanId"] = recorded.parent_id
+        spans.append(span_json)
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+        "scopeSpans": [{"scope": {"name": "app.utils.tracing"}, "spans": spans}],
+    }]}
+
+
+class OtlpJsonFormatter(logging.Formatter):
+    """Format trace records as single-line OTLP/JSON"""
+
+    def __init__(self, service_name: str):
+        super().__init__()
+        self.service_name = service_name
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(to_otlp(record.trace, self.service_name), separators=(",", ":"))
+
+
+def export_trace(trace: Trace) -> None:
+    """Queue a finished trace for export"""
+    trace_logger.info("trace", extra={"trace": trace})
+
+
+def export_enabled() -> bool:
+    """Whether traces are being exported; when not, nothing is sampled"""
+    return is_attached(TRACE_LOGGER)
+
+
+def configure_trace_export(target: str = settings.TRACE_EXPORT) -> None:
+    """Export traces to target: "stdout", a file path, or "" to disable"""
+    if not target:
+        return
+    if target == "stdout":
+        output: logging.Handler = logging.StreamHandler(sys.stdout)
+    else:
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        output = logging.FileHandler(target, encoding="utf-8")
+    output.setFormatter(OtlpJsonFormatter(settings.TRACE_SERVICE_NAME))
+    attach_queue_handler(TRACE_LOGGER, output)
+
+
+def shutdown_trace_export() -> None:
+    """Flush queued traces and close the export target"""
+    detach_queue_handler(TRACE_LOGGER)
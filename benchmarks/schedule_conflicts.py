@@ -0,0 +1,93 @@
+"""
+Benchmark schedule-conflict detection for students with many enrollments
+
+Compares the indexed SQL overlap query used by enrollment against loading
+every meeting of every enrolled course and scanning them in Python.
+
+    python -m benchmarks.schedule_conflicts [--enrollments 50 200 1000] [--repeat 200]
+"""
+import argparse
+import random
+import time
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models.user import User, UserRole
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.meeting import CourseMeeting
+from app.services.schedule import find_schedule_conflicts
+
+
+def build_database(enrollment_count: int, seed: int = 42):
+    """Create an in-memory database with one student holding many enrollments"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    rng = random.Random(seed)
+
+    student = User(name="Bench Student", email="bench@test.com", hashed_password="x", role=UserRole.STUDENT)
+    db.add(student)
+
+    course_rows = [
+        {"title": f"Course {i}", "code": f"B{i:05d}", "capacity": 10_000, "is_active": True,
+         "admission_queue_enabled": False}
+        for i in range(enrollment_count + 1)
+    ]
+    db.execute(Course.__table__.insert(), course_rows)
+    db.flush()
+    course_ids = [row.id for row in db.query(Course.id).order_by(Course.id)]
+
+    meeting_rows = []
+    for course_id in course_ids:
+        for _ in range(3):
+            start = rng.randrange(8 * 60, 20 * 60, 5)
+            meeting_rows.append({"course_id": course_id, "day_of_week": rng.randrange(7),
+                                 "start_minute": start, "end_minute": start + rng.choice([50, 75, 110])})
+    db.execute(CourseMeeting.__table__.insert(), meeting_rows)
+    db.execute(Enrollment.__table__.insert(), [
+        {"user_id": student.id, "course_id": course_id} for course_id in course_ids[:-1]
+    ])
+    db.commit()
+    return db, student.id, course_ids[-1]
+
+
+def naive_conflicts(db, user_id: int, course_id: int):
+    """Load the whole timetable and compare every pair of slots in Python"""
+    candidate = db.query(CourseMeeting).filter(CourseMeeting.course_id == course_id).all()
+    enrolled = db.query(CourseMeeting).join(
+        Enrollment, Enrollment.course_id == CourseMeeting.course_id
+    ).filter(Enrollment.user_id == user_id).all()
+    return [
+        (new.course_id, old.course_id)
+        for new in candidate
+        for old in enrolled
+        if new.day_of_week == old.day_of_week and old.start_minute < new.end_minute and new.start_minute < old.end_minute
+    ]
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--enrollments", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'enrollments':>12} {'sql ms':>10} {'python ms':>10}")
+    for count in args.enrollments:
+        db, user_id, course_id = build_database(count)
+        sql_ms = timed(lambda: find_schedule_conflicts(db, user_id, [course_id]), args.repeat)
+        naive_ms = timed(lambda: naive_conflicts(db, user_id, course_id), args.repeat)
+        print(f"{count:>12} {sql_ms:>10.3f} {naive_ms:>10.3f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark the cold import time of the application
+
+Imports app.main in fresh interpreters, reports the median import time
+and module count, and lists the slowest imports that the application
+triggers directly (from `python -X importtime`), which is where deferring
+an import pays off.
+
+    python -m benchmarks.startup [--runs 5] [--top 15]
+
+tests/test_startup.py holds the regression budget.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+MEASURE_IMPORT = """
+import sys, time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started, len(sys.modules))
+"""
+
+
+def measure_import() -> Tuple[float, int]:
+    """Import app.main in a fresh interpreter; returns seconds and loaded module count"""
+    output = subprocess.run([sys.executable, "-c", MEASURE_IMPORT], capture_output=True, text=True, check=True)
+    seconds, modules = output.stdout.split()
+    return float(seconds), int(modules)
+
+
+def slowest_imports(top: int) -> List[Tuple[float, str, str]]:
+    """
+    Cumulative time of the packages imported directly by application modules
+
+    Returns (milliseconds, package, importing app module) tuples, slowest first.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, check=True,
+    )
+    # importtime prints children before their parent, indented two spaces per level
+    entries = []
+    for line in output.stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(cumulative) / 1000, name.strip()))
+
+    results = []
+    for index, (depth, milliseconds, name) in enumerate(entries):
+        if name.startswith("app"):
+            continue
+        parent = next((entry[2] for entry in entries[index + 1:] if entry[0] < depth), None)
+        if parent is not None and parent.startswith("app"):
+            results.append((milliseconds, name, parent))
+    results.sort(reverse=True)
+    return results[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cold import time of app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [measure_import() for _ in range(args.runs)]
+    seconds = [run[0] for run in runs]
+    print(
+        f"import app.main: median {statistics.median(seconds) * 1000:.0f} ms, "
+        f"min {min(seconds) * 1000:.0f} ms over {args.runs} runs, {runs[0][1]} modules"
+    )
+    print("\nSlowest imports triggered by application modules:")
+    for milliseconds, name, parent in slowest_imports(args.top):
+        print(f"{milliseconds:8.1f} ms  {name:40} from {parent}")
+
+
+if __name__ == "__main__":
+    main()
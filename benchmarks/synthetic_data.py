@@ -0,0 +1,262 @@
+"""
+Generate synthetic users, courses and enrollments for scale testing
+
+Rows are written with batched Core inserts, so millions of rows take
+minutes rather than hours. Course popularity follows a Zipf distribution:
+a handful of courses draw most enrollments and fill up, while the long
+tail stays mostly empty. Output depends only on the seed and the ids
+already in the database (apart from the salt of the shared password
+hash), so a benchmark can rebuild the same data set.
+
+    python -m benchmarks.synthetic_data --users 100000 --courses 2000 --enrollments 400000 \\
+        [--seed 42] [--popularity 1.1] [--batch-size 10000] [--database-url URL] [--create-schema]
+
+Every generated user can log in with the password "password123". The
+per-course and daily enrollment rollups are written alongside the
+enrollments, since Core inserts bypass the ORM hooks that maintain them.
+"""
+import argparse
+import bisect
+import itertools
+import logging
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.engine import Connection
+from app.config import settings
+from app.database import Base, engine_options
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.enrollment_stats import CourseEnrollmentStats, DailyEnrollmentStats, upsert_increment
+from app.models.user import User, UserRole
+from app.utils.security import hash_password
+
+logger = logging.getLogger(__name__)
+
+PASSWORD = "password123"
+
+# Enrollment timestamps fall in the ENROLLMENT_DAYS days before AS_OF;
+# fixed rather than today so the data set does not change from day to day
+AS_OF = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ENROLLMENT_DAYS = 120
+
+INACTIVE_USER_RATE = 0.02
+INACTIVE_COURSE_RATE = 0.05
+ADMISSION_QUEUE_RATE = 0.01
+
+SUBJECTS = [
+    "Algorithms", "Biology", "Calculus", "Chemistry", "Databases", "Economics", "Ethics", "French",
+    "Geometry", "History", "Linguistics", "Machine Learning", "Networks", "Philosophy", "Physics",
+    "Psychology", "Statistics", "Writing",
+]
+LEVELS = ["Foundations of", "Introduction to", "Topics in", "Advanced", "Seminar in"]
+FIRST_NAMES = ["Ada", "Ben", "Chioma", "Dana", "Emeka", "Fatima", "Grace", "Hiro", "Ines", "Kofi", "Lena", "Musa"]
+LAST_NAMES = ["Adeyemi", "Brown", "Chen", "Diallo", "Evans", "Garcia", "Ivanova", "Kim", "Mensah", "Okafor"]
+
+
+def next_id(connection: Connection, table) -> int:
+    """First id after the rows already in a table"""
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def insert_batches(connection: Connection, table, rows: Iterable[dict], batch_size: int) -> int:
+    """Insert rows with one executemany per batch; returns how many were inserted"""
+    inserted = 0
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return inserted
+        connection.execute(table.insert(), batch)
+        inserted += len(batch)
+
+
+def zipf_cumulative_weights(count: int, exponent: float, rng: random.Random) -> List[float]:
+    """
+    Cumulative Zipf weights over count items in shuffled order
+
+    The item at popularity rank r gets weight 1 / r ** exponent; shuffling
+    keeps the most popular courses from simply being the lowest ids.
+    """
+    weights = [1 / rank ** exponent for rank in range(1, count + 1)]
+    rng.shuffle(weights)
+    return list(itertools.accumulate(weights))
+
+
+def generate_users(first_id: int, count: int, password_hash: str, rng: random.Random) -> Iterator[dict]:
+    for user_id in range(first_id, first_id + count):
+        yield {
+            "id": user_id,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "email": f"user{user_id}@example.test",
+            "hashed_password": password_hash,
+            "role": UserRole.STUDENT,
+            "is_active": rng.random() >= INACTIVE_USER_RATE,
+        }
+
+
+def generate_courses(first_id: int, capacities: List[int], rng: random.Random) -> Iterator[dict]:
+    for offset, capacity in enumerate(capacities):
+        course_id = first_id + offset
+        yield {
+            "id": course_id,
+            "title": f"{rng.choice(LEVELS)} {rng.choice(SUBJECTS)} {course_id}",
+            "code": f"SYN{course_id:07d}",
+            "capacity": capacity,
+            "is_active": rng.random() >= INACTIVE_COURSE_RATE,
+            "admission_queue_enabled": rng.random() < ADMISSION_QUEUE_RATE,
+        }
+
+
+def course_capacities(cumulative: List[float], enrollments: int, rng: random.Random) -> List[int]:
+    """
+    Capacity of each course: 0.7 to 2 times its expected demand, at least 20 to 60 seats
+
+    Roughly a quarter of the courses in demand end up oversubscribed and
+    full; their overflow spills to the next pick, as it does for students
+    in the real catalog.
+    """
+    total = cumulative[-1]
+    capacities = []
+    previous = 0.0
+    for running in cumulative:
+        demand = enrollments * (running - previous) / total
+        previous = running
+        capacities.append(max(rng.randint(20, 60), int(demand * rng.uniform(0.7, 2.0))))
+    return capacities
+
+
+def generate_enrollments(user_ids: range, course_ids: List[int], cumulative: List[float],
+                         capacities: List[int], enrollments: int, rng: random.Random,
+                         enrolled: Counter) -> Iterator[dict]:
+    """
+    About `enrollments` enrollments spread over the users, courses picked by popularity
+
+    Each user takes between 0 and twice the average number of courses, all
+    distinct; full courses are skipped. enrolled is filled with the
+    per-course counts as rows are produced.
+    """
+    average = enrollments / max(len(user_ids), 1)
+    total_weight = cumulative[-1]
+    first_day = AS_OF - timedelta(days=ENROLLMENT_DAYS)
+    for user_id in user_ids:
+        wanted = min(int(rng.uniform(0, 2 * average) + 0.5), len(course_ids))
+        chosen = set()
+        for _ in range(wanted * 4):
+            if len(chosen) == wanted:
+                break
+            index = bisect.bisect(cumulative, rng.random() * total_weight)
+            index = min(index, len(course_ids) - 1)
+            if index in chosen or enrolled[course_ids[index]] >= capacities[index]:
+                continue
+            chosen.add(index)
+            enrolled[course_ids[index]] += 1
+            yield {
+                "user_id": user_id,
+                "course_id": course_ids[index],
+                "created_at": first_day + timedelta(seconds=rng.randrange(ENROLLMENT_DAYS * 86400)),
+            }
+
+
+def write_rollups(connection: Connection, enrolled: Counter, daily: Counter, batch_size: int) -> None:
+    """Write the enrollment rollups of the generated courses and add the daily counts"""
+    insert_batches(connection, CourseEnrollmentStats.__table__, (
+        {"course_id": course_id, "enrolled_count": count, "total_enrollments": count, "total_drops": 0}
+        for course_id, count in enrolled.items()
+    ), batch_size)
+    for day, count in sorted(daily.items()):
+        upsert_increment(connection, DailyEnrollmentStats.__table__, {"day": day}, {"enrollments": count, "drops": 0})
+
+
+def reset_sequences(connection: Connection) -> None:
+    """Move PostgreSQL id sequences past the explicitly inserted ids"""
+    if connection.dialect.name != "postgresql":
+        return
+    for table in (User.__table__, Course.__table__, Enrollment.__table__):
+        connection.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table.name}), false)"
+        ))
+
+
+def generate(connection: Connection, users: int, courses: int, enrollments: int, seed: int = 42,
+             popularity: float = 1.1, batch_size: int = 10_000) -> Dict[str, int]:
+    """
+    Insert the synthetic data set in the connection's transaction
+
+    Returns:
+        Number of rows inserted per table
+    """
+    rng = random.Random(seed)
+    password_hash = hash_password(PASSWORD)
+    first_user_id = next_id(connection, User.__table__)
+    first_course_id = next_id(connection, Course.__table__)
+
+    inserted_users = insert_batches(
+        connection, User.__table__, generate_users(first_user_id, users, password_hash, rng), batch_size
+    )
+
+    cumulative = zipf_cumulative_weights(courses, popularity, rng)
+    capacities = course_capacities(cumulative, enrollments, rng)
+    course_rows = list(generate_courses(first_course_id, capacities, rng))
+    insert_batches(connection, Course.__table__, course_rows, batch_size)
+
+    # Inactive courses take no enrollments
+    for index, row in enumerate(course_rows):
+        if not row["is_active"]:
+            capacities[index] = 0
+
+    enrolled: Counter = Counter()
+    daily: Counter = Counter()
+
+    def counted(rows):
+        for row in rows:
+            daily[row["created_at"].date()] += 1
+            yield row
+
+    inserted_enrollments = insert_batches(connection, Enrollment.__table__, counted(generate_enrollments(
+        range(first_user_id, first_user_id + users), [row["id"] for row in course_rows],
+        cumulative, capacities, enrollments, rng, enrolled,
+    )), batch_size)
+
+    write_rollups(connection, enrolled, daily, batch_size)
+    reset_sequences(connection)
+    return {"users": inserted_users, "courses": len(course_rows), "enrollments": inserted_enrollments}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic users, courses and enrollments")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--courses", type=int, default=500)
+    parser.add_argument("--enrollments", type=int, default=40_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--popularity", type=float, default=1.1,
+                        help="Zipf exponent of course popularity; 0 spreads enrollments evenly")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--create-schema", action="store_true", help="Create missing tables first")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    engine = create_engine(args.database_url, **engine_options(args.database_url))
+    if args.create_schema:
+        Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        counts = generate(connection, args.users, args.courses, args.enrollments, args.seed,
+                          args.popularity, args.batch_size)
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    rows = sum(counts.values())
+    logger.info(
+        "Inserted %s in %.1fs (%.0f rows/s)",
+        ", ".join(f"{count} {table}" for table, count in counts.items()), elapsed, rows / elapsed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark HTTP throughput of the single-process and multi-worker launch modes
+
+Starts the API against a seeded SQLite file database, first as one
+uvicorn process and then under gunicorn with each requested worker count,
+and drives it with concurrent clients cycling through the course list,
+a course's details and the authenticated profile.
+
+    python -m benchmarks.throughput [--workers 1 2 4] [--concurrency 16] [--duration 10]
+
+The load generator shares the machine with the server, so results are
+only comparable between modes measured in the same run.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+import httpx
+from sqlalchemy import create_engine
+from app.database import Base
+from app.models.course import Course
+from app.models.user import User, UserRole
+from app.utils.security import create_access_token
+
+STUDENT_EMAIL = "bench@test.com"
+
+
+def seed_database(path: str, course_count: int) -> None:
+    """Create the schema, one student and course_count courses"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [{
+            "name": "Bench Student", "email": STUDENT_EMAIL, "hashed_password": "x",
+            "role": UserRole.STUDENT, "is_active": True,
+        }])
+        conn.execute(Course.__table__.insert(), [
+            {"title": f"Course {i}", "code": f"B{i:05d}", "capacity": 100, "is_active": True,
+             "admission_queue_enabled": False}
+            for i in range(course_count)
+        ])
+    engine.dispose()
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(workers: int, port: int, database_path: str) -> subprocess.Popen:
+    """Start one uvicorn process (workers=0) or gunicorn with that many workers"""
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database_path}",
+        "ACCESS_LOG_ENABLED": "false",
+        "JOB_WORKERS": "0",
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(max(workers, 1)),
+    }
+    if workers == 0:
+        command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    else:
+        command = [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py", "--log-level", "warning"]
+    server = subprocess.Popen(command, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/live").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+async def drive(base_url: str, token: str, concurrency: int, duration: float, course_count: int) -> List[float]:
+    """Send requests from concurrency clients for duration seconds; returns latencies"""
+    paths = ["/courses", "/users/me"] + [f"/courses/{course_id}" for course_id in range(1, course_count + 1, 7)]
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: List[float] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits) as client:
+        async def client_loop(offset: int):
+            deadline = time.monotonic() + duration
+            index = offset
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get(paths[index % len(paths)])
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+                index += 1
+
+        await asyncio.gather(*(client_loop(offset) for offset in range(concurrency)))
+    return latencies
+
+
+def run(workers: int, args, database_path: str, token: str) -> None:
+    port = free_port()
+    server = start_server(workers, port, database_path)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(drive(base_url, token, args.concurrency, 1.0, args.courses))
+        latencies = asyncio.run(drive(base_url, token, args.concurrency, args.duration, args.courses))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    label = "uvicorn (1 process)" if workers == 0 else f"gunicorn, {workers} worker{'s' * (workers > 1)}"
+    print(
+        f"{label:24} {len(latencies) / args.duration:9.0f} req/s"
+        f"   p50 {statistics.median(latencies) * 1000:7.1f} ms"
+        f"   p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark single-process and multi-worker throughput")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--courses", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_path = os.path.join(directory, "bench.db")
+        seed_database(database_path, args.courses)
+        token = create_access_token(data={"sub": STUDENT_EMAIL})
+        print(f"{os.cpu_count()} CPUs, {args.concurrency} concurrent clients, {args.duration:.0f}s per mode")
+        for workers in [0, *args.workers]:
+            run(workers, args, database_path, token)
+
+
+if __name__ == "__main__":
+    main()
@@ -43,12 +43,20 @@ const AdminDashboard = () => {
         }
     };
 
-    const toggleStatus = async (id, currentStatus) => {
+    const toggleStatus = async (id, currentStatus, version) => {
         try {
-            // Send is_active as query parameter
-            await api.patch(`/courses/${id}/activate?is_active=${!currentStatus}`);
+            // Send is_active as query parameter; If-Match rejects the change (412)
+            // if another admin edited the course since the list was loaded
+            await api.patch(`/courses/${id}/activate?is_active=${!currentStatus}`, null, {
+                headers: { 'If-Match': `"${version}"` }
+            });
             fetchData();
         } catch (error) {
+            if (error.response?.status === 412) {
+                alert('This course was changed by someone else; the list has been refreshed.');
+                fetchData();
+                return;
+            }
             alert('Failed to update status: ' + (error.response?.data?.detail || error.message));
         }
     };
@@ -137,7 +145,7 @@ const AdminDashboard = () => {
                                         </span>
                                     </td>
                                     <td style={{ padding: '0.75rem' }}>
-                                        <button onClick={() => toggleStatus(course.id, course.is_active)} className="btn btn-secondary" style={{ padding: '0.25rem 0.5rem', fontSize: '0.8rem' }}>
+                                        <button onClick={() => toggleStatus(course.id, course.is_active, course.version)} className="btn btn-secondary" style={{ padding: '0.25rem 0.5rem', fontSize: '0.8rem' }}>
                                             {course.is_active ? 'Désactiver' : 'Activer'}
                                         </button>
                                     </td>
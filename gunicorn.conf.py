@@ -0,0 +1,38 @@
+"""
+Gunicorn settings for the multi-worker launch mode
+
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Workers run uvicorn's event loop (uvicorn-worker). The application is
+imported once in the master and forked into the workers; each worker's
+lifespan then opens its own database pool and cache connections and
+warms its caches (see app.server). Worker count and recycling are set by
+WEB_CONCURRENCY / WEB_WORKERS and WORKER_MAX_REQUESTS in app.config.
+
+With several workers the master warns that the admission queue, whose
+state lives in each process, is unavailable (see
+app.server.check_worker_settings).
+"""
+import os
+from app.config import settings
+from app.server import check_worker_settings, worker_count
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = worker_count()
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+# Recycle workers to bound memory growth, staggered so they do not restart together
+max_requests = settings.WORKER_MAX_REQUESTS
+max_requests_jitter = settings.WORKER_MAX_REQUESTS_JITTER
+graceful_timeout = settings.WORKER_GRACEFUL_TIMEOUT_SECONDS
+
+# Requests are logged by the application (app.access)
+accesslog = None
+errorlog = "-"
+
+
+def on_starting(server):
+    # Runs in the master before the fork; the workers inherit the environment
+    os.environ["SERVER_WORKERS"] = str(server.cfg.workers)
+    check_worker_settings(server.cfg.workers)
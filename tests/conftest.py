@@ -1,35 +1,131 @@
+import os
+from typing import Optional
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, engine_options
 from app.models.user import User, UserRole
 from app.models.course import Course
+from app.config import settings
+from app.services.cache import cache
 from app.utils.security import hash_password, create_access_token
 
-# Create in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Tests drive the job worker pool and warm-up explicitly instead of from the app lifespan
+settings.JOB_WORKERS = 0
+settings.WARM_UP_ON_STARTUP = False
+# Cheapest bcrypt cost; hashing is not under test and dominated fixture setup at cost 12
+settings.PASSWORD_HASH_ROUNDS = 4
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+# Hash of "password123" shared by the user fixtures
+PASSWORD_HASH = hash_password("password123")
+
+
+def worker_database_url(url: str, worker: Optional[str]) -> str:
+    """
+    Database of one pytest-xdist worker (`pytest -n auto`)
+
+    In-memory SQLite is private to each process already; for any other
+    database the worker id is appended to the database name, e.g.
+    test.db -> test_gw0.db. Server databases must exist beforehand.
+    """
+    parsed = make_url(url)
+    if not worker or parsed.database in (None, "", ":memory:"):
+        return url
+    stem, extension = os.path.splitext(parsed.database) if parsed.get_backend_name() == "sqlite" else (parsed.database, "")
+    return parsed.set(database=f"{stem}_{worker}{extension}").render_as_string(hide_password=False)
+
+
+# In-memory SQLite unless TEST_DATABASE_URL points elsewhere
+SQLALCHEMY_DATABASE_URL = worker_database_url(
+    os.environ.get("TEST_DATABASE_URL", "sqlite:///:memory:"), os.environ.get("PYTEST_XDIST_WORKER")
+)
+
+if make_url(SQLALCHEMY_DATABASE_URL).database in (None, "", ":memory:"):
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+else:
+    engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+
+# Sessions join the test's transaction through a SAVEPOINT, so their
+# commits and rollbacks stay inside it (see db_session)
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, join_transaction_mode="create_savepoint"
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test"""
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "commits: sessions commit for real, e.g. from several worker threads at once; "
+        "tables are emptied after the test instead of rolled back",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty shared cache; ids are reused across test databases"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(scope="session")
+def database_schema():
+    """Create the schema once per test session (per worker when run in parallel)"""
     Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(request, database_schema):
+    """
+    Session inside a transaction that is rolled back after the test
+
+    Every session made by TestingSessionLocal during the test (job
+    workers, admission queue, webhook dispatcher) joins the same
+    transaction through a SAVEPOINT, so each test starts from empty
+    tables. Sessions on one connection must take turns; tests that use
+    several at once, or connect to the engine directly, are marked
+    `commits` and clean up by deleting rows instead.
+    """
+    if request.node.get_closest_marker("commits"):
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+            with engine.begin() as connection:
+                for table in reversed(Base.metadata.sorted_tables):
+                    connection.execute(table.delete())
+        return
+
+    connection = engine.connect()
+    sqlite = engine.dialect.name == "sqlite"
+    if sqlite:
+        # pysqlite defers BEGIN and mishandles SAVEPOINT; issue BEGIN ourselves
+        connection.connection.dbapi_connection.isolation_level = None
+    transaction = connection.begin()
+    if sqlite:
+        connection.exec_driver_sql("BEGIN")
+    TestingSessionLocal.configure(bind=connection)
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        TestingSessionLocal.configure(bind=engine)
+        transaction.rollback()
+        if sqlite:
+            connection.connection.dbapi_connection.isolation_level = ""
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -53,7 +149,7 @@ def student_user(db_session):
     user = User(
         name="Test Student",
         email="student@test.com",
-        hashed_password=hash_password("password123"),
+        hashed_password=PASSWORD_HASH,
         role=UserRole.STUDENT,
         is_active=True
     )
@@ -69,7 +165,7 @@ def admin_user(db_session):
     user = User(
         name="Test Admin",
         email="admin@test.com",
-        hashed_password=hash_password("password123"),
+        hashed_password=PASSWORD_HASH,
         role=UserRole.ADMIN,
         is_active=True
     )
@@ -85,7 +181,7 @@ def inactive_user(db_session):
     user = User(
         name="Inactive User",
         email="inactive@test.com",
-        hashed_password=hash_password("password123"),
+        hashed_password=PASSWORD_HASH,
         role=UserRole.STUDENT,
         is_active=False
     )
@@ -158,3 +254,45 @@ def full_course(db_session, student_user):
     db_session.commit()
     
     return course
+
+
+@pytest.fixture
+def admission_course(db_session, monkeypatch):
+    """Create an active course in admission mode, processed against the test database"""
+    from app.services.admission import admission_queue
+    
+    monkeypatch.setattr(admission_queue, "session_factory", TestingSessionLocal)
+    
+    course = Course(
+        title="Machine Learning",
+        code="CS501",
+        capacity=1,
+        is_active=True,
+        admission_queue_enabled=True
+    )
+    db_session.add(course)
+    db_session.commit()
+    db_session.refresh(course)
+    return course
+
+
+@pytest.fixture
+def second_student(db_session):
+    """Create a second test student user"""
+    user = User(
+        name="Second Student",
+        email="second@test.com",
+        hashed_password=PASSWORD_HASH,
+        role=UserRole.STUDENT,
+        is_active=True
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def second_student_token(second_student):
+    """Create a JWT token for the second student user"""
+    return create_access_token(data={"sub": second_student.email})
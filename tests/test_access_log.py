@@ -0,0 +1,94 @@
+import io
+import json
+import logging
+import pytest
+from fastapi import status
+from app.config import settings
+from app.middleware.access_log import should_log
+from app.utils.structured_logging import (
+    ACCESS_LOGGER, JsonFormatter, configure_access_logging, shutdown_access_logging
+)
+
+
+class ListHandler(logging.Handler):
+    """Collect access log records"""
+    
+    def __init__(self):
+        super().__init__()
+        self.records = []
+    
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_records(monkeypatch):
+    """Log every request and capture the entries"""
+    monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 1.0)
+    handler = ListHandler()
+    logger = logging.getLogger(ACCESS_LOGGER)
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+
+
+class TestAccessLog:
+    """Test structured access logging"""
+    
+    def test_entry_fields(self, client, student_token, student_user, sample_course, access_records):
+        """Test that an entry has the route template, timing, queries and user"""
+        response = client.get(
+            f"/courses/{sample_course.id}/meetings",
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        fields = access_records[-1].fields
+        assert fields["route"] == "/courses/{course_id}/meetings"
+        assert fields["status"] == 200
+        assert fields["method"] == "GET"
+        assert fields["query_count"] >= 2
+        assert fields["latency_ms"] >= fields["db_time_ms"] > 0
+    
+    def test_user_id_recorded(self, client, student_token, student_user, access_records):
+        """Test that authenticated requests carry the user ID"""
+        client.get("/users/me", headers={"Authorization": f"Bearer {student_token}"})
+        
+        assert access_records[-1].fields["user_id"] == student_user.id
+    
+    def test_errors_always_logged(self, client, access_records, monkeypatch):
+        """Test that error responses are logged even with sampling off"""
+        monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+        
+        client.get("/courses/999")
+        client.get("/health")
+        
+        assert [record.fields["status"] for record in access_records] == [404]
+    
+    def test_route_sample_rates(self, monkeypatch):
+        """Test per-route sampling overrides"""
+        monkeypatch.setattr(settings, "ACCESS_LOG_SAMPLE_RATE", 0.0)
+        monkeypatch.setattr(settings, "ACCESS_LOG_ROUTE_SAMPLE_RATES", {"/courses": 1.0})
+        
+        assert should_log("/courses", 200, 5)
+        assert not should_log("/health", 200, 5)
+        assert should_log("/health", 200, settings.ACCESS_LOG_SLOW_REQUEST_MS)
+    
+    def test_json_output_through_queue(self):
+        """Test that queued records are written as JSON lines"""
+        stream = io.StringIO()
+        shutdown_access_logging()
+        configure_access_logging(stream)
+        logging.getLogger(ACCESS_LOGGER).info("access", extra={"fields": {"route": "/health", "status": 200}})
+        shutdown_access_logging()
+        
+        entry = json.loads(stream.getvalue())
+        assert entry["route"] == "/health"
+        assert entry["status"] == 200
+        assert entry["logger"] == ACCESS_LOGGER
+    
+    def test_formatter_plain_message(self):
+        """Test formatting records without structured fields"""
+        record = logging.LogRecord("app", logging.WARNING, __file__, 1, "hello %s", ("world",), None)
+        
+        assert json.loads(JsonFormatter().format(record))["message"] == "hello world"
@@ -0,0 +1,120 @@
+import pytest
+from fastapi import status
+from app.models.enrollment import Enrollment
+
+
+class TestCourseAnalytics:
+    """Test enrollment analytics endpoints"""
+    
+    def test_rollups_follow_enrollments(self, client, admin_token, student_token, sample_course):
+        """Test that enrolling and deregistering update the rollups"""
+        client.post(
+            "/enrollments",
+            json={"course_id": sample_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        response = client.get("/analytics/courses", headers={"Authorization": f"Bearer {admin_token}"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        course = response.json()[0]
+        assert course["course_id"] == sample_course.id
+        assert course["enrolled_count"] == 1
+        assert course["fill_rate"] == pytest.approx(1 / sample_course.capacity)
+        
+        client.delete(
+            f"/enrollments/{sample_course.id}",
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        course = client.get("/analytics/courses", headers={"Authorization": f"Bearer {admin_token}"}).json()[0]
+        assert course["enrolled_count"] == 0
+        assert course["total_enrollments"] == 1
+        assert course["total_drops"] == 1
+        
+        days = client.get("/analytics/enrollments/daily", headers={"Authorization": f"Bearer {admin_token}"}).json()
+        assert len(days) == 1
+        assert days[0]["enrollments"] == 1
+        assert days[0]["drops"] == 1
+    
+    def test_sort_by_fill_rate(self, client, admin_token, sample_course, full_course):
+        """Test ordering courses by fill rate"""
+        response = client.get(
+            "/analytics/courses?sort=fill_rate",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        data = response.json()
+        assert data[0]["course_id"] == full_course.id
+        assert data[0]["fill_rate"] == 1.0
+    
+    def test_summary(self, client, admin_token, sample_course, full_course):
+        """Test platform-wide totals"""
+        response = client.get("/analytics/summary", headers={"Authorization": f"Bearer {admin_token}"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["active_courses"] == 2
+        assert data["total_capacity"] == sample_course.capacity + full_course.capacity
+        assert data["total_enrolled"] == 1
+    
+    def test_analytics_as_student(self, client, student_token):
+        """Test student trying to read analytics (should fail)"""
+        response = client.get("/analytics/courses", headers={"Authorization": f"Bearer {student_token}"})
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_reconcile_bulk_inserts(self, db_session, student_user, sample_course):
+        """Test that the reconcile job picks up enrollments written without the ORM"""
+        from app.jobs.enrollment_rollups import reconcile_course_stats
+        from app.models.enrollment_stats import CourseEnrollmentStats
+        
+        db_session.execute(Enrollment.__table__.insert(), [{"user_id": student_user.id, "course_id": sample_course.id}])
+        db_session.commit()
+        
+        assert reconcile_course_stats(db_session) == 1
+        stats = db_session.query(CourseEnrollmentStats).filter(CourseEnrollmentStats.course_id == sample_course.id).one()
+        assert stats.enrolled_count == 1
+    
+    def test_deltas_folded(self, client, admin_token, db_session, student_user, second_student, sample_course):
+        """Test that flushes only append deltas and the fold job merges them into the course and day rollups"""
+        from app.jobs.enrollment_rollups import fold_enrollment_deltas
+        from app.models.enrollment_stats import CourseEnrollmentStats, DailyEnrollmentStats, EnrollmentStatDelta
+        
+        for user in (student_user, second_student):
+            db_session.add(Enrollment(user_id=user.id, course_id=sample_course.id))
+            db_session.commit()
+        
+        assert [delta.course_id for delta in db_session.query(EnrollmentStatDelta)] == [sample_course.id] * 2
+        assert db_session.query(CourseEnrollmentStats).count() == 0
+        assert db_session.query(DailyEnrollmentStats).count() == 0
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        days = client.get("/analytics/enrollments/daily", headers=headers).json()
+        assert [day["enrollments"] for day in days] == [2]
+        assert client.get("/analytics/courses", headers=headers).json()[0]["enrolled_count"] == 2
+        assert client.get("/analytics/summary", headers=headers).json()["total_enrolled"] == 2
+        
+        assert fold_enrollment_deltas(db_session) == 2
+        
+        assert db_session.query(EnrollmentStatDelta).count() == 0
+        assert db_session.get(CourseEnrollmentStats, sample_course.id).enrolled_count == 2
+        assert db_session.query(DailyEnrollmentStats).one().enrollments == 2
+        days = client.get("/analytics/enrollments/daily", headers=headers).json()
+        assert [day["enrollments"] for day in days] == [2]
+        assert client.get("/analytics/courses", headers=headers).json()[0]["enrolled_count"] == 2
+    
+    def test_reconcile_before_fold(self, db_session, student_user, second_student, sample_course):
+        """Test that reconciling with unfolded deltas does not count their enrollments twice"""
+        from app.jobs.enrollment_rollups import fold_enrollment_deltas, reconcile_course_stats
+        from app.models.enrollment_stats import CourseEnrollmentStats
+        
+        db_session.add(Enrollment(user_id=student_user.id, course_id=sample_course.id))
+        db_session.commit()
+        db_session.execute(Enrollment.__table__.insert(), [{"user_id": second_student.id, "course_id": sample_course.id}])
+        db_session.commit()
+        
+        assert reconcile_course_stats(db_session) == 1
+        fold_enrollment_deltas(db_session)
+        
+        assert db_session.get(CourseEnrollmentStats, sample_course.id).enrolled_count == 2
+        assert reconcile_course_stats(db_session) == 0
@@ -0,0 +1,82 @@
+import pytest
+from fastapi import status
+from app.models.audit import EnrollmentAuditEvent
+from app.models.enrollment import Enrollment
+
+
+class TestEnrollmentAudit:
+    """Test enrollment audit history"""
+    
+    def test_enroll_and_deregister_recorded(self, client, admin_token, student_token, student_user, sample_course):
+        """Test that student actions are recorded with the actor"""
+        client.post(
+            "/enrollments",
+            json={"course_id": sample_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        client.delete(
+            f"/enrollments/{sample_course.id}",
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        response = client.get("/audit/enrollments", headers={"Authorization": f"Bearer {admin_token}"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        events = response.json()["events"]
+        assert [e["action"] for e in events] == ["deregistered", "enrolled"]
+        assert all(e["actor_id"] == student_user.id for e in events)
+        assert all(e["course_id"] == sample_course.id for e in events)
+    
+    def test_admin_removal_and_promotion_recorded(self, client, db_session, admin_token, admin_user,
+                                                   student_user, second_student, full_course):
+        """Test that admin removals and waitlist promotions are recorded"""
+        from app.models.waitlist import WaitlistEntry
+        
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.commit()
+        enrollment = db_session.query(Enrollment).filter(Enrollment.user_id == student_user.id).one()
+        
+        client.delete(f"/enrollments/{enrollment.id}/admin", headers={"Authorization": f"Bearer {admin_token}"})
+        
+        events = db_session.query(EnrollmentAuditEvent).order_by(EnrollmentAuditEvent.id).all()
+        assert [(e.action.value, e.user_id, e.actor_id) for e in events] == [
+            ("removed", student_user.id, admin_user.id),
+            ("promoted", second_student.id, None),
+        ]
+    
+    def test_failed_enrollment_not_recorded(self, client, second_student_token, db_session, full_course):
+        """Test that rejected requests leave no audit trail"""
+        client.post(
+            "/enrollments",
+            json={"course_id": full_course.id},
+            headers={"Authorization": f"Bearer {second_student_token}"}
+        )
+        
+        assert db_session.query(EnrollmentAuditEvent).count() == 0
+    
+    def test_pagination(self, client, admin_token, db_session, student_user):
+        """Test keyset pagination over the history"""
+        from datetime import datetime, timezone
+        
+        db_session.execute(EnrollmentAuditEvent.__table__.insert(), [
+            {"action": "ENROLLED", "user_id": student_user.id, "course_id": i, "actor_id": student_user.id,
+             "created_at": datetime.now(timezone.utc)}
+            for i in range(1, 6)
+        ])
+        db_session.commit()
+        
+        first = client.get("/audit/enrollments?limit=3", headers={"Authorization": f"Bearer {admin_token}"}).json()
+        second = client.get(
+            f"/audit/enrollments?limit=3&cursor={first['next_cursor']}",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        ).json()
+        
+        assert [e["course_id"] for e in first["events"]] == [5, 4, 3]
+        assert [e["course_id"] for e in second["events"]] == [2, 1]
+        assert second["next_cursor"] is None
+    
+    def test_audit_as_student(self, client, student_token):
+        """Test student trying to read the audit log (should fail)"""
+        response = client.get("/audit/enrollments", headers={"Authorization": f"Bearer {student_token}"})
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,206 @@
+import logging
+import time
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from app.models.backfill import BackfillProgress
+from app.utils.backfill import (
+    backfill_in_migration, require_backfilled, reset_backfill, run_backfill, update_step,
+)
+
+metadata = MetaData()
+items = Table(
+    "items", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("status", String(20), nullable=True),
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A file database of its own: chunks commit on separate connections"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    metadata.create_all(engine)
+    BackfillProgress.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+def insert_items(engine, ids, status=None):
+    with engine.begin() as connection:
+        connection.execute(items.insert(), [{"id": item_id, "status": status} for item_id in ids])
+
+
+def statuses(engine):
+    with engine.connect() as connection:
+        return dict(connection.execute(select(items.c.id, items.c.status)).all())
+
+
+def recording_step(calls, fail_on_chunk=None, delay=0.0):
+    """update_step that records each chunk's key range and can fail or stall on demand"""
+    fill = update_step(items, {"status": "done"}, items.c.status.is_(None))
+
+    def step(connection, lower, upper):
+        if fail_on_chunk is not None and len(calls) == fail_on_chunk:
+            raise RuntimeError("interrupted")
+        calls.append((lower, upper))
+        time.sleep(delay)
+        return fill(connection, lower, upper)
+
+    return step
+
+
+class TestRunBackfill:
+    """Test chunked backfills"""
+
+    def test_fills_every_row_in_chunks(self, engine, caplog):
+        """Test that the table is processed in primary key chunks with progress logged"""
+        insert_items(engine, range(1, 36))
+        calls = []
+
+        with caplog.at_level(logging.INFO, logger="app.utils.backfill"):
+            progress = run_backfill(engine, "items_status", items, recording_step(calls),
+                                    chunk_size=10, pause_seconds=0)
+
+        assert calls == [(0, 10), (10, 20), (20, 30), (30, 35)]
+        assert set(statuses(engine).values()) == {"done"}
+        assert progress["rows_processed"] == 35
+        assert progress["chunks"] == 4
+        assert progress["finished_at"] is not None
+        assert "key 20 of 35 (57.1%)" in caplog.text
+
+    def test_sparse_keys_and_filter(self, engine):
+        """Test that chunks hold chunk_size rows despite key gaps and only matching rows count"""
+        insert_items(engine, [1, 2, 500, 501, 9000])
+        insert_items(engine, [9001], status="kept")
+        calls = []
+
+        progress = run_backfill(engine, "items_status", items, recording_step(calls), chunk_size=2, pause_seconds=0)
+
+        assert calls == [(0, 2), (2, 501), (501, 9001)]
+        assert progress["rows_processed"] == 5
+        assert statuses(engine)[9001] == "kept"
+
+    def test_resumes_after_failure(self, engine):
+        """Test that a failed chunk rolls back alone and the next run continues after it"""
+        insert_items(engine, range(1, 51))
+        calls = []
+
+        with pytest.raises(RuntimeError):
+            run_backfill(engine, "items_status", items, recording_step(calls, fail_on_chunk=2),
+                         chunk_size=10, pause_seconds=0)
+
+        assert [status for status in statuses(engine).values() if status] == ["done"] * 20
+
+        resumed = []
+        progress = run_backfill(engine, "items_status", items, recording_step(resumed),
+                                chunk_size=10, pause_seconds=0)
+
+        assert resumed[0] == (20, 30)
+        assert progress["rows_processed"] == 50
+        assert progress["chunks"] == 5
+
+    def test_stops_after_max_seconds(self, engine):
+        """Test that a time-boxed run stops between chunks and resumes later"""
+        insert_items(engine, range(1, 31))
+        calls = []
+
+        progress = run_backfill(engine, "items_status", items, recording_step(calls),
+                                chunk_size=10, pause_seconds=0, max_seconds=0)
+
+        assert calls == [(0, 10)]
+        assert progress["finished_at"] is None
+
+        progress = run_backfill(engine, "items_status", items, recording_step(calls),
+                                chunk_size=10, pause_seconds=0)
+
+        assert calls == [(0, 10), (10, 20), (20, 30)]
+        assert progress["finished_at"] is not None
+
+    def test_rows_added_after_start_are_left(self, engine):
+        """Test that the backfill does not chase rows inserted while it runs"""
+        insert_items(engine, range(1, 11))
+        fill = update_step(items, {"status": "done"})
+
+        def step(connection, lower, upper):
+            if lower == 0:
+                connection.execute(items.insert().values(id=11))
+            return fill(connection, lower, upper)
+
+        run_backfill(engine, "items_status", items, step, chunk_size=5, pause_seconds=0)
+
+        assert statuses(engine)[11] is None
+
+    def test_slow_chunks_are_halved(self, engine):
+        """Test that chunks over the time target shrink to keep row locks short"""
+        insert_items(engine, range(1, 41))
+        calls = []
+
+        run_backfill(engine, "items_status", items, recording_step(calls, delay=0.02),
+                     chunk_size=16, pause_seconds=0, target_seconds=0.01)
+
+        sizes = [upper - lower for lower, upper in calls]
+        assert sizes[:3] == [16, 8, 4]
+
+    def test_finished_backfill_not_rerun_until_reset(self, engine):
+        """Test that finished backfills are skipped and reset starts over"""
+        insert_items(engine, range(1, 6))
+        run_backfill(engine, "items_status", items, recording_step([]), pause_seconds=0)
+        calls = []
+
+        run_backfill(engine, "items_status", items, recording_step(calls), pause_seconds=0)
+        assert calls == []
+
+        reset_backfill(engine, "items_status")
+        run_backfill(engine, "items_status", items, recording_step(calls), pause_seconds=0)
+        assert calls == [(0, 5)]
+
+    def test_empty_table(self, engine):
+        """Test that a backfill of an empty table finishes at once"""
+        progress = run_backfill(engine, "items_status", items, recording_step([]))
+
+        assert progress["finished_at"] is not None
+        assert progress["chunks"] == 0
+
+
+class TestMigrationHelpers:
+    """Test the helpers used from Alembic revisions"""
+
+    def test_require_backfilled(self, engine):
+        """Test that contract steps refuse to run before the backfill has finished"""
+        insert_items(engine, range(1, 21))
+
+        with engine.connect() as connection:
+            with pytest.raises(RuntimeError, match="items_status"):
+                require_backfilled(connection, "items_status")
+
+        run_backfill(engine, "items_status", items, recording_step([]), chunk_size=10,
+                     pause_seconds=0, max_seconds=0)
+        with engine.connect() as connection:
+            with pytest.raises(RuntimeError):
+                require_backfilled(connection, "items_status")
+
+        run_backfill(engine, "items_status", items, recording_step([]), chunk_size=10, pause_seconds=0)
+        with engine.connect() as connection:
+            require_backfilled(connection, "items_status")
+
+    def test_backfill_in_migration(self, engine):
+        """Test that a revision's backfill commits its chunks outside the migration transaction"""
+        insert_items(engine, range(1, 26))
+
+        with engine.connect() as connection:
+            context = MigrationContext.configure(connection)
+            with Operations.context(context), context.begin_transaction():
+                progress = backfill_in_migration("items_status", items, update_step(items, {"status": "done"}),
+                                                 chunk_size=10, pause_seconds=0)
+
+        assert progress["chunks"] == 3
+        assert set(statuses(engine).values()) == {"done"}
+
+    def test_backfill_in_migration_needs_connection(self):
+        """Test that offline (--sql) migrations refuse to render a backfill"""
+        context = MigrationContext.configure(dialect_name="sqlite", opts={"as_sql": True})
+
+        with Operations.context(context), pytest.raises(RuntimeError, match="rendered as SQL"):
+            backfill_in_migration("items_status", items, update_step(items, {"status": "done"}))
@@ -0,0 +1,269 @@
+import time
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.config import settings
+from app.services.cache import MemoryCache, RedisCache, cache, check_cache, CATALOG_KEY, OK
+from app.services.cache_server import LocalCacheServer
+from tests.conftest import engine
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def cache_server():
+    """Local stand-in Redis server on a free port"""
+    server = LocalCacheServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def redis_workers(cache_server):
+    """Two workers' caches on the same server, listening for invalidations"""
+    workers = [RedisCache(cache_server.url, prefix="test:", near_ttl=60) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    assert all(worker.subscribed.wait(2) for worker in workers)
+    yield workers
+    for worker in workers:
+        worker.close()
+
+
+def count_statements(client, path, headers=None):
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        response = client.get(path, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return response, statements
+
+
+class TestMemoryCache:
+    """Test the in-process LRU/TTL backend"""
+
+    def test_get_set(self):
+        """Test hits and misses are counted"""
+        memory = MemoryCache(max_entries=10)
+        memory.set("a", {"value": 1}, ttl=60)
+
+        assert memory.get("a") == {"value": 1}
+        assert memory.get("b") is None
+        stats = memory.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        memory = MemoryCache(max_entries=2)
+        memory.set("a", 1, ttl=60)
+        memory.set("b", 2, ttl=60)
+        memory.get("a")
+        memory.set("c", 3, ttl=60)
+
+        assert memory.get("b") is None
+        assert memory.get("a") == 1
+        assert memory.get("c") == 3
+        assert memory.stats()["evictions"] == 1
+
+    def test_expiry(self):
+        """Test that entries expire after their ttl"""
+        memory = MemoryCache()
+        memory.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert memory.get("a") is None
+        assert memory.stats()["expirations"] == 1
+
+    def test_add_and_incr(self):
+        """Test set-if-absent and windowed counters"""
+        memory = MemoryCache()
+
+        assert memory.add("a", 1, ttl=60) is True
+        assert memory.add("a", 2, ttl=60) is False
+        assert memory.get("a") == 1
+        assert [memory.incr("n", ttl=0.05) for _ in range(3)] == [1, 2, 3]
+        time.sleep(0.06)
+        assert memory.incr("n", ttl=0.05) == 1
+
+
+class TestRedisCache:
+    """Test the Redis-protocol backend against the local stand-in server"""
+
+    def test_round_trip(self, cache_server):
+        """Test values, expiry, add and counters on the server"""
+        shared = RedisCache(cache_server.url, prefix="test:", near_entries=0)
+        try:
+            shared.set("a", {"value": [1, 2]}, ttl=60)
+            shared.set("short", 1, ttl=0.01)
+            time.sleep(0.02)
+
+            assert shared.get("a") == {"value": [1, 2]}
+            assert shared.get("short") is None
+            assert shared.add("a", 2, ttl=60) is False
+            assert shared.add("b", 2, ttl=60) is True
+            assert [shared.incr("n", ttl=60) for _ in range(3)] == [1, 2, 3]
+            shared.delete("a", "b")
+            assert shared.get("a") is None
+            assert shared.stats()["hits"] == 1
+        finally:
+            shared.close()
+
+    def test_shared_between_workers(self, redis_workers):
+        """Test that a value written by one worker is read by another"""
+        first, second = redis_workers
+        first.set("principal:x", {"id": 1}, ttl=60)
+
+        assert second.get("principal:x") == {"id": 1}
+
+    def test_invalidation_over_pubsub(self, redis_workers):
+        """Test that writes drop other workers' near-cached copies"""
+        first, second = redis_workers
+        first.set("catalog", ["old"], ttl=60)
+        assert second.get("catalog") == ["old"]
+
+        first.set("catalog", ["new"], ttl=60)
+        assert wait_for(lambda: second.get("catalog") == ["new"])
+
+        first.delete("catalog")
+        assert wait_for(lambda: second.get("catalog") is None)
+
+    def test_clear_reaches_all_workers(self, redis_workers):
+        """Test that clear empties the server and every near cache"""
+        first, second = redis_workers
+        first.set("a", 1, ttl=60)
+        assert second.get("a") == 1
+
+        first.clear()
+
+        assert wait_for(lambda: second.get("a") is None)
+
+    def test_unreachable_server(self):
+        """Test that an unreachable server degrades to misses instead of errors"""
+        shared = RedisCache("redis://127.0.0.1:1/0", near_entries=0)
+
+        shared.set("a", 1, ttl=60)
+        assert shared.get("a") is None
+        assert shared.incr("n", ttl=60) == 0
+        stats = shared.stats()
+        assert stats["errors"] == 3
+        assert stats["misses"] == 1
+
+    def test_resubscribes_after_disconnect(self, cache_server, redis_workers):
+        """Test that a worker reconnects and empties its near cache after losing the server"""
+        first, second = redis_workers
+        first.set("a", 1, ttl=60)
+        assert second.get("a") == 1
+
+        cache_server.disconnect_clients()
+        assert wait_for(lambda: second.subscribed.is_set() and len(second.near) == 0)
+
+        first.set("a", 2, ttl=60)
+        assert wait_for(lambda: second.get("a") == 2)
+
+
+class TestCachedViews:
+    """Test the principal and catalog caches in the API"""
+
+    def test_principal_served_from_cache(self, client, student_user, student_token):
+        """Test that an authenticated request after the first does not query the user"""
+        headers = {"Authorization": f"Bearer {student_token}"}
+        client.get("/users/me", headers=headers)
+
+        response, statements = count_statements(client, "/users/me", headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["email"] == student_user.email
+        assert not any("FROM users" in statement and "users.email" in statement for statement in statements)
+
+    def test_principal_invalidated_on_update(self, client, db_session, student_user, student_token):
+        """Test that deactivating a user takes effect despite the cache"""
+        headers = {"Authorization": f"Bearer {student_token}"}
+        assert client.get("/users/me", headers=headers).status_code == status.HTTP_200_OK
+
+        student_user.is_active = False
+        db_session.commit()
+
+        response = client.get("/users/me", headers=headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_catalog_cached(self, client, sample_course):
+        """Test that the course list is served from the cache"""
+        client.get("/courses")
+
+        response, statements = count_statements(client, "/courses")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [course["code"] for course in response.json()] == [sample_course.code]
+        assert statements == []
+
+    def test_catalog_invalidated_by_enrollment(self, client, sample_course, student_token):
+        """Test that enrolling refreshes seat counts in the cached catalog"""
+        assert client.get("/courses").json()[0]["enrolled_count"] == 0
+
+        client.post(
+            "/enrollments",
+            json={"course_id": sample_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+
+        assert cache.get(CATALOG_KEY) is None
+        assert client.get("/courses").json()[0]["enrolled_count"] == 1
+
+    def test_catalog_loaded_before_invalidation_not_served(self, db_session, sample_course, monkeypatch):
+        """Test that a catalog read before a write commits is not served after it"""
+        from app.services import catalog as catalog_service
+
+        stale = catalog_service.get_catalog(db_session)
+        generation = cache.get(CATALOG_KEY)
+        cache.delete(CATALOG_KEY)
+
+        # A slow reader that loaded the courses before the write stores its list afterwards
+        cache.set(catalog_service.catalog_key(generation), stale, ttl=60)
+        sample_course.title = "Renamed Course"
+        db_session.commit()
+
+        assert catalog_service.get_catalog(db_session)[0]["title"] == "Renamed Course"
+
+    def test_catalog_invalidated_by_course_write(self, client, sample_course, admin_token):
+        """Test that admin course changes are visible immediately"""
+        client.get("/courses")
+
+        client.put(
+            f"/courses/{sample_course.id}",
+            json={"title": "Renamed Course"},
+            headers={"Authorization": f"Bearer {admin_token}", "If-Match": '"1"'}
+        )
+
+        assert client.get("/courses").json()[0]["title"] == "Renamed Course"
+
+    def test_rollback_keeps_cache(self, db_session, sample_course):
+        """Test that invalidations of a rolled back transaction are dropped"""
+        cache.set(CATALOG_KEY, ["cached"], ttl=60)
+        sample_course.title = "Not Saved"
+        db_session.flush()
+        db_session.rollback()
+
+        assert cache.get(CATALOG_KEY) == ["cached"]
+
+    def test_cache_readiness(self):
+        """Test that the readiness report includes cache metrics"""
+        result = check_cache(None)
+
+        assert result["status"] == OK
+        assert result["backend"] == "memory"
+        assert {"hits", "misses", "evictions"} <= result.keys()
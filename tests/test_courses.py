@@ -118,7 +118,7 @@ class TestUpdateCourse:
         response = client.put(
             f"/courses/{sample_course.id}",
             json={"title": "Updated Title", "capacity": 40},
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers={"Authorization": f"Bearer {admin_token}", "If-Match": '"1"'}
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -155,7 +155,7 @@ class TestToggleCourseActivation:
         """Test deactivating a course"""
         response = client.patch(
             f"/courses/{sample_course.id}/activate?is_active=false",
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers={"Authorization": f"Bearer {admin_token}", "If-Match": '"1"'}
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -166,7 +166,7 @@ class TestToggleCourseActivation:
         """Test activating a course"""
         response = client.patch(
             f"/courses/{inactive_course.id}/activate?is_active=true",
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers={"Authorization": f"Bearer {admin_token}", "If-Match": '"1"'}
         )
         
         assert response.status_code == status.HTTP_200_OK
@@ -181,3 +181,339 @@ class TestToggleCourseActivation:
         )
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestOptimisticConcurrency:
+    """Test ETag / If-Match versioning of course updates"""
+    
+    def headers(self, token, etag=None):
+        headers = {"Authorization": f"Bearer {token}"}
+        if etag is not None:
+            headers["If-Match"] = etag
+        return headers
+    
+    def test_etag_on_reads_and_writes(self, client, admin_token, sample_course):
+        """Test that course responses carry the version as ETag"""
+        response = client.get(f"/courses/{sample_course.id}")
+        assert response.headers["ETag"] == '"1"'
+        assert response.json()["version"] == 1
+        
+        response = client.put(f"/courses/{sample_course.id}", json={"title": "Updated Title"},
+                              headers=self.headers(admin_token, '"1"'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == '"2"'
+        
+        response = client.post("/courses", json={"title": "New Course", "code": "NEW1", "capacity": 5},
+                               headers=self.headers(admin_token))
+        assert response.headers["ETag"] == '"1"'
+    
+    def test_if_match_required(self, client, admin_token, sample_course):
+        """Test that updates without If-Match are refused with 428"""
+        response = client.put(f"/courses/{sample_course.id}", json={"title": "Updated Title"},
+                              headers=self.headers(admin_token))
+        assert response.status_code == status.HTTP_428_PRECONDITION_REQUIRED
+        
+        response = client.patch(f"/courses/{sample_course.id}/activate?is_active=false",
+                                headers=self.headers(admin_token))
+        assert response.status_code == status.HTTP_428_PRECONDITION_REQUIRED
+    
+    def test_stale_update_rejected(self, client, admin_token, sample_course):
+        """Test that the second of two edits based on the same version gets 412"""
+        first = client.put(f"/courses/{sample_course.id}", json={"title": "First Edit"},
+                           headers=self.headers(admin_token, '"1"'))
+        second = client.put(f"/courses/{sample_course.id}", json={"capacity": 99},
+                            headers=self.headers(admin_token, '"1"'))
+        
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert second.headers["ETag"] == '"2"'
+        course = client.get(f"/courses/{sample_course.id}").json()
+        assert (course["title"], course["capacity"]) == ("First Edit", 30)
+    
+    def test_if_match_lists_and_wildcard(self, client, admin_token, sample_course):
+        """Test that any listed ETag or * satisfies If-Match, and weak ETags never do"""
+        response = client.put(f"/courses/{sample_course.id}", json={"capacity": 31},
+                              headers=self.headers(admin_token, 'W/"1"'))
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        
+        response = client.put(f"/courses/{sample_course.id}", json={"capacity": 32},
+                              headers=self.headers(admin_token, '"7", "1"'))
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = client.put(f"/courses/{sample_course.id}", json={"capacity": 33},
+                              headers=self.headers(admin_token, "*"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] == '"3"'
+    
+    def test_concurrent_write_after_check(self, client, db_session, admin_token, sample_course, monkeypatch):
+        """Test that an edit committed between the If-Match check and the UPDATE gives 412"""
+        from sqlalchemy import update
+        from app.models.course import Course
+        from app.routers import courses
+        
+        def concurrent_edit(db, course):
+            db.execute(update(Course.__table__).where(Course.__table__.c.id == course.id).values(
+                title="Concurrent Edit", version=Course.__table__.c.version + 1
+            ))
+        monkeypatch.setattr(courses, "promote_from_waitlist", concurrent_edit)
+        
+        response = client.put(f"/courses/{sample_course.id}", json={"title": "Lost Edit"},
+                              headers=self.headers(admin_token, '"1"'))
+        
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        db_session.expire_all()
+        assert db_session.get(Course, sample_course.id).title == "Introduction to Python"
+    
+    def test_stale_deactivation_sends_no_notification(self, client, db_session, admin_token, sample_course):
+        """Test that a refused deactivation leaves the course and queues nothing"""
+        from app.models.job import BackgroundJob
+        
+        response = client.patch(f"/courses/{sample_course.id}/activate?is_active=false",
+                                headers=self.headers(admin_token, '"5"'))
+        
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert db_session.query(BackgroundJob).count() == 0
+        assert client.get(f"/courses/{sample_course.id}").json()["is_active"] is True
+    
+    def test_enrollments_keep_version(self, client, student_token, sample_course):
+        """Test that enrolling does not bump the course version, so admin ETags stay valid"""
+        client.post("/enrollments", json={"course_id": sample_course.id}, headers=self.headers(student_token))
+        
+        response = client.get(f"/courses/{sample_course.id}")
+        assert response.json()["enrolled_count"] == 1
+        assert response.headers["ETag"] == '"1"'
+
+
+class TestPrerequisites:
+    """Test course prerequisites and their enforcement"""
+    
+    @pytest.fixture
+    def course_chain(self, db_session):
+        """Create three courses with no prerequisites yet"""
+        from app.models.course import Course
+        
+        courses = [
+            Course(title=f"Course Level {level}", code=f"LVL{level}", capacity=10, is_active=True)
+            for level in range(1, 4)
+        ]
+        db_session.add_all(courses)
+        db_session.commit()
+        return courses
+    
+    def set_prerequisites(self, client, admin_token, course, prerequisites):
+        return client.put(
+            f"/courses/{course.id}/prerequisites",
+            json={"prerequisite_ids": [p.id for p in prerequisites]},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+    
+    def test_transitive_requirements(self, client, admin_token, course_chain):
+        """Test that required courses include indirect prerequisites"""
+        first, second, third = course_chain
+        self.set_prerequisites(client, admin_token, third, [second])
+        response = self.set_prerequisites(client, admin_token, second, [first])
+        
+        assert response.status_code == status.HTTP_200_OK
+        response = client.get(f"/courses/{third.id}/prerequisites")
+        data = response.json()
+        assert data["prerequisite_ids"] == [second.id]
+        assert data["required_course_ids"] == sorted([first.id, second.id])
+    
+    def test_cycle_rejected(self, client, admin_token, course_chain):
+        """Test that prerequisite cycles are rejected at write time"""
+        first, second, third = course_chain
+        self.set_prerequisites(client, admin_token, second, [first])
+        self.set_prerequisites(client, admin_token, third, [second])
+        
+        response = self.set_prerequisites(client, admin_token, first, [third])
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "cycle" in response.json()["detail"].lower()
+    
+    def test_removal_updates_dependents(self, client, admin_token, course_chain):
+        """Test that removing an edge updates courses depending on it"""
+        first, second, third = course_chain
+        self.set_prerequisites(client, admin_token, second, [first])
+        self.set_prerequisites(client, admin_token, third, [second])
+        
+        self.set_prerequisites(client, admin_token, second, [])
+        
+        data = client.get(f"/courses/{third.id}/prerequisites").json()
+        assert data["required_course_ids"] == [second.id]
+    
+    def test_enrollment_requires_completion(self, client, admin_token, student_token, student_user, course_chain):
+        """Test that enrollment is rejected until prerequisites are completed"""
+        first, second, _ = course_chain
+        self.set_prerequisites(client, admin_token, second, [first])
+        
+        response = client.post(
+            "/enrollments",
+            json={"course_id": second.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert first.code in response.json()["detail"]
+        
+        response = client.post(
+            f"/courses/{first.id}/completions",
+            json={"user_id": student_user.id},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        
+        response = client.post(
+            "/enrollments",
+            json={"course_id": second.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+    
+    def test_update_prerequisites_as_student(self, client, student_token, course_chain):
+        """Test updating prerequisites as student (should fail)"""
+        first, second, _ = course_chain
+        response = self.set_prerequisites(client, student_token, second, [first])
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestCourseMeetings:
+    """Test course meeting slots and schedule-conflict detection"""
+    
+    def put_meetings(self, client, admin_token, course, meetings):
+        return client.put(
+            f"/courses/{course.id}/meetings",
+            json={"meetings": meetings},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+    
+    def test_set_meetings(self, client, admin_token, sample_course):
+        """Test replacing a course's meeting slots"""
+        response = self.put_meetings(client, admin_token, sample_course, [
+            {"day_of_week": 2, "start_time": "10:00", "end_time": "11:30"},
+            {"day_of_week": 0, "start_time": "09:00", "end_time": "10:00"},
+        ])
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = client.get(f"/courses/{sample_course.id}/meetings").json()
+        assert [slot["day_of_week"] for slot in data] == [0, 2]
+        assert data[1]["end_time"] == "11:30:00"
+    
+    def test_invalid_slot(self, client, admin_token, sample_course):
+        """Test that a slot must end after it starts"""
+        response = self.put_meetings(client, admin_token, sample_course, [
+            {"day_of_week": 0, "start_time": "11:00", "end_time": "10:00"},
+        ])
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_enrollment_rejects_clash(self, client, admin_token, student_token, db_session, student_user, sample_course):
+        """Test that enrolling in a course overlapping the timetable fails"""
+        from app.models.course import Course
+        from app.models.enrollment import Enrollment
+        
+        clashing = Course(title="Discrete Mathematics", code="MA201", capacity=10, is_active=True)
+        adjacent = Course(title="Linear Algebra", code="MA202", capacity=10, is_active=True)
+        db_session.add_all([clashing, adjacent])
+        db_session.commit()
+        self.put_meetings(client, admin_token, sample_course, [
+            {"day_of_week": 1, "start_time": "09:00", "end_time": "10:30"},
+        ])
+        self.put_meetings(client, admin_token, clashing, [
+            {"day_of_week": 1, "start_time": "10:00", "end_time": "11:00"},
+        ])
+        self.put_meetings(client, admin_token, adjacent, [
+            {"day_of_week": 1, "start_time": "10:30", "end_time": "11:30"},
+        ])
+        db_session.add(Enrollment(user_id=student_user.id, course_id=sample_course.id))
+        db_session.commit()
+        
+        response = client.post(
+            "/enrollments",
+            json={"course_id": clashing.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "MA201 overlaps CS101" in response.json()["detail"]
+        
+        response = client.post(
+            "/enrollments",
+            json={"course_id": adjacent.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+    
+    def test_checkout_rejects_clash_between_courses(self, client, admin_token, student_token, db_session, sample_course):
+        """Test that courses in one checkout are checked against each other"""
+        from app.models.course import Course
+        
+        other = Course(title="Computer Networks", code="CS330", capacity=10, is_active=True)
+        db_session.add(other)
+        db_session.commit()
+        for course in (sample_course, other):
+            self.put_meetings(client, admin_token, course, [
+                {"day_of_week": 4, "start_time": "14:00", "end_time": "15:00"},
+            ])
+        
+        response = client.post(
+            "/enrollments/checkout",
+            json={"course_ids": [sample_course.id, other.id]},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "schedule conflict" in response.json()["detail"].lower()
+
+
+class TestRelatedCourses:
+    """Test co-enrollment recommendations"""
+    
+    def test_related_courses_ranking(self, client, db_session):
+        """Test that related courses are ranked by co-enrollment"""
+        from app.jobs.related_courses import rebuild_related_courses
+        from app.models.course import Course
+        from app.models.enrollment import Enrollment
+        from app.models.user import User, UserRole
+        
+        courses = [Course(title=f"Course {code}", code=code, capacity=50, is_active=True)
+                   for code in ("BASE1", "OFTEN", "RARE1", "NEVER")]
+        students = [User(name=f"Student {i}", email=f"s{i}@test.com", hashed_password="x",
+                         role=UserRole.STUDENT) for i in range(4)]
+        db_session.add_all(courses + students)
+        db_session.commit()
+        base, often, rare, never = courses
+        
+        schedule = {0: [base, often], 1: [base, often], 2: [base, often, rare], 3: [never]}
+        for index, taken in schedule.items():
+            db_session.add_all(Enrollment(user_id=students[index].id, course_id=c.id) for c in taken)
+        db_session.commit()
+        
+        assert rebuild_related_courses(db_session, top_k=5) > 0
+        
+        response = client.get(f"/courses/{base.id}/related")
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [c["code"] for c in data] == ["OFTEN", "RARE1"]
+        assert data[0]["shared_students"] == 3
+        assert data[0]["score"] > data[1]["score"]
+    
+    def test_related_courses_empty(self, client, sample_course):
+        """Test a course without co-enrollments"""
+        response = client.get(f"/courses/{sample_course.id}/related")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+    
+    def test_related_courses_limit_capped(self, client, sample_course):
+        """Test that more related courses than are stored cannot be requested"""
+        from app.config import settings
+        
+        response = client.get(f"/courses/{sample_course.id}/related?limit={settings.RELATED_COURSES_TOP_K + 1}")
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_related_courses_nonexistent(self, client):
+        """Test related courses for a non-existent course"""
+        response = client.get("/courses/9999/related")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
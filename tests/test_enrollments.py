@@ -251,3 +251,333 @@ class TestAdminEnrollmentManagement:
         )
         
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestAdmissionQueue:
+    """Test enrollment through the course admission queue"""
+    
+    def test_enroll_returns_ticket(self, client, student_token, admission_course, db_session, student_user):
+        """Test that enrolling in an admission-mode course queues a ticket"""
+        from app.services.admission import admission_queue
+        
+        response = client.post(
+            "/enrollments",
+            json={"course_id": admission_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        ticket = response.json()
+        assert ticket["course_id"] == admission_course.id
+        # 1 while queued or being processed, 0 if the worker has already finished it
+        assert ticket["position"] in (0, 1)
+        
+        admission_queue.join(admission_course.id)
+        
+        response = client.get(
+            f"/enrollments/tickets/{ticket['id']}",
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["status"] == "enrolled"
+        enrollment = db_session.query(Enrollment).filter(Enrollment.id == data["enrollment_id"]).first()
+        assert enrollment.user_id == student_user.id
+    
+    def test_ticket_rejected_when_full(self, client, student_token, admission_course, db_session, admin_user):
+        """Test that the worker rejects a ticket with the business rule message"""
+        from app.services.admission import admission_queue
+        from app.models.user import User, UserRole
+        
+        other = User(name="Other Student", email="other@test.com", hashed_password="x",
+                     role=UserRole.STUDENT, is_active=True)
+        db_session.add(other)
+        db_session.commit()
+        db_session.add(Enrollment(user_id=other.id, course_id=admission_course.id))
+        db_session.commit()
+        
+        response = client.post(
+            "/enrollments",
+            json={"course_id": admission_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        ticket_id = response.json()["id"]
+        
+        with client.stream(
+            "GET",
+            f"/enrollments/tickets/{ticket_id}/stream",
+            headers={"Authorization": f"Bearer {student_token}"}
+        ) as stream:
+            events = [line for line in stream.iter_lines() if line.startswith("data: ")]
+        
+        assert '"status":"rejected"' in events[-1]
+        assert "full" in events[-1].lower()
+        admission_queue.join(admission_course.id)
+    
+    def test_ticket_of_other_user_not_found(self, client, admin_token):
+        """Test that unknown tickets are not exposed"""
+        response = client.get(
+            "/enrollments/tickets/unknown",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_queue_bounded(self):
+        """Test that a full course queue refuses new tickets in FIFO order"""
+        import threading
+        from app.services.admission import AdmissionQueue, AdmissionQueueFull
+        
+        release = threading.Event()
+        
+        def blocking_session():
+            release.wait()
+            raise RuntimeError("no database")
+        
+        admissions = AdmissionQueue(session_factory=blocking_session, max_size=1, idle_timeout=0.1)
+        first = admissions.submit(user_id=1, course_id=1)
+        # Let the worker pick up the first ticket, leaving the queue empty
+        while admissions.pending(1):
+            pass
+        second = admissions.submit(user_id=2, course_id=1)
+        with pytest.raises(AdmissionQueueFull):
+            admissions.submit(user_id=3, course_id=1)
+        
+        release.set()
+        assert first.wait(timeout=5) and second.wait(timeout=5)
+        assert first.processed_at <= second.processed_at
+        assert second.status == "rejected"
+    
+    def test_position_moves_with_queue(self):
+        """Test that ticket positions are computed when read"""
+        import threading
+        from app.services.admission import AdmissionQueue
+        
+        release = threading.Semaphore(0)
+        
+        def blocking_session():
+            release.acquire()
+            raise RuntimeError("no database")
+        
+        admissions = AdmissionQueue(session_factory=blocking_session, idle_timeout=0.1)
+        tickets = [admissions.submit(user_id=user_id, course_id=1) for user_id in (1, 2, 3)]
+        assert [ticket.position for ticket in tickets] == [1, 2, 3]
+        
+        release.release()
+        assert tickets[0].wait(timeout=5)
+        while tickets[1].position != 1:
+            pass
+        assert [ticket.position for ticket in tickets] == [0, 1, 2]
+        
+        release.release()
+        release.release()
+        assert tickets[2].wait(timeout=5)
+        assert tickets[2].position == 0
+
+
+class TestWaitlist:
+    """Test course waitlists and automatic promotion"""
+    
+    def test_join_waitlist_full_course(self, client, second_student_token, full_course):
+        """Test joining the waitlist of a full course"""
+        response = client.post(
+            "/enrollments/waitlist",
+            json={"course_id": full_course.id},
+            headers={"Authorization": f"Bearer {second_student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["course_id"] == full_course.id
+        assert data["position"] == 1
+    
+    def test_join_waitlist_with_free_seats(self, client, student_token, sample_course):
+        """Test that a course with seats cannot be waitlisted"""
+        response = client.post(
+            "/enrollments/waitlist",
+            json={"course_id": sample_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "available seats" in response.json()["detail"].lower()
+    
+    def test_waitlist_position_order(self, client, db_session, full_course, second_student, second_student_token):
+        """Test that positions follow join order"""
+        from app.models.user import User, UserRole
+        from app.models.waitlist import WaitlistEntry
+        from app.utils.security import create_access_token
+        
+        third = User(name="Third Student", email="third@test.com", hashed_password="x",
+                     role=UserRole.STUDENT, is_active=True)
+        db_session.add(third)
+        db_session.commit()
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.add(WaitlistEntry(user_id=third.id, course_id=full_course.id))
+        db_session.commit()
+        
+        response = client.get(
+            f"/enrollments/waitlist/{full_course.id}",
+            headers={"Authorization": f"Bearer {create_access_token(data={'sub': third.email})}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["position"] == 2
+    
+    def test_deregister_promotes_first_waiting(self, client, db_session, student_token, full_course, second_student):
+        """Test that deregistration hands the seat to the head of the waitlist"""
+        from app.models.waitlist import WaitlistEntry
+        
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.commit()
+        
+        response = client.delete(
+            f"/enrollments/{full_course.id}",
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        enrollments = db_session.query(Enrollment).filter(Enrollment.course_id == full_course.id).all()
+        assert [e.user_id for e in enrollments] == [second_student.id]
+        assert db_session.query(WaitlistEntry).count() == 0
+    
+    def test_promotion_skips_ineligible_students(self, client, db_session, student_token, full_course, second_student):
+        """Test that a waitlisted student with a timetable clash is skipped and keeps their place"""
+        from app.models.course import Course
+        from app.models.user import User, UserRole
+        from app.models.waitlist import WaitlistEntry
+        from app.services.schedule import set_meetings
+        
+        third = User(name="Third Student", email="third@test.com", hashed_password="x",
+                     role=UserRole.STUDENT, is_active=True)
+        clashing = Course(title="Compilers", code="CS410", capacity=10, is_active=True)
+        db_session.add_all([third, clashing])
+        db_session.commit()
+        set_meetings(db_session, full_course, [(0, 540, 600)])
+        set_meetings(db_session, clashing, [(0, 570, 630)])
+        db_session.add(Enrollment(user_id=second_student.id, course_id=clashing.id))
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.add(WaitlistEntry(user_id=third.id, course_id=full_course.id))
+        db_session.commit()
+        
+        response = client.delete(
+            f"/enrollments/{full_course.id}",
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        promoted = db_session.query(Enrollment).filter(Enrollment.course_id == full_course.id).one()
+        assert promoted.user_id == third.id
+        waiting = db_session.query(WaitlistEntry).filter(WaitlistEntry.course_id == full_course.id).all()
+        assert [entry.user_id for entry in waiting] == [second_student.id]
+    
+    def test_inactive_course_promotes_nobody(self, db_session, full_course, student_user, second_student):
+        """Test that freeing a seat of an inactive course leaves the waitlist alone"""
+        from app.models.waitlist import WaitlistEntry
+        from app.services.waitlist import promote_from_waitlist
+        
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.query(Enrollment).filter(Enrollment.user_id == student_user.id).delete()
+        full_course.is_active = False
+        db_session.commit()
+        
+        assert promote_from_waitlist(db_session, full_course) == []
+        assert db_session.query(WaitlistEntry).count() == 1
+    
+    def test_admin_removal_promotes(self, client, db_session, admin_token, student_user, full_course, second_student):
+        """Test that an admin removal also promotes from the waitlist"""
+        from app.models.waitlist import WaitlistEntry
+        
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.commit()
+        enrollment = db_session.query(Enrollment).filter(Enrollment.user_id == student_user.id).first()
+        
+        response = client.delete(
+            f"/enrollments/{enrollment.id}/admin",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        promoted = db_session.query(Enrollment).filter(Enrollment.course_id == full_course.id).one()
+        assert promoted.user_id == second_student.id
+    
+    def test_leave_waitlist(self, client, db_session, second_student_token, full_course, second_student):
+        """Test leaving a waitlist"""
+        from app.models.waitlist import WaitlistEntry
+        
+        db_session.add(WaitlistEntry(user_id=second_student.id, course_id=full_course.id))
+        db_session.commit()
+        
+        response = client.delete(
+            f"/enrollments/waitlist/{full_course.id}",
+            headers={"Authorization": f"Bearer {second_student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert db_session.query(WaitlistEntry).count() == 0
+
+
+class TestCheckout:
+    """Test multi-course atomic enrollment"""
+    
+    def test_checkout_success(self, client, student_token, db_session, sample_course):
+        """Test enrolling in several courses at once"""
+        from app.models.course import Course
+        
+        other = Course(title="Operating Systems", code="CS202", capacity=10, is_active=True)
+        db_session.add(other)
+        db_session.commit()
+        
+        response = client.post(
+            "/enrollments/checkout",
+            json={"course_ids": [other.id, sample_course.id]},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert sorted(e["course_id"] for e in data) == sorted([sample_course.id, other.id])
+    
+    def test_checkout_all_or_nothing(self, client, second_student_token, db_session, sample_course, full_course):
+        """Test that one full course rolls back the whole checkout"""
+        response = client.post(
+            "/enrollments/checkout",
+            json={"course_ids": [sample_course.id, full_course.id]},
+            headers={"Authorization": f"Bearer {second_student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert full_course.code in response.json()["detail"]
+        db_session.rollback()
+        assert db_session.query(Enrollment).filter(Enrollment.course_id == sample_course.id).count() == 0
+    
+    def test_checkout_missing_course(self, client, student_token, sample_course):
+        """Test checkout with a non-existent course"""
+        response = client.post(
+            "/enrollments/checkout",
+            json={"course_ids": [sample_course.id, 9999]},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_checkout_as_admin(self, client, admin_token, sample_course):
+        """Test admin trying to checkout (should fail)"""
+        response = client.post(
+            "/enrollments/checkout",
+            json={"course_ids": [sample_course.id]},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_checkout_empty(self, client, student_token):
+        """Test checkout with no courses"""
+        response = client.post(
+            "/enrollments/checkout",
+            json={"course_ids": []},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
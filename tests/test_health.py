@@ -0,0 +1,123 @@
+import pytest
+from fastapi import status
+from sqlalchemy import event
+from app.services.health import ReadinessProbe, readiness, check_connection_pool, check_database, DEGRADED, FAIL, OK
+from tests.conftest import engine
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness():
+    """Do not reuse readiness verdicts across tests"""
+    readiness.invalidate()
+    yield
+    readiness.invalidate()
+
+
+class TestHealth:
+    """Test liveness and readiness probes"""
+    
+    def test_liveness(self, client):
+        """Test the liveness probe"""
+        response = client.get("/health/live")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "alive"}
+    
+    def test_readiness(self, client):
+        """Test the readiness report"""
+        response = client.get("/health/ready")
+        
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["checks"]["database"]["status"] == OK
+        assert body["checks"]["database"]["latency_ms"] >= 0
+        assert body["checks"]["connection_pool"]["status"] == OK
+        assert body["checks"]["job_workers"]["status"] == OK
+        assert "global" in body["checks"]["load_shedding"]["limits"]
+    
+    def test_readiness_cached(self, client):
+        """Test that repeated probes within the cache interval do not query the database"""
+        statements = []
+        
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            client.get("/health/ready")
+            client.get("/health/ready")
+            client.get("/health/ready")
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        
+        assert statements.count("SELECT 1") == 1
+    
+    def test_failing_check_not_ready(self, client):
+        """Test that a failing subsystem makes the instance not ready"""
+        def broken(db):
+            raise RuntimeError("cache unreachable")
+        
+        readiness.register("broken", broken)
+        try:
+            response = client.get("/health/ready")
+        finally:
+            del readiness.checks["broken"]
+        
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        body = response.json()
+        assert body["status"] == "not_ready"
+        assert body["checks"]["broken"] == {"status": FAIL, "error": "RuntimeError: cache unreachable"}
+    
+    def test_readiness_on_own_threads(self, client):
+        """Test that readiness checks do not run on the request threadpool"""
+        import threading
+        
+        threads = []
+        readiness.register("thread", lambda db: threads.append(threading.current_thread().name) or {"status": OK})
+        try:
+            client.get("/health/ready")
+        finally:
+            del readiness.checks["thread"]
+        
+        assert threads[0].startswith("readiness")
+    
+    def test_database_unreachable(self, db_session):
+        """Test that a database error fails the probe"""
+        class Unreachable:
+            def get_bind(self):
+                return db_session.get_bind()
+            
+            def execute(self, *args):
+                raise ConnectionError("connection refused")
+        
+        probe = ReadinessProbe(ttl=0)
+        probe.register("database", check_database)
+        ready, report = probe.run(Unreachable())
+        
+        assert ready is False
+        assert report["database"]["status"] == FAIL
+    
+    def test_exhausted_pool_degrades_without_waiting(self):
+        """Test that an exhausted pool degrades readiness at once instead of failing it or waiting"""
+        import time
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from sqlalchemy.pool import QueuePool
+        
+        engine = create_engine("sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=0, pool_timeout=30)
+        held = engine.connect()
+        try:
+            started = time.perf_counter()
+            probe = ReadinessProbe(ttl=0)
+            probe.register("connection_pool", check_connection_pool)
+            probe.register("database", check_database)
+            with Session(bind=engine) as db:
+                ready, report = probe.run(db)
+            assert ready is True
+            assert report["connection_pool"]["status"] == DEGRADED
+            assert report["database"]["status"] == DEGRADED
+            assert time.perf_counter() - started < 1
+        finally:
+            held.close()
+            engine.dispose()
@@ -0,0 +1,46 @@
+from app.models.course import Course
+from tests.conftest import TestingSessionLocal, worker_database_url
+
+
+class TestDatabaseIsolation:
+    """Test the per-test transaction of the db_session fixture"""
+
+    def test_commit_stays_in_test(self, db_session):
+        """Test that a commit is visible to other sessions of the same test"""
+        db_session.add(Course(title="Committed", code="ISO101", capacity=10))
+        db_session.commit()
+
+        other = TestingSessionLocal()
+        try:
+            assert other.query(Course).filter(Course.code == "ISO101").count() == 1
+        finally:
+            other.close()
+
+    def test_rolled_back_after_test(self, db_session):
+        """Test that the previous test's commit was rolled back"""
+        assert db_session.query(Course).count() == 0
+
+    def test_rollback_within_test(self, db_session, sample_course):
+        """Test that a rollback only undoes the session's own changes"""
+        sample_course.title = "Not Saved"
+        db_session.flush()
+        db_session.rollback()
+
+        assert db_session.get(Course, sample_course.id).title == "Introduction to Python"
+
+
+class TestWorkerDatabaseUrl:
+    """Test per-worker databases for parallel runs"""
+
+    def test_in_memory_shared(self):
+        """Test that in-memory databases are left alone; each process has its own"""
+        assert worker_database_url("sqlite:///:memory:", "gw0") == "sqlite:///:memory:"
+
+    def test_suffixed_per_worker(self):
+        """Test that file and server databases get the worker id"""
+        assert worker_database_url("sqlite:///tmp/test.db", "gw1") == "sqlite:///tmp/test_gw1.db"
+        assert (
+            worker_database_url("postgresql://user:secret@db:5432/enrollment_test", "gw0")
+            == "postgresql://user:secret@db:5432/enrollment_test_gw0"
+        )
+        assert worker_database_url("sqlite:///tmp/test.db", None) == "sqlite:///tmp/test.db"
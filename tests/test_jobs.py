@@ -0,0 +1,182 @@
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+import pytest
+from fastapi import status
+from app.models.job import BackgroundJob, JobStatus
+from app.services.jobs import JobWorkerPool, enqueue
+from app.services.notifications import NOTIFY_ENROLLMENT
+from tests.conftest import TestingSessionLocal
+
+
+def make_pool(**tasks):
+    """Create a worker pool bound to the test database"""
+    from app.services.jobs import TASKS
+    return JobWorkerPool(session_factory=TestingSessionLocal, workers=1, retry_base=0,
+                         tasks={**TASKS, **tasks})
+
+
+class TestJobQueue:
+    """Test the durable background job queue"""
+    
+    def test_enrollment_enqueues_notification(self, client, student_token, student_user, db_session, sample_course):
+        """Test that enrolling schedules a notification in the same transaction"""
+        client.post(
+            "/enrollments",
+            json={"course_id": sample_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        job = db_session.query(BackgroundJob).one()
+        assert job.task == NOTIFY_ENROLLMENT
+        assert job.payload == {"user_id": student_user.id, "course_id": sample_course.id, "action": "enrolled"}
+        assert job.status == JobStatus.PENDING
+    
+    def test_failed_enrollment_enqueues_nothing(self, client, student_token, db_session, full_course):
+        """Test that a rejected request leaves no job behind"""
+        response = client.post(
+            "/enrollments",
+            json={"course_id": full_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert db_session.query(BackgroundJob).count() == 0
+    
+    def test_worker_runs_notification(self, db_session, student_user, sample_course, caplog):
+        """Test that a worker runs a due job and marks it succeeded"""
+        enqueue(db_session, NOTIFY_ENROLLMENT, {"user_id": student_user.id, "course_id": sample_course.id, "action": "enrolled"})
+        db_session.commit()
+        
+        with caplog.at_level(logging.INFO, logger="app.notifications"):
+            assert make_pool().run_once() is True
+        
+        db_session.expire_all()
+        job = db_session.query(BackgroundJob).one()
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.attempts == 1
+        assert f"To {student_user.email}: You are enrolled in {sample_course.code}" in caplog.text
+    
+    def test_retry_then_dead_letter(self, db_session):
+        """Test that failing jobs back off and are dead-lettered"""
+        def flaky(db):
+            raise RuntimeError("boom")
+        
+        pool = make_pool(flaky=flaky)
+        enqueue(db_session, "flaky", max_attempts=2)
+        db_session.commit()
+        
+        assert pool.run_once() is True
+        db_session.expire_all()
+        job = db_session.query(BackgroundJob).one()
+        assert job.status == JobStatus.PENDING
+        assert job.last_error == "RuntimeError: boom"
+        
+        assert pool.run_once() is True
+        db_session.expire_all()
+        job = db_session.query(BackgroundJob).one()
+        assert job.status == JobStatus.DEAD
+        assert job.attempts == 2
+        assert pool.run_once() is False
+    
+    def test_delayed_job_not_claimed_early(self, db_session):
+        """Test that jobs are not run before run_at"""
+        enqueue(db_session, "rollups.reconcile", delay_seconds=60)
+        db_session.commit()
+        
+        assert make_pool().run_once() is False
+    
+    def test_stale_running_job_requeued(self, db_session):
+        """Test that jobs abandoned by a crashed worker go back to the queue"""
+        db_session.add(BackgroundJob(
+            task="rollups.reconcile", payload={}, status=JobStatus.RUNNING, attempts=1, max_attempts=3,
+            run_at=datetime.now(timezone.utc), locked_at=datetime.now(timezone.utc) - timedelta(hours=1)
+        ))
+        db_session.commit()
+        
+        pool = make_pool()
+        assert pool.requeue_stale(TestingSessionLocal()) == 1
+        assert pool.run_once() is True
+    
+    def test_stale_job_on_last_attempt_dead_lettered(self, db_session):
+        """Test that a job whose last attempt was lost is dead-lettered rather than requeued"""
+        db_session.add(BackgroundJob(
+            task="rollups.reconcile", payload={}, status=JobStatus.RUNNING, attempts=3, max_attempts=3,
+            run_at=datetime.now(timezone.utc), locked_at=datetime.now(timezone.utc) - timedelta(hours=1)
+        ))
+        db_session.commit()
+        
+        pool = make_pool()
+        assert pool.requeue_stale(TestingSessionLocal()) == 0
+        db_session.expire_all()
+        job = db_session.query(BackgroundJob).one()
+        assert job.status == JobStatus.DEAD
+        assert job.last_error == "Worker lost: lock timed out"
+        assert pool.run_once() is False
+    
+    @pytest.mark.commits
+    def test_worker_threads(self, db_session, student_user, sample_course):
+        """Test that started workers drain the queue"""
+        pool = JobWorkerPool(session_factory=TestingSessionLocal, workers=2, poll_interval=0.01)
+        enqueue(db_session, NOTIFY_ENROLLMENT, {"user_id": student_user.id, "course_id": sample_course.id, "action": "enrolled"})
+        db_session.commit()
+        
+        pool.start()
+        try:
+            for _ in range(200):
+                db_session.expire_all()
+                if db_session.query(BackgroundJob).one().status == JobStatus.SUCCEEDED:
+                    break
+                time.sleep(0.01)
+        finally:
+            pool.stop()
+        
+        assert db_session.query(BackgroundJob).one().status == JobStatus.SUCCEEDED
+
+
+class TestJobEndpoints:
+    """Test job administration endpoints"""
+    
+    def test_schedule_maintenance_job(self, client, admin_token, db_session):
+        """Test scheduling a maintenance job"""
+        response = client.post(
+            "/jobs",
+            json={"task": "related_courses.rebuild"},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert db_session.query(BackgroundJob).one().task == "related_courses.rebuild"
+    
+    def test_schedule_unknown_task(self, client, admin_token):
+        """Test that only maintenance tasks can be scheduled"""
+        response = client.post(
+            "/jobs",
+            json={"task": "notifications.enrollment"},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_list_and_retry_dead_jobs(self, client, admin_token, db_session):
+        """Test listing dead-lettered jobs and requeueing one"""
+        db_session.add(BackgroundJob(
+            task="rollups.reconcile", payload={}, status=JobStatus.DEAD, attempts=5, max_attempts=5,
+            run_at=datetime.now(timezone.utc), last_error="boom"
+        ))
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        dead = client.get("/jobs", params={"status": "dead"}, headers=headers).json()
+        assert [job["last_error"] for job in dead] == ["boom"]
+        
+        response = client.post(f"/jobs/{dead[0]['id']}/retry", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "pending"
+        assert response.json()["attempts"] == 0
+    
+    def test_jobs_as_student(self, client, student_token):
+        """Test listing jobs as student (should fail)"""
+        response = client.get("/jobs", headers={"Authorization": f"Bearer {student_token}"})
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,127 @@
+import asyncio
+import time
+import pytest
+from fastapi import status
+from app.config import settings
+from app.main import request_limits
+from app.middleware.load_shedding import (
+    ConcurrencyLimit, classify_request, queued_seconds, GLOBAL, AUTH, CATALOG, ENROLLMENT_WRITES, EVENT_STREAMS
+)
+
+
+@pytest.fixture
+def saturated():
+    """Fill a limit to capacity for the duration of a test"""
+    filled = []
+    
+    def fill(name):
+        limit = request_limits[name]
+        filled.append((limit, limit.in_flight))
+        limit.in_flight = limit.limit
+    
+    yield fill
+    for limit, in_flight in filled:
+        limit.in_flight = in_flight
+
+
+class TestConcurrencyLimit:
+    """Test the in-flight request cap"""
+    
+    def test_classify_request(self):
+        """Test route classes"""
+        assert classify_request("POST", "/auth/login") == AUTH
+        assert classify_request("GET", "/courses/1/related") == CATALOG
+        assert classify_request("PUT", "/courses/1") is None
+        assert classify_request("POST", "/enrollments/checkout") == ENROLLMENT_WRITES
+        assert classify_request("GET", "/enrollments/me") is None
+        assert classify_request("GET", "/enrollments/tickets/abc/stream") == EVENT_STREAMS
+    
+    def test_queued_seconds(self):
+        """Test parsing X-Request-Start in seconds and milliseconds"""
+        now = time.time()
+        assert queued_seconds([(b"x-request-start", f"t={now - 2:.3f}".encode())]) == pytest.approx(2, abs=0.1)
+        assert queued_seconds([(b"x-request-start", str(int((now - 1) * 1000)).encode())]) == pytest.approx(1, abs=0.1)
+        assert queued_seconds([(b"x-request-start", b"garbage")]) == 0.0
+        assert queued_seconds([]) == 0.0
+    
+    def test_slot_handed_to_waiter(self):
+        """Test that a released slot goes to the oldest waiter"""
+        async def scenario():
+            limit = ConcurrencyLimit("test", 1)
+            assert await limit.acquire(0)
+            waiter = asyncio.ensure_future(limit.acquire(1))
+            await asyncio.sleep(0)
+            assert limit.waiting == 1
+            limit.release()
+            assert await waiter is True
+            assert limit.in_flight == 1
+            limit.release()
+            assert limit.in_flight == 0
+        
+        asyncio.run(scenario())
+    
+    def test_wait_times_out(self):
+        """Test that waiting beyond the budget sheds the request"""
+        async def scenario():
+            limit = ConcurrencyLimit("test", 1)
+            assert await limit.acquire(0)
+            assert await limit.acquire(0.01) is False
+            assert limit.shed == 1
+            assert limit.waiting == 0
+            limit.release()
+            assert limit.in_flight == 0
+        
+        asyncio.run(scenario())
+
+
+class TestLoadShedding:
+    """Test the load shedding middleware"""
+    
+    def test_route_class_full(self, client, saturated):
+        """Test that a full route class gets a fast 503 with Retry-After"""
+        saturated(AUTH)
+        
+        started = time.monotonic()
+        response = client.post("/auth/login", json={"email": "a@b.com", "password": "password123"})
+        
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+        assert time.monotonic() - started < 2
+        assert request_limits[GLOBAL].in_flight == 0
+    
+    def test_other_classes_unaffected(self, client, saturated, sample_course):
+        """Test that a saturated class does not block other routes"""
+        saturated(ENROLLMENT_WRITES)
+        
+        response = client.get("/courses")
+        
+        assert response.status_code == status.HTTP_200_OK
+    
+    def test_health_exempt(self, client, saturated):
+        """Test that health checks bypass the global cap"""
+        saturated(GLOBAL)
+        
+        assert client.get("/health").status_code == status.HTTP_200_OK
+        assert client.get("/courses").status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    def test_event_streams_limited_apart(self, client, saturated, student_token):
+        """Test that event streams skip the global cap and are capped on their own"""
+        headers = {"Authorization": f"Bearer {student_token}"}
+        saturated(GLOBAL)
+        
+        response = client.get("/enrollments/tickets/unknown/stream", headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        
+        saturated(EVENT_STREAMS)
+        response = client.get("/enrollments/tickets/unknown/stream", headers=headers)
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    
+    def test_queue_budget_spent_upstream(self, client, saturated):
+        """Test that requests which already waited upstream are shed at once"""
+        saturated(CATALOG)
+        
+        started = time.monotonic()
+        response = client.get("/courses", headers={"X-Request-Start": f"t={time.time() - 5:.3f}"})
+        
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert time.monotonic() - started < settings.REQUEST_QUEUE_TIMEOUT_SECONDS
@@ -0,0 +1,91 @@
+import time
+import pytest
+from fastapi import status
+from app.config import settings
+from app.main import profile_rate_limiter
+from app.utils.profiling import ProfileRateLimiter
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    """Store profiles in a temporary directory with a fresh rate limit"""
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_INTERVAL_SECONDS", 0.0005)
+    profile_rate_limiter._last_started = None
+    yield tmp_path
+    profile_rate_limiter._last_started = None
+
+
+class TestProfiling:
+    """Test on-demand request profiling"""
+    
+    def test_admin_profile_stored(self, client, admin_token, profile_dir, sample_course, monkeypatch):
+        """Test that an admin request with the flag stores a folded profile"""
+        import app.routers.courses as courses_router
+        original = courses_router.get_direct_prerequisites
+        
+        def slow_prerequisites(db, course_id):
+            time.sleep(0.05)
+            return original(db, course_id)
+        
+        monkeypatch.setattr(courses_router, "get_direct_prerequisites", slow_prerequisites)
+        headers = {"Authorization": f"Bearer {admin_token}", "X-Profile": "1"}
+        
+        response = client.get(f"/courses/{sample_course.id}/prerequisites", headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        name = response.headers["X-Profile"]
+        assert name.endswith("-get-courses_course_id_prerequisites.folded")
+        
+        profile = client.get(f"/profiles/{name}", headers={"Authorization": f"Bearer {admin_token}"})
+        lines = profile.text.splitlines()
+        assert lines
+        assert any("slow_prerequisites" in line for line in lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert name in client.get("/profiles", headers={"Authorization": f"Bearer {admin_token}"}).json()
+    
+    def test_query_flag(self, client, admin_token, profile_dir):
+        """Test the query string trigger"""
+        response = client.get("/courses?profile=1", headers={"Authorization": f"Bearer {admin_token}"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Profile" in response.headers
+    
+    def test_student_cannot_profile(self, client, student_token, profile_dir):
+        """Test that the flag requires an admin"""
+        response = client.get("/courses", headers={"Authorization": f"Bearer {student_token}", "X-Profile": "1"})
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert list(profile_dir.iterdir()) == []
+    
+    def test_anonymous_cannot_profile(self, client, profile_dir):
+        """Test that the flag requires authentication"""
+        response = client.get("/courses", headers={"X-Profile": "1"})
+        
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_rate_limited(self, client, admin_token, profile_dir):
+        """Test that profiles are rate limited"""
+        headers = {"Authorization": f"Bearer {admin_token}", "X-Profile": "1"}
+        
+        assert client.get("/courses", headers=headers).status_code == status.HTTP_200_OK
+        response = client.get("/courses", headers=headers)
+        
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response.headers["Retry-After"]) > 0
+    
+    def test_one_profile_at_a_time(self):
+        """Test that a running profile blocks others"""
+        limiter = ProfileRateLimiter(min_interval=0)
+        
+        assert limiter.try_acquire() is None
+        assert limiter.try_acquire() is not None
+        limiter.release()
+        assert limiter.try_acquire() is None
+    
+    def test_profile_name_validated(self, client, admin_token, profile_dir):
+        """Test that only stored profile files can be read"""
+        response = client.get("/profiles/..%2Fconfig.py", headers={"Authorization": f"Bearer {admin_token}"})
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,284 @@
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Set, Tuple
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect
+from app.config import settings
+from app.database import Base
+from app.models.completion import CourseCompletion
+from app.models.enrollment import Enrollment
+from app.models.enrollment_archive import ArchivedEnrollment
+from app.models.job import BackgroundJob, JobStatus
+from app.models.outbox import WebhookEndpoint
+from app.models.term import Term
+from tests.conftest import engine
+
+SCAN = re.compile(r"^SCAN (\w+)")
+TABLES = set(Base.metadata.tables)
+
+
+def plan_nodes(node: dict) -> Iterator[dict]:
+    """A PostgreSQL JSON plan node and all nodes below it"""
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def full_scans(connection, statement: str, parameters) -> Set[str]:
+    """
+    Tables a statement reads in full
+
+    SQLite reports SCAN in EXPLAIN QUERY PLAN; PostgreSQL reports a Seq Scan
+    node in EXPLAIN (FORMAT JSON). The test tables are tiny, so PostgreSQL
+    is told to avoid sequential scans and only falls back to one when no
+    index can serve the query (see explain_request).
+    """
+    if connection.dialect.name == "postgresql":
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        return {node["Relation Name"] for node in plan_nodes(plan[0]["Plan"]) if node["Node Type"] == "Seq Scan"}
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return {match.group(1) for match in (SCAN.match(row[-1]) for row in plan) if match}
+
+
+def explain_request(db_session, client, method: str, url: str, **kwargs) -> Tuple[int, Dict[str, List[str]]]:
+    """
+    Send a request and EXPLAIN every query it ran
+
+    Returns:
+        Response status and, per table read in full (SQLite SCAN, with
+        or without an index, or PostgreSQL Seq Scan), the statements that
+        did so
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.request(method, url, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    connection = db_session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    scans: Dict[str, List[str]] = {}
+    for statement, parameters in statements:
+        for table in full_scans(connection, statement, parameters) & TABLES:
+            scans.setdefault(table, []).append(" ".join(statement.split()))
+    return response.status_code, scans
+
+
+def assert_no_full_scans(db_session, client, method: str, url: str, allowed=(), **kwargs) -> None:
+    """Fail if the request read any table in full, except the allowed ones"""
+    status_code, scans = explain_request(db_session, client, method, url, **kwargs)
+    assert status_code < 400, f"{method} {url} returned {status_code}"
+    unexpected = {table: queries for table, queries in scans.items() if table not in allowed}
+    assert not unexpected, f"{method} {url} scans {sorted(unexpected)}: {unexpected}"
+
+
+@pytest.fixture
+def student(student_token):
+    return {"Authorization": f"Bearer {student_token}"}
+
+
+@pytest.fixture
+def admin(admin_token):
+    return {"Authorization": f"Bearer {admin_token}"}
+
+
+@pytest.fixture
+def enrolled(db_session, student_user, sample_course):
+    """The student enrolled in the sample course"""
+    enrollment = Enrollment(user_id=student_user.id, course_id=sample_course.id)
+    db_session.add(enrollment)
+    db_session.commit()
+    return enrollment
+
+
+class TestAuthAndUserPlans:
+    """Query plans of authentication and profile endpoints"""
+
+    def test_login(self, db_session, client, student_user):
+        """Test that login finds the user by email through its index"""
+        assert_no_full_scans(db_session, client, "POST", "/auth/login",
+                             data={"username": "student@test.com", "password": "password123"})
+
+    def test_register(self, db_session, client):
+        """Test that the duplicate email check is indexed"""
+        assert_no_full_scans(db_session, client, "POST", "/auth/register",
+                             json={"name": "New", "email": "new@test.com", "password": "password123"})
+
+    def test_me(self, db_session, client, student):
+        """Test that the authenticated principal is loaded by email"""
+        assert_no_full_scans(db_session, client, "GET", "/users/me", headers=student)
+
+
+class TestCoursePlans:
+    """Query plans of course endpoints"""
+
+    def test_catalog(self, db_session, client, sample_course, enrolled):
+        """Test that the catalog reads the active courses once and counts seats by index"""
+        assert_no_full_scans(db_session, client, "GET", "/courses", allowed={"courses"})
+
+    def test_course_details(self, db_session, client, sample_course, enrolled):
+        """Test that a course and its enrollments are loaded by key"""
+        assert_no_full_scans(db_session, client, "GET", f"/courses/{sample_course.id}")
+
+    def test_related_courses(self, db_session, client, sample_course):
+        assert_no_full_scans(db_session, client, "GET", f"/courses/{sample_course.id}/related")
+
+    def test_prerequisites(self, db_session, client, sample_course, inactive_course, admin):
+        assert_no_full_scans(db_session, client, "PUT", f"/courses/{sample_course.id}/prerequisites",
+                             json={"prerequisite_ids": [inactive_course.id]}, headers=admin)
+        assert_no_full_scans(db_session, client, "GET", f"/courses/{sample_course.id}/prerequisites")
+
+    def test_meetings(self, db_session, client, sample_course, admin):
+        assert_no_full_scans(db_session, client, "PUT", f"/courses/{sample_course.id}/meetings",
+                             json={"meetings": [{"day_of_week": 0, "start_time": "09:00", "end_time": "10:00"}]},
+                             headers=admin)
+        assert_no_full_scans(db_session, client, "GET", f"/courses/{sample_course.id}/meetings")
+
+    def test_update_and_activate(self, db_session, client, sample_course, enrolled, admin):
+        """Test that admin course changes touch the course's own rows only"""
+        assert_no_full_scans(db_session, client, "PUT", f"/courses/{sample_course.id}",
+                             json={"capacity": 40}, headers={**admin, "If-Match": '"1"'})
+        assert_no_full_scans(db_session, client, "PATCH", f"/courses/{sample_course.id}/activate?is_active=false",
+                             headers={**admin, "If-Match": '"2"'})
+
+    def test_record_completion(self, db_session, client, sample_course, student_user, admin):
+        assert_no_full_scans(db_session, client, "POST", f"/courses/{sample_course.id}/completions",
+                             json={"user_id": student_user.id}, headers=admin)
+        assert db_session.query(CourseCompletion).count() == 1
+
+
+class TestEnrollmentPlans:
+    """Query plans of enrollment endpoints"""
+
+    def test_enroll(self, db_session, client, sample_course, second_student, student):
+        """Test that enrolling checks duplicates, seats and schedule by index"""
+        assert_no_full_scans(db_session, client, "POST", "/enrollments",
+                             json={"course_id": sample_course.id}, headers=student)
+
+    def test_checkout(self, db_session, client, sample_course, full_course, second_student_token):
+        assert_no_full_scans(db_session, client, "POST", "/enrollments/checkout",
+                             json={"course_ids": [sample_course.id]},
+                             headers={"Authorization": f"Bearer {second_student_token}"})
+
+    def test_deregister(self, db_session, client, sample_course, enrolled, student):
+        assert_no_full_scans(db_session, client, "DELETE", f"/enrollments/{sample_course.id}", headers=student)
+
+    def test_waitlist(self, db_session, client, full_course, second_student_token):
+        headers = {"Authorization": f"Bearer {second_student_token}"}
+        assert_no_full_scans(db_session, client, "POST", "/enrollments/waitlist",
+                             json={"course_id": full_course.id}, headers=headers)
+        assert_no_full_scans(db_session, client, "GET", f"/enrollments/waitlist/{full_course.id}", headers=headers)
+        assert_no_full_scans(db_session, client, "DELETE", f"/enrollments/waitlist/{full_course.id}", headers=headers)
+
+    def test_course_roster(self, db_session, client, sample_course, enrolled, admin):
+        """Test that a course's enrollments are found through the course index"""
+        assert_no_full_scans(db_session, client, "GET", f"/enrollments/course/{sample_course.id}", headers=admin)
+
+    def test_admin_removal(self, db_session, client, enrolled, admin):
+        assert_no_full_scans(db_session, client, "DELETE", f"/enrollments/{enrolled.id}/admin", headers=admin)
+
+    def test_all_enrollments(self, db_session, client, enrolled, admin):
+        """Test that only the unfiltered admin listing reads enrollments in full"""
+        assert_no_full_scans(db_session, client, "GET", "/enrollments", allowed={"enrollments"}, headers=admin)
+
+
+class TestReportingPlans:
+    """Query plans of admin reporting and operations endpoints"""
+
+    def test_analytics(self, db_session, client, sample_course, enrolled, admin):
+        """Test that course analytics read courses and rollups, never enrollments"""
+        for url in ("/analytics/summary", "/analytics/courses"):
+            assert_no_full_scans(db_session, client, "GET", url, headers=admin,
+                                 allowed={"courses", "course_enrollment_stats"})
+        assert_no_full_scans(db_session, client, "GET", "/analytics/enrollments/daily", headers=admin)
+
+    def test_audit_log(self, db_session, client, enrolled, admin):
+        """Test that the audit log pages through its index"""
+        assert_no_full_scans(db_session, client, "GET", "/audit/enrollments", headers=admin,
+                             allowed={"enrollment_audit_events"})
+        assert_no_full_scans(db_session, client, "GET", f"/audit/enrollments?course_id={enrolled.course_id}",
+                             headers=admin)
+
+    def test_webhooks(self, db_session, client, admin):
+        assert_no_full_scans(db_session, client, "POST", "/webhooks",
+                             json={"url": "http://127.0.0.1:9/hook"}, headers=admin)
+        endpoint = db_session.query(WebhookEndpoint).one()
+        assert_no_full_scans(db_session, client, "GET", "/webhooks", headers=admin, allowed={"webhook_endpoints"})
+        assert_no_full_scans(db_session, client, "DELETE", f"/webhooks/{endpoint.id}", headers=admin)
+
+    def test_jobs(self, db_session, client, admin):
+        """Test that listing jobs by status and retrying use the job indexes"""
+        db_session.add(BackgroundJob(task="rollups.reconcile", payload={}, status=JobStatus.DEAD, attempts=5,
+                                     max_attempts=5, run_at=datetime.now(timezone.utc)))
+        db_session.commit()
+        job = db_session.query(BackgroundJob).one()
+
+        assert_no_full_scans(db_session, client, "GET", "/jobs?status=dead", headers=admin)
+        assert_no_full_scans(db_session, client, "POST", f"/jobs/{job.id}/retry", headers=admin)
+
+
+class TestHistoryPlans:
+    """Query plans of terms and archived enrollments"""
+
+    @pytest.fixture
+    def archived(self, db_session, student_user, sample_course):
+        """An enrollment of the student in a closed, archived term"""
+        now = datetime.now(timezone.utc)
+        term = Term(code="2025-FA", name="Fall 2025", starts_on=now.date(), ends_on=now.date(),
+                    closed_at=now, archived_at=now)
+        db_session.add(term)
+        db_session.flush()
+        db_session.add(ArchivedEnrollment(enrollment_id=1, user_id=student_user.id, course_id=sample_course.id,
+                                          term_id=term.id, created_at=now))
+        db_session.commit()
+        return term
+
+    def test_terms(self, db_session, client, archived):
+        assert_no_full_scans(db_session, client, "GET", "/terms", allowed={"terms"})
+
+    def test_term_enrollments(self, db_session, client, archived, sample_course, admin):
+        """Test that a term's archive pages through the archive indexes"""
+        assert_no_full_scans(db_session, client, "GET", f"/terms/{archived.id}/enrollments", headers=admin)
+        assert_no_full_scans(db_session, client, "GET",
+                             f"/terms/{archived.id}/enrollments?course_id={sample_course.id}", headers=admin)
+
+    def test_user_history(self, db_session, client, archived, student):
+        assert_no_full_scans(db_session, client, "GET", "/users/me/history", headers=student)
+
+
+class TestIndexMigration:
+    """Test the migration that indexes enrollments by course"""
+
+    def indexes(self, url, table):
+        engine = create_engine(url)
+        try:
+            return {index["name"] for index in inspect(engine).get_indexes(table)}
+        finally:
+            engine.dispose()
+
+    def test_upgrade_and_downgrade(self, tmp_path, monkeypatch):
+        """Test that head adds the course index and drops the primary key duplicates"""
+        url = f"sqlite:///{tmp_path / 'migrated.db'}"
+        monkeypatch.setattr(settings, "DATABASE_URL", url)
+        config = Config()
+        config.set_main_option("script_location", os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic"))
+
+        command.upgrade(config, "head")
+
+        assert self.indexes(url, "enrollments") == {"ix_enrollments_course_user"}
+        assert self.indexes(url, "users") == {"ix_users_email"}
+        assert self.indexes(url, "courses") == {"ix_courses_code", "ix_courses_term_id"}
+
+        command.downgrade(config, "d2f8a4b6c913")
+
+        assert self.indexes(url, "enrollments") == {"ix_enrollments_id"}
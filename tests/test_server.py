@@ -0,0 +1,184 @@
+import os
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import server
+from app.config import settings
+from app.database import engine
+from app.main import app
+from app.server import (
+    available_cpus, worker_count, serving_workers, check_worker_settings, prepare_worker, open_pool_connections, WarmUp
+)
+from app.services.cache import RedisCache, cache, CATALOG_KEY
+from app.services.catalog import catalog_key
+from app.services.health import readiness, OK, DEGRADED, FAIL
+from tests.conftest import TestingSessionLocal, engine as test_engine
+
+
+class TestWorkerCount:
+    """Test the worker count of the multi-worker launch mode"""
+
+    def test_per_cpu(self, monkeypatch):
+        """Test that the count follows the available CPUs"""
+        monkeypatch.setattr(settings, "WEB_WORKERS", 0)
+        monkeypatch.setattr(settings, "WEB_WORKERS_PER_CPU", 1)
+
+        assert worker_count(cpus=4, environ={}) == 4
+
+    def test_capped_by_connection_budget(self, monkeypatch):
+        """Test that all workers' pools fit in the database connection budget"""
+        monkeypatch.setattr(settings, "WEB_WORKERS", 0)
+        monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+        monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 10)
+        monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", 90)
+
+        assert worker_count(cpus=32, environ={}) == 6
+
+    def test_overrides(self, monkeypatch):
+        """Test that WEB_CONCURRENCY wins over WEB_WORKERS"""
+        monkeypatch.setattr(settings, "WEB_WORKERS", 3)
+
+        assert worker_count(cpus=32, environ={}) == 3
+        assert worker_count(cpus=32, environ={"WEB_CONCURRENCY": "5"}) == 5
+
+    def test_cgroup_quota(self, tmp_path):
+        """Test that a container CPU quota lowers the CPU count"""
+        limited = tmp_path / "cpu.max"
+        limited.write_text("50000 100000\n")
+        unlimited = tmp_path / "unlimited"
+        unlimited.write_text("max 100000\n")
+
+        assert available_cpus(str(limited)) == 1
+        assert available_cpus(str(unlimited)) == len(os.sched_getaffinity(0))
+        assert available_cpus(str(tmp_path / "missing")) == len(os.sched_getaffinity(0))
+
+
+class TestWorkerStartup:
+    """Test per-worker setup after fork"""
+
+    def test_not_forked(self):
+        """Test that the importing process keeps its pool"""
+        pool = engine.pool
+
+        assert prepare_worker() is False
+        assert engine.pool is pool
+
+    def test_forked_worker_gets_own_pool(self, monkeypatch):
+        """Test that a forked worker replaces the inherited pool"""
+        monkeypatch.setattr(server, "_IMPORT_PID", -1)
+        pool = engine.pool
+
+        assert prepare_worker() is True
+        assert engine.pool is not pool
+
+    def test_cache_after_fork(self):
+        """Test that forked workers drop inherited connections and get their own identity"""
+        shared = RedisCache("redis://127.0.0.1:1/0")
+        shared._idle.append(object())
+        instance_id = shared.instance_id
+
+        shared.after_fork()
+
+        assert shared._idle == []
+        assert shared.instance_id != instance_id
+
+
+class TestWorkerSettings:
+    """Test the settings that only work within a single worker"""
+
+    def test_serving_workers(self):
+        """Test that the count exported by gunicorn.conf.py is read back"""
+        assert serving_workers(environ={}) == 1
+        assert serving_workers(environ={"SERVER_WORKERS": "4"}) == 4
+
+    def test_several_workers_start(self, db_session, admission_course, monkeypatch, caplog):
+        """Test that several workers start while courses use the admission queue, with warnings"""
+        monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+
+        check_worker_settings(2)
+
+        assert "admission queue needs a single worker" in caplog.text
+        assert "CACHE_BACKEND=memory" in caplog.text
+
+    def test_admission_course_enrolls_directly(self, client, student_token, admission_course, monkeypatch):
+        """Test that courses in admission mode enroll directly under several workers"""
+        monkeypatch.setenv("SERVER_WORKERS", "2")
+
+        response = client.post(
+            "/enrollments",
+            json={"course_id": admission_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_enabling_admission_refused(self, client, admin_token, monkeypatch):
+        """Test that admission mode cannot be turned on under several workers"""
+        monkeypatch.setenv("SERVER_WORKERS", "2")
+
+        response = client.post(
+            "/courses",
+            json={"title": "Hot Course", "code": "HOT101", "capacity": 10, "admission_queue_enabled": True},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "single server worker" in response.json()["detail"]
+
+
+class TestWarmUp:
+    """Test the startup warm-up and its readiness check"""
+
+    def test_open_pool_connections(self, tmp_path):
+        """Test that warm connections stay in the pool, up to its size"""
+        file_engine = create_engine(f"sqlite:///{tmp_path / 'warm.db'}", pool_size=3)
+        try:
+            assert open_pool_connections(file_engine, 5) == 3
+            assert file_engine.pool.checkedin() == 3
+        finally:
+            file_engine.dispose()
+
+    @pytest.mark.commits
+    def test_run(self, db_session, sample_course):
+        """Test that every step runs and the catalog is primed"""
+        warm_up = WarmUp(app, TestingSessionLocal, test_engine)
+        assert warm_up.health_check(db_session)["status"] == FAIL
+
+        warm_up.run()
+
+        result = warm_up.health_check(db_session)
+        assert result["status"] == OK
+        assert set(result["steps"]) == {"connections", "catalog", "serializers", "security"}
+        assert result["steps"]["catalog"]["courses"] == 1
+        assert [course["code"] for course in cache.get(catalog_key(cache.get(CATALOG_KEY)))] == [sample_course.code]
+
+    def test_failed_step_degrades(self, caplog):
+        """Test that a failing step is reported without blocking readiness"""
+        # A database without the schema
+        empty_engine = create_engine("sqlite://")
+        warm_up = WarmUp(app, sessionmaker(bind=empty_engine), empty_engine)
+
+        warm_up.run()
+        empty_engine.dispose()
+
+        result = warm_up.health_check(None)
+        assert result["status"] == DEGRADED
+        assert result["steps"]["catalog"]["status"] == DEGRADED
+        assert result["steps"]["security"]["status"] == OK
+        assert "Warm-up step catalog failed" in caplog.text
+
+    @pytest.mark.commits
+    def test_not_ready_while_warming(self, client):
+        """Test that readiness fails until the warm-up has finished"""
+        warm_up = WarmUp(app, TestingSessionLocal, test_engine)
+        readiness.register("warm_up", warm_up.health_check)
+        readiness.invalidate()
+
+        response = client.get("/health/ready")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["checks"]["warm_up"]["warming"] is True
+
+        warm_up.run()
+
+        assert client.get("/health/ready").status_code == status.HTTP_200_OK
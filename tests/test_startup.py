@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from app.utils.security import hash_password, verify_password, create_access_token, decode_access_token
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Regression budgets for `import app.main` in a fresh interpreter. About
+# 0.9-1.1 s and 715 modules on a 1-vCPU CI container; the time budget leaves
+# room for noisy runners. Set IMPORT_TIME_BUDGET_SECONDS to tighten it on a
+# dedicated benchmark machine.
+IMPORT_TIME_BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", "2.0"))
+IMPORTED_MODULES_BUDGET = 760
+
+# Imported on first use, not at startup. email_validator stays eager:
+# pydantic imports it while building the EmailStr schemas of app.schemas,
+# so deferring it would mean replacing EmailStr, for about 25 ms (mostly
+# its regex compilation). Its DNS deliverability checks are never loaded.
+DEFERRED_MODULES = ("jose", "passlib", "cryptography", "httpx", "numpy", "scipy", "dns")
+
+MEASURE_IMPORT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_import() -> dict:
+    """Import the application in a fresh interpreter; returns the time taken and the loaded modules"""
+    result = subprocess.run(
+        [sys.executable, "-c", MEASURE_IMPORT],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True, timeout=60,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def cold_imports():
+    """Three cold imports of app.main"""
+    return [measure_import() for _ in range(3)]
+
+
+class TestStartup:
+    """Test the import-time budget of the application"""
+
+    def test_import_time_budget(self, cold_imports):
+        """Test that the fastest of three cold imports stays within budget"""
+        fastest = min(run["seconds"] for run in cold_imports)
+        budget = IMPORT_TIME_BUDGET_SECONDS
+
+        assert fastest < budget, (
+            f"import app.main took {fastest:.2f}s (budget {budget}s); "
+            f"see python -m benchmarks.startup for the slowest imports"
+        )
+
+    def test_imported_modules_budget(self, cold_imports):
+        """Test that startup does not pull in new dependencies unnoticed"""
+        modules = cold_imports[0]["modules"]
+
+        assert len(modules) <= IMPORTED_MODULES_BUDGET
+
+    def test_heavy_dependencies_deferred(self, cold_imports):
+        """Test that hashing, JWT, HTTP client and numeric libraries load on first use"""
+        modules = set(cold_imports[0]["modules"])
+
+        loaded = [name for name in DEFERRED_MODULES if name in modules]
+        assert loaded == []
+
+    def test_lazy_security_works(self):
+        """Test that hashing and tokens work with lazily loaded backends"""
+        hashed = hash_password("password123")
+        token = create_access_token(data={"sub": "student@test.com"})
+
+        assert verify_password("password123", hashed)
+        assert not verify_password("wrong", hashed)
+        assert decode_access_token(token)["sub"] == "student@test.com"
+        assert decode_access_token("not-a-token") is None
@@ -0,0 +1,81 @@
+import statistics
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.jobs.enrollment_rollups import reconcile_course_stats
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.user import User
+from benchmarks.synthetic_data import generate
+
+
+def generate_database(seed=42, **counts):
+    """Generate a data set into a fresh in-memory database"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    options = {"users": 300, "courses": 40, "enrollments": 1200, **counts}
+    with engine.begin() as connection:
+        inserted = generate(connection, seed=seed, batch_size=100, **options)
+    return engine, inserted
+
+
+def dump(engine):
+    """Every generated row except the salted password hash"""
+    with engine.connect() as connection:
+        return [
+            connection.execute(
+                select(*[column for column in table.c if column.name != "hashed_password"]).order_by(table.c.id)
+            ).all()
+            for table in (User.__table__, Course.__table__, Enrollment.__table__)
+        ]
+
+
+class TestSyntheticData:
+    """Test the synthetic data generator"""
+
+    def test_deterministic(self):
+        """Test that a seed always produces the same rows"""
+        first, _ = generate_database(seed=7)
+        second, _ = generate_database(seed=7)
+        other, _ = generate_database(seed=8)
+
+        assert dump(first) == dump(second)
+        assert dump(first)[2] != dump(other)[2]
+
+    def test_popularity_skew(self):
+        """Test that a few courses draw far more enrollments than the median course"""
+        engine, inserted = generate_database()
+        with engine.connect() as connection:
+            counts = sorted(connection.execute(
+                select(func.count()).select_from(Enrollment.__table__).group_by(Enrollment.course_id)
+            ).scalars(), reverse=True)
+
+        assert inserted["users"] == 300
+        assert 1000 <= inserted["enrollments"] <= 1200
+        assert counts[0] > 5 * statistics.median(counts)
+
+    def test_capacity_and_rollups(self):
+        """Test that no course is over capacity and the rollups need no repair"""
+        engine, _ = generate_database()
+        with Session(engine) as db:
+            overfull = (
+                db.query(Course.id)
+                .join(Enrollment, Enrollment.course_id == Course.id)
+                .group_by(Course.id, Course.capacity)
+                .having(func.count(Enrollment.id) > Course.capacity)
+                .count()
+            )
+
+            assert overfull == 0
+            assert reconcile_course_stats(db) == 0
+
+    def test_appends_after_existing_rows(self):
+        """Test that a second run continues after the ids already present"""
+        engine, _ = generate_database()
+        with engine.begin() as connection:
+            generate(connection, users=10, courses=5, enrollments=20, seed=1)
+
+        with engine.connect() as connection:
+            assert connection.execute(select(func.count()).select_from(User.__table__)).scalar() == 310
+            assert connection.execute(select(func.max(Course.__table__.c.id))).scalar() == 45
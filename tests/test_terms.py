@@ -0,0 +1,259 @@
+from datetime import date
+import pytest
+from fastapi import status
+from app.config import settings
+from app.jobs.enrollment_rollups import fold_enrollment_deltas, reconcile_course_stats
+from app.jobs.tasks import ARCHIVE_TERM
+from app.jobs.term_archive import archive_term
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.enrollment_archive import ArchivedEnrollment
+from app.models.enrollment_stats import CourseEnrollmentStats
+from app.models.job import BackgroundJob, JobStatus
+from app.models.term import Term
+from app.services.jobs import JobWorkerPool, TASKS
+from app.services.schedule import find_schedule_conflicts, set_meetings
+from app.services.terms import close_term
+from tests.conftest import TestingSessionLocal
+
+
+def make_term(db_session, code, closed=False):
+    term = Term(code=code, name=f"Term {code}", starts_on=date(2026, 1, 10), ends_on=date(2026, 5, 20))
+    db_session.add(term)
+    db_session.commit()
+    if closed:
+        close_term(db_session, term)
+        db_session.commit()
+    return term
+
+
+@pytest.fixture
+def term(db_session):
+    return make_term(db_session, "2026-SP")
+
+
+@pytest.fixture
+def term_course(db_session, term):
+    """An active course of the term"""
+    course = Course(title="Term Course", code="TRM101", capacity=30, is_active=True, term_id=term.id)
+    db_session.add(course)
+    db_session.commit()
+    return course
+
+
+class TestTerms:
+    """Test term management"""
+
+    def test_create_and_list(self, client, admin_token):
+        """Test that admins create terms and anyone lists them"""
+        response = client.post(
+            "/terms",
+            json={"code": "2026-fa", "name": "Fall 2026", "starts_on": "2026-09-01", "ends_on": "2026-12-20"},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["code"] == "2026-FA"
+        assert response.json()["closed_at"] is None
+
+        response = client.get("/terms")
+        assert [term["code"] for term in response.json()] == ["2026-FA"]
+
+    def test_create_validation(self, client, admin_token, student_token, term):
+        """Test duplicate codes, reversed dates and non-admins are rejected"""
+        payload = {"code": "2026-SP", "name": "Spring", "starts_on": "2026-01-10", "ends_on": "2026-05-20"}
+
+        response = client.post("/terms", json=payload, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.post("/terms", json={**payload, "code": "X1", "ends_on": "2026-01-01"},
+                               headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+        response = client.post("/terms", json={**payload, "code": "X2"},
+                               headers={"Authorization": f"Bearer {student_token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_course_in_term(self, client, admin_token, db_session, term):
+        """Test that courses are placed in open terms only"""
+        closed = make_term(db_session, "2025-FA", closed=True)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        payload = {"title": "Term Course", "code": "TRM200", "capacity": 10}
+
+        response = client.post("/courses", json={**payload, "term_id": closed.id}, headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.post("/courses", json={**payload, "term_id": term.id}, headers=headers)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["term_id"] == term.id
+
+        response = client.put(f"/courses/{response.json()['id']}", json={"term_id": 9999},
+                              headers={**headers, "If-Match": response.headers["ETag"]})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_close(self, client, admin_token, db_session, term, term_course, sample_course):
+        """Test that closing deactivates the term's courses and schedules archival"""
+        response = client.post(f"/terms/{term.id}/close", headers={"Authorization": f"Bearer {admin_token}"})
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json()["closed_at"] is not None
+        db_session.refresh(term_course)
+        db_session.refresh(sample_course)
+        assert term_course.is_active is False
+        assert sample_course.is_active is True
+
+        job = db_session.query(BackgroundJob).one()
+        assert (job.task, job.payload) == (ARCHIVE_TERM, {"term_id": term.id})
+
+        response = client.post(f"/terms/{term.id}/close", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_close_during_course_edit(self, client, admin_token, db_session, term, term_course):
+        """Test that closing a term races an admin edit without failing, and the edit then gets 412"""
+        from sqlalchemy import update
+
+        etag = f'"{term_course.version}"'
+        db_session.execute(update(Course.__table__).where(Course.__table__.c.id == term_course.id).values(
+            title="Concurrent Edit", version=Course.__table__.c.version + 1
+        ))
+        close_term(db_session, term)
+        db_session.commit()
+
+        db_session.refresh(term_course)
+        assert (term_course.is_active, term_course.version) == (False, 3)
+        response = client.put(f"/courses/{term_course.id}", json={"title": "Stale Edit"},
+                              headers={"Authorization": f"Bearer {admin_token}", "If-Match": etag})
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    def test_closed_term_course_stays_inactive(self, client, admin_token, db_session, term, term_course):
+        """Test that courses of a closed term cannot be reactivated"""
+        close_term(db_session, term)
+        db_session.commit()
+        headers = {"Authorization": f"Bearer {admin_token}", "If-Match": f'"{term_course.version}"'}
+
+        response = client.patch(f"/courses/{term_course.id}/activate?is_active=true", headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.put(f"/courses/{term_course.id}", json={"is_active": True}, headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = client.put(f"/courses/{term_course.id}", json={"title": "Renamed course"}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_schedule_conflicts_within_term(self, db_session, student_user, term, term_course):
+        """Test that meetings only clash with courses of the same term or of no term"""
+        fall = make_term(db_session, "2026-FA")
+        fall_course = Course(title="Fall Course", code="TRM300", capacity=30, is_active=True, term_id=fall.id)
+        other_fall = Course(title="Fall Lab", code="TRM301", capacity=30, is_active=True, term_id=fall.id)
+        untermed = Course(title="Seminar", code="SEM100", capacity=30, is_active=True)
+        db_session.add_all([fall_course, other_fall, untermed])
+        db_session.flush()
+        for course in (term_course, fall_course, other_fall, untermed):
+            set_meetings(db_session, course, [(0, 540, 600)])
+        db_session.add(Enrollment(user_id=student_user.id, course_id=term_course.id))
+        db_session.commit()
+
+        assert find_schedule_conflicts(db_session, student_user.id, [fall_course.id]) == []
+        assert find_schedule_conflicts(db_session, student_user.id, [fall_course.id, other_fall.id]) == [
+            ("TRM300", "TRM301")
+        ]
+        assert find_schedule_conflicts(db_session, student_user.id, [fall_course.id, untermed.id]) == sorted([
+            ("SEM100", term_course.code), ("TRM300", "SEM100")
+        ])
+
+    def test_schedule_conflicts_without_term_both_ways(self, db_session, student_user, second_student, term, term_course):
+        """Test that a course without a term clashes with enrolled courses of any term and vice versa"""
+        untermed = Course(title="Seminar", code="SEM100", capacity=30, is_active=True)
+        db_session.add(untermed)
+        db_session.flush()
+        for course in (term_course, untermed):
+            set_meetings(db_session, course, [(0, 540, 600)])
+        db_session.add(Enrollment(user_id=student_user.id, course_id=term_course.id))
+        db_session.add(Enrollment(user_id=second_student.id, course_id=untermed.id))
+        db_session.commit()
+
+        assert find_schedule_conflicts(db_session, student_user.id, [untermed.id]) == [
+            ("SEM100", term_course.code)
+        ]
+        assert find_schedule_conflicts(db_session, second_student.id, [term_course.id]) == [
+            (term_course.code, "SEM100")
+        ]
+
+
+@pytest.mark.commits
+class TestTermArchive:
+    """Test moving closed-term enrollments to the archive"""
+
+    @pytest.fixture
+    def enrolled(self, db_session, student_user, second_student, term_course, sample_course):
+        """Both students in the term course, the first also in the current course"""
+        db_session.add_all([
+            Enrollment(user_id=student_user.id, course_id=term_course.id),
+            Enrollment(user_id=second_student.id, course_id=term_course.id),
+            Enrollment(user_id=student_user.id, course_id=sample_course.id),
+        ])
+        db_session.commit()
+
+    def test_archive(self, db_session, term, term_course, sample_course, enrolled):
+        """Test that only the term's enrollments move and its rollups are kept"""
+        close_term(db_session, term)
+        db_session.commit()
+
+        assert archive_term(db_session, term.id) is True
+        db_session.commit()
+
+        assert [e.course_id for e in db_session.query(Enrollment).all()] == [sample_course.id]
+        archived = db_session.query(ArchivedEnrollment).all()
+        assert {(a.course_id, a.term_id) for a in archived} == {(term_course.id, term.id)}
+        assert len(archived) == 2
+        assert db_session.get(Term, term.id).archived_at is not None
+
+        assert reconcile_course_stats(db_session) == 0
+        fold_enrollment_deltas(db_session)
+        assert db_session.get(CourseEnrollmentStats, term_course.id).enrolled_count == 2
+
+    def test_open_term_refused(self, db_session, term):
+        with pytest.raises(ValueError, match="must be closed"):
+            archive_term(db_session, term.id)
+
+    def test_job_continues_in_new_job(self, db_session, term, enrolled, monkeypatch):
+        """Test that an archival cut short by its time box schedules its own continuation"""
+        monkeypatch.setattr(settings, "JOB_LOCK_TIMEOUT_SECONDS", 0)
+        monkeypatch.setattr(settings, "BACKFILL_CHUNK_SIZE", 1)
+        monkeypatch.setattr(settings, "BACKFILL_PAUSE_SECONDS", 0)
+        close_term(db_session, term)
+        db_session.commit()
+        pool = JobWorkerPool(session_factory=TestingSessionLocal, workers=1, tasks=TASKS)
+
+        runs = 0
+        while pool.run_once():
+            runs += 1
+
+        assert runs > 1
+        assert db_session.query(ArchivedEnrollment).count() == 2
+        assert db_session.query(Term).one().archived_at is not None
+        assert {job.status for job in db_session.query(BackgroundJob).all()} == {JobStatus.SUCCEEDED}
+
+    def test_history(self, client, db_session, term, sample_course, enrolled, student_token, admin_token):
+        """Test that archived enrollments are served by the history endpoints"""
+        close_term(db_session, term)
+        db_session.commit()
+        archive_term(db_session, term.id)
+        db_session.commit()
+
+        response = client.get("/users/me/history", headers={"Authorization": f"Bearer {student_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [(e["course"]["code"], e["term_id"]) for e in response.json()] == [("TRM101", term.id)]
+
+        response = client.get("/users/me", headers={"Authorization": f"Bearer {student_token}"})
+        assert [e["course_id"] for e in response.json()["enrollments"]] == [sample_course.id]
+
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        page = client.get(f"/terms/{term.id}/enrollments?limit=1", headers=headers).json()
+        assert len(page["enrollments"]) == 1
+        page = client.get(f"/terms/{term.id}/enrollments?cursor={page['next_cursor']}", headers=headers).json()
+        assert len(page["enrollments"]) == 1
+        assert page["next_cursor"] is None
+
+        response = client.get(f"/terms/{term.id}/enrollments", headers={"Authorization": f"Bearer {student_token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
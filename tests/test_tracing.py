@@ -0,0 +1,122 @@
+import json
+import pytest
+from fastapi import status
+from app.config import settings
+from app.utils.tracing import (
+    configure_trace_export, shutdown_trace_export, parse_traceparent, span, Trace, current_trace
+)
+
+
+@pytest.fixture
+def trace_file(client, tmp_path, monkeypatch):
+    """Export every request's trace to a temporary file"""
+    monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 1.0)
+    path = tmp_path / "traces.jsonl"
+    configure_trace_export(str(path))
+    
+    def read():
+        shutdown_trace_export()
+        return [json.loads(line) for line in path.read_text().splitlines()]
+    
+    yield read
+    shutdown_trace_export()
+
+
+def spans_of(export):
+    """Flatten the spans of one OTLP export"""
+    return export["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+def attribute(span_json, key):
+    """Read an OTLP attribute value"""
+    for item in span_json["attributes"]:
+        if item["key"] == key:
+            return next(iter(item["value"].values()))
+    return None
+
+
+class TestTracing:
+    """Test request tracing and OTLP export"""
+    
+    def test_authenticated_request_spans(self, client, student_token, student_user, trace_file):
+        """Test spans for auth, token decoding, SQL and serialization"""
+        response = client.get("/users/me", headers={"Authorization": f"Bearer {student_token}"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        exports = trace_file()
+        assert len(exports) == 1
+        spans = {item["name"]: item for item in spans_of(exports[0])}
+        
+        root = spans["GET /users/me"]
+        assert "parentSpanId" not in root
+        assert attribute(root, "http.response.status_code") == "200"
+        assert spans["get_current_user"]["parentSpanId"] == root["spanId"]
+        assert spans["decode_access_token"]["parentSpanId"] == spans["get_current_user"]["spanId"]
+        assert spans["user_lookup"]["parentSpanId"] == spans["get_current_user"]["spanId"]
+        lookup_queries = [
+            item for item in spans_of(exports[0])
+            if item["name"] == "db.query" and item["parentSpanId"] == spans["user_lookup"]["spanId"]
+        ]
+        assert len(lookup_queries) == 1
+        assert attribute(lookup_queries[0], "db.query.text").startswith("SELECT")
+        assert spans["serialize_response"]["parentSpanId"] == root["spanId"]
+        assert response.headers["traceparent"].split("-")[1] == root["traceId"]
+    
+    def test_unsampled_requests_not_exported(self, client, trace_file, monkeypatch):
+        """Test head sampling"""
+        monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+        
+        response = client.get("/courses")
+        
+        assert "traceparent" not in response.headers
+        assert trace_file() == []
+    
+    def test_incoming_traceparent_continued(self, client, trace_file, monkeypatch):
+        """Test that a trusted sampled upstream trace is continued regardless of the local rate"""
+        monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+        monkeypatch.setattr(settings, "TRACE_TRUST_PARENT_SAMPLING", True)
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        
+        client.get("/courses", headers={"traceparent": f"00-{trace_id}-{parent_id}-01"})
+        
+        root = spans_of(trace_file()[0])[0]
+        assert root["traceId"] == trace_id
+        assert root["parentSpanId"] == parent_id
+    
+    def test_untrusted_traceparent_cannot_force_sampling(self, client, trace_file, monkeypatch):
+        """Test that a client's sampled flag does not override the local rate"""
+        monkeypatch.setattr(settings, "TRACE_SAMPLE_RATE", 0.0)
+        
+        client.get("/courses", headers={"traceparent": "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"})
+        
+        assert trace_file() == []
+    
+    def test_untrusted_traceparent_keeps_trace_id(self, client, trace_file):
+        """Test that a request sampled at the local rate still continues the caller's trace"""
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        
+        client.get("/courses", headers={"traceparent": f"00-{trace_id}-{parent_id}-00"})
+        
+        root = spans_of(trace_file()[0])[0]
+        assert (root["traceId"], root["parentSpanId"]) == (trace_id, parent_id)
+    
+    def test_parse_traceparent(self):
+        """Test W3C traceparent parsing"""
+        assert parse_traceparent("00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00") == (
+            "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", False
+        )
+        assert parse_traceparent("garbage") is None
+    
+    def test_span_error_recorded(self):
+        """Test that exceptions mark the span as failed"""
+        trace = Trace()
+        token = current_trace.set(trace)
+        try:
+            with pytest.raises(ValueError):
+                with span("failing"):
+                    raise ValueError("boom")
+        finally:
+            current_trace.reset(token)
+        
+        assert trace.spans[0].error
+        assert trace.spans[0].attributes["error.type"] == "ValueError"
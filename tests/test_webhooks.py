@@ -0,0 +1,190 @@
+import json
+import threading
+from datetime import datetime, timezone
+import httpx
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fastapi import status
+from app.models.outbox import OutboxEvent, WebhookEndpoint, WebhookDelivery, DeliveryStatus
+from app.services.webhooks import WebhookDispatcher
+from tests.conftest import TestingSessionLocal
+
+
+class LocalReceiver:
+    """Stand-in webhook receiver recording request bodies"""
+    
+    def __init__(self):
+        self.bodies = []
+        self.statuses = []  # Status codes to answer with, 200 once exhausted
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        receiver = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                with receiver.lock:
+                    receiver.in_flight += 1
+                    receiver.max_in_flight = max(receiver.max_in_flight, receiver.in_flight)
+                    code = receiver.statuses.pop(0) if receiver.statuses else 200
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with receiver.lock:
+                    receiver.bodies.append(json.loads(body))
+                    receiver.in_flight -= 1
+                self.send_response(code)
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        # Short poll interval so shutdown() does not hold up teardown
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def receiver():
+    """Start a local webhook receiver"""
+    local = LocalReceiver()
+    yield local
+    local.close()
+
+
+@pytest.fixture
+def dispatcher():
+    """Create a dispatcher bound to the test database"""
+    local = WebhookDispatcher(session_factory=TestingSessionLocal, batch_size=10, retry_base=0)
+    yield local
+    local.stop()
+
+
+class TestOutbox:
+    """Test transactional outbox writes"""
+    
+    def test_enrollment_writes_outbox_event(self, client, student_token, student_user, db_session, sample_course):
+        """Test that an enrollment commits an outbox event with it"""
+        client.post(
+            "/enrollments",
+            json={"course_id": sample_course.id},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        event = db_session.query(OutboxEvent).one()
+        assert event.event_type == "enrollment.enrolled"
+        assert event.payload == {"user_id": student_user.id, "course_id": sample_course.id, "actor_id": student_user.id}
+    
+    def test_rollback_discards_outbox_event(self, db_session, sample_course):
+        """Test that events published in a rolled back transaction are dropped"""
+        from app.models.outbox import publish_event
+        
+        sample_course.capacity = 50
+        db_session.flush()
+        publish_event(db_session, "enrollment.enrolled", {"user_id": 1, "course_id": 1})
+        db_session.rollback()
+        db_session.commit()
+        
+        assert db_session.query(OutboxEvent).count() == 0
+
+
+class TestWebhookDelivery:
+    """Test webhook registration and dispatch"""
+    
+    def test_register_webhook(self, client, admin_token, receiver):
+        """Test registering an endpoint"""
+        response = client.post(
+            "/webhooks",
+            json={"url": receiver.url, "max_concurrency": 2},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["url"] == receiver.url
+    
+    def test_register_webhook_as_student(self, client, student_token, receiver):
+        """Test registering an endpoint as student (should fail)"""
+        response = client.post(
+            "/webhooks",
+            json={"url": receiver.url},
+            headers={"Authorization": f"Bearer {student_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+    
+    def test_batched_delivery(self, db_session, receiver, dispatcher):
+        """Test that due events are delivered in batches"""
+        from app.models.outbox import publish_event
+        
+        db_session.add(WebhookEndpoint(url=receiver.url, max_concurrency=1))
+        for i in range(15):
+            publish_event(db_session, "enrollment.enrolled", {"user_id": i, "course_id": 1})
+        db_session.commit()
+        
+        assert dispatcher.run_once() == 15
+        
+        assert [len(body["events"]) for body in receiver.bodies] == [10, 5]
+        assert receiver.max_in_flight == 1
+        assert db_session.query(WebhookDelivery).filter(
+            WebhookDelivery.status == DeliveryStatus.DELIVERED
+        ).count() == 15
+    
+    def test_retry_then_fail(self, db_session, receiver):
+        """Test that failed batches are retried and eventually marked failed"""
+        from app.models.outbox import publish_event
+        
+        dispatcher = WebhookDispatcher(session_factory=TestingSessionLocal, max_attempts=2, retry_base=0)
+        db_session.add(WebhookEndpoint(url=receiver.url, max_concurrency=1))
+        publish_event(db_session, "enrollment.enrolled", {"user_id": 1, "course_id": 1})
+        db_session.commit()
+        receiver.statuses = [500, 503]
+        
+        dispatcher.run_once()
+        db_session.expire_all()
+        delivery = db_session.query(WebhookDelivery).one()
+        assert delivery.status == DeliveryStatus.PENDING
+        assert delivery.last_error == "HTTP 500"
+        
+        dispatcher.run_once()
+        db_session.expire_all()
+        delivery = db_session.query(WebhookDelivery).one()
+        assert delivery.status == DeliveryStatus.FAILED
+        assert delivery.attempts == 2
+        dispatcher.stop()
+    
+    def test_rows_leased_not_locked_while_posting(self, db_session):
+        """Test that receivers are called outside any transaction, with the rows leased"""
+        from app.models.outbox import publish_event
+        
+        seen = []
+        
+        class RecordingClient:
+            def post(self, url, json):
+                delivery = db_session.query(WebhookDelivery).populate_existing().one()
+                seen.append((dispatch_db.in_transaction(), delivery.attempts, delivery.next_attempt_at))
+                return httpx.Response(200)
+            
+            def close(self):
+                pass
+        
+        dispatcher = WebhookDispatcher(session_factory=TestingSessionLocal, client=RecordingClient(), lease_seconds=60)
+        db_session.add(WebhookEndpoint(url="http://receiver.invalid/hook", max_concurrency=1))
+        publish_event(db_session, "enrollment.enrolled", {"user_id": 1, "course_id": 1})
+        db_session.commit()
+        dispatch_db = TestingSessionLocal()
+        dispatcher.fan_out(dispatch_db)
+        
+        assert dispatcher.deliver_due(dispatch_db) == 1
+        
+        in_transaction, attempts, leased_until = seen[0]
+        assert in_transaction is False
+        assert attempts == 1
+        assert leased_until.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        db_session.expire_all()
+        assert db_session.query(WebhookDelivery).one().status == DeliveryStatus.DELIVERED
+        dispatch_db.close()
+        dispatcher.stop()